@@ -0,0 +1,220 @@
+import argparse
+import gzip
+import json
+from fractions import Fraction
+from Services.model import LinearModel, csr_from_triplets, model_from_bars
+
+
+VERSION = 2
+SENSES = ("<=", ">=", "=")
+
+
+def open_bars(path, mode="r", compress=False):
+    """
+        Открывает файл .bars как текст UTF-8. При чтении сжатие gzip определяется
+        по первым байтам файла, при записи включается параметром compress.
+    """
+    if mode == "r":
+        with open(path, "rb") as f:
+            compress = f.read(2) == b"\x1f\x8b"
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def encode_value(value):
+    """Число для JSON без потери точности: целое — числом, дробь — строкой "p/q", None — null."""
+    if value is None:
+        return None
+    value = Fraction(value)
+    return value.numerator if value.denominator == 1 else str(value)
+
+
+def decode_value(value):
+    """Обратно к encode_value: число или строка ("3", "1.5", "2/3") — в Fraction, null — None."""
+    if value is None:
+        return None
+    return Fraction(str(value)) if isinstance(value, float) else Fraction(value)
+
+
+def read_header(f):
+    """
+        Читает начало файла.
+
+        Возвращает:
+        (заголовок v2, None) или (None, словарь v1) — старые файлы состоят из одного
+        объекта JSON с текстом ограничений (в том числе записанного в несколько строк).
+    """
+    first = f.readline()
+    try:
+        data = json.loads(first)
+    except ValueError:
+        data = json.loads(first + f.read())
+    if not isinstance(data, dict):
+        raise ValueError("Файл .bars должен содержать объект JSON")
+    version = data.get("version", 1)
+    if version == 1:
+        return None, data
+    if version != VERSION or data.get("format") != "bars":
+        raise ValueError(f"Неподдерживаемая версия файла .bars: {version}")
+    return data, None
+
+
+def read_task(path):
+    """
+        Читает задачу в формате v1 (словарь с текстом целевой функции и ограничений,
+        как для полей ввода App). Для файла v2 возвращает None, прочитав только заголовок.
+    """
+    with open_bars(path) as f:
+        header, data = read_header(f)
+    return data
+
+
+def read_bars(path):
+    """
+        Читает задачу из файла .bars любой версии.
+
+        Файл v2 читается построчно: в памяти одновременно находится одна пачка записей
+        и собираемая модель, а не весь текст файла.
+
+        Возвращает:
+        LinearModel (для v1 — как model_from_bars).
+    """
+    with open_bars(path) as f:
+        header, data = read_header(f)
+        if data is not None:
+            return model_from_bars(data)
+        return read_records(header, f)
+
+
+def read_records(header, lines):
+    """
+        Собирает LinearModel из записей v2 (см. write_bars) после заголовка header.
+
+        Ошибки формата (неизвестная запись, индекс вне размеров, неверный знак,
+        расхождение с количеством строк в заголовке) — ValueError.
+    """
+    n = int(header["count_vars"])
+    m = int(header["num_constraints"])
+    if header.get("sense") not in ("min", "max"):
+        raise ValueError(f"Неизвестное направление оптимизации: {header.get('sense')}")
+    objective = [Fraction(0)] * n
+    lower = [Fraction(0)] * n
+    upper = [None] * n
+    integer = [False] * n
+    senses, rhs = [], []
+    rows, columns, values = [], [], []
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "objective" in record:
+            for j, value in record["objective"]:
+                check_index(j, n, "переменной")
+                objective[j] = decode_value(value)
+        elif "rows" in record:
+            for sense, value in record["rows"]:
+                if sense not in SENSES:
+                    raise ValueError(f"Неизвестный знак ограничения: {sense}")
+                senses.append(sense)
+                rhs.append(decode_value(value))
+        elif "entries" in record:
+            for i, j, value in record["entries"]:
+                check_index(i, m, "ограничения")
+                check_index(j, n, "переменной")
+                value = decode_value(value)
+                if value == 0:
+                    continue
+                rows.append(i)
+                columns.append(j)
+                values.append(value)
+        elif "bounds" in record:
+            for j, low, high in record["bounds"]:
+                check_index(j, n, "переменной")
+                lower[j], upper[j] = decode_value(low), decode_value(high)
+        elif "integer" in record:
+            for j in record["integer"]:
+                check_index(j, n, "переменной")
+                integer[j] = True
+        else:
+            raise ValueError(f"Неизвестная запись файла .bars: {sorted(record)}")
+    if len(senses) != m:
+        raise ValueError(f"В заголовке {m} ограничений, в файле — {len(senses)}")
+
+    indptr, columns, values = csr_from_triplets(m, rows, columns, values)
+    return LinearModel(n, header["sense"], objective, indptr, columns, values, senses, rhs,
+                       decode_value(header.get("constant", 0)), lower, upper, integer)
+
+
+def check_index(index, size, what):
+    """Проверяет, что номер (с нуля) лежит в пределах размера из заголовка."""
+    if not isinstance(index, int) or not 0 <= index < size:
+        raise ValueError(f"Номер {what} вне диапазона: {index}")
+
+
+def chunks(items, size):
+    """Делит поток записей на списки не длиннее size."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_bars(path, model, compress=False, chunk_size=10000):
+    """
+        Записывает задачу в формате .bars v2 (JSON Lines).
+
+        Аргументы:
+        - path: путь к файлу.
+        - model: Services.model.LinearModel.
+        - compress: сжать файл gzip (при чтении сжатие определяется автоматически).
+        - chunk_size: сколько элементов записывается в одну строку файла.
+
+        Формат: первая строка — заголовок {"format": "bars", "version": 2, "sense",
+        "count_vars", "num_constraints", "nnz", "constant"}; далее строки-записи, каждая
+        с одним ключом:
+        - "objective": [[столбец, коэффициент], ...] — ненулевые коэффициенты целевой функции;
+        - "rows": [[знак, правая часть], ...] — ограничения по порядку;
+        - "entries": [[строка, столбец, значение], ...] — ненулевые элементы матрицы
+          (номера с нуля, каждая пара не больше одного раза, порядок любой);
+        - "bounds": [[столбец, нижняя, верхняя], ...] — только границы, отличные от x >= 0;
+        - "integer": [столбец, ...] — целочисленные переменные.
+        Числа записываются точно: целые — числом, дроби — строкой "p/q".
+    """
+    n, m = model.count_vars, model.num_constraints()
+    header = {"format": "bars", "version": VERSION, "sense": model.sense, "count_vars": n, "num_constraints": m,
+              "nnz": len(model.values), "constant": encode_value(model.objective_constant)}
+    objective = ([j, encode_value(value)] for j, value in enumerate(model.objective) if value != 0)
+    rows = ([model.senses[i], encode_value(model.rhs[i])] for i in range(m))
+    entries = ([i, model.indices[k], encode_value(model.values[k])] for i in range(m) for k in range(model.indptr[i], model.indptr[i + 1]))
+    bounds = ([j, encode_value(model.lower[j]), encode_value(model.upper[j])] for j in range(n)
+              if model.lower[j] != 0 or model.upper[j] is not None)
+    integer = (j for j in range(n) if model.integer[j])
+    with open_bars(path, "w", compress) as f:
+        f.write(json.dumps(header) + "\n")
+        for key, items in (("objective", objective), ("rows", rows), ("entries", entries), ("bounds", bounds), ("integer", integer)):
+            for chunk in chunks(items, chunk_size):
+                f.write(json.dumps({key: chunk}, separators=(",", ":")) + "\n")
+
+
+def main(argv=None):
+    """
+        Преобразование файлов .bars в формат v2:
+
+            python -m Services.bars задача.bars большая.bars --compress
+    """
+    parser = argparse.ArgumentParser(prog="python -m Services.bars", description="Преобразование задач .bars в формат v2")
+    parser.add_argument("source", help="исходный файл .bars (любой версии)")
+    parser.add_argument("target", help="файл .bars v2")
+    parser.add_argument("--compress", action="store_true", help="сжать gzip")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="элементов в одной строке файла")
+    args = parser.parse_args(argv)
+    write_bars(args.target, read_bars(args.source), args.compress, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from fractions import Fraction
+from time import perf_counter
+from Services.branch import BranchAndBound
+from Services.cache import SolveCache
+from Services.formats import SUFFIXES, read_model
+from Services.mapped import load_model
+from Services.simplex import solve
+
+
+def collect_files(paths):
+    """
+        Собирает список файлов задач.
+
+        Аргументы:
+        - paths: пути к файлам задач (.bars, .mps, .lp, в том числе .mps.gz и .lp.gz),
+          каталогам (берутся все такие файлы, включая подкаталоги)
+          или спискам задач (любой другой файл: по одному пути на строку, пути
+          относительно каталога списка, пустые строки и строки с # пропускаются).
+
+        Возвращает:
+        Список путей в порядке перечисления (файлы каталога — по алфавиту).
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith(SUFFIXES))
+        elif path.lower().endswith(SUFFIXES):
+            files.append(path)
+        else:
+            base = os.path.dirname(path)
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        files.append(os.path.join(base, line))
+    return files
+
+
+def to_json(value):
+    """Переводит значение решения в JSON: Fraction — целым числом или строкой "p/q", float — как есть."""
+    if isinstance(value, Fraction):
+        return value.numerator if value.denominator == 1 else str(value)
+    return value
+
+
+def solve_file(path, options, cache=None, mapped=False):
+    """
+        Решает одну задачу из файла .bars (любой версии), .mps или .lp
+        (см. Services.formats.read_model).
+
+        Аргументы:
+        - path: путь к файлу.
+        - options: параметры solve (backend, method, pricing, max_iterations, time_limit, presolve).
+        - cache: Services.cache.SolveCache или None.
+        - mapped: читать задачу через двоичный кэш рядом с файлом (Services.mapped.load_model):
+          повторный запуск не разбирает текст, а процессы, открывшие одну задачу,
+          разделяют её матрицу.
+
+        Возвращает:
+        Словарь-запись для JSONL: file, status, objective, solution, iterations, message, time.
+        Любые ошибки (чтение, разбор, сбой решателя) не прерывают пакет, а дают status "error".
+        Задачи с целочисленными переменными решаются методом ветвей и границ
+        (Services.branch.BranchAndBound, в текущем процессе, без кэша); в записи
+        добавляются nodes и gap.
+    """
+    started = perf_counter()
+    record = {"file": path, "status": None, "objective": None, "solution": None, "iterations": 0, "message": None}
+    try:
+        model = load_model(path) if mapped else read_model(path)
+        if any(model.integer):
+            search = BranchAndBound(model, method=options.get("method", "tableau"), backend=options.get("backend", "fraction"),
+                                    pricing=options.get("pricing", "dantzig"), time_limit=options.get("time_limit"))
+            result = search.result()
+            record["nodes"] = search.nodes
+            record["gap"] = search.gap
+        else:
+            result = solve(model=model, cache=cache, **options)
+        record["status"] = result.status
+        record["objective"] = to_json(result.objective)
+        record["solution"] = {name: to_json(value) for name, value in result.solution.items()} if result.solution is not None else None
+        record["iterations"] = result.iterations
+        record["message"] = result.message
+    except Exception as ex:
+        record["status"] = "error"
+        record["message"] = f"{type(ex).__name__}: {ex}"
+    record["time"] = round(perf_counter() - started, 6)
+    return record
+
+
+def solve_chunk(paths, options, cache_path=None, cache_size=10000, mapped=False):
+    """
+        Решает пачку задач в одном процессе (одна задача пула на пачку, а не на файл).
+        Если задан cache_path, результаты берутся из общего файла кэша и сохраняются в него
+        (не больше cache_size записей).
+    """
+    cache = SolveCache(max_size=cache_size, path=cache_path) if cache_path is not None else None
+    try:
+        return [solve_file(path, options, cache, mapped) for path in paths]
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def error_records(paths, ex):
+    """Записи status "error" для файлов пачки, которую не удалось решить в процессе пула (см. solve_batch)."""
+    message = f"{type(ex).__name__}: {ex}"
+    return [{"file": path, "status": "error", "objective": None, "solution": None, "iterations": 0, "message": message, "time": None}
+            for path in paths]
+
+
+def solve_batch(paths, workers=None, chunksize=16, options=None, cache_path=None, cache_size=10000, mapped=False):
+    """
+        Решает задачи из файлов параллельно в пуле процессов.
+
+        Аргументы:
+        - paths: список файлов (см. collect_files).
+        - workers: количество процессов (None — по числу ядер; 1 — без пула, в текущем процессе).
+        - chunksize: сколько файлов отправляется в процесс одной задачей: мелкие задачи
+          решаются за миллисекунды, и пересылка по одной тратила бы больше времени, чем решение.
+        - options: параметры solve; ограничение времени на задачу — options["time_limit"]
+          (проверяется между шагами симплекс-метода, процесс не прерывается: задача, зависшая
+          при чтении файла или построении таблицы, занимает процесс до конца своей пачки).
+        - cache_path: файл SQLite кэша результатов (см. Services.cache.SolveCache) или None.
+        - cache_size: наибольшее число записей в файле кэша.
+        - mapped: читать задачи через двоичные кэши (см. solve_file).
+
+        Возвращает:
+        Генератор записей (см. solve_file) в порядке завершения. В работе одновременно
+        находится не больше 4·workers пачек, поэтому память не растёт с размером пакета.
+
+        Если процесс пула аварийно завершился (нехватка памяти, сбой в библиотеке),
+        пул создаётся заново, а файлы оборвавшихся пачек решаются повторно: сначала
+        по одному параллельно, затем оборвавшиеся снова — по одному в пустом пуле.
+        Файл, на котором процесс завершился и так, получает запись со status "error".
+    """
+    options = options or {}
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    if workers == 1:
+        for chunk in chunks:
+            yield from solve_chunk(chunk, options, cache_path, cache_size, mapped)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    limit = 4 * workers
+    queue = deque((chunk, 0) for chunk in chunks)  # (файлы, номер попытки)
+    pending = {}  # future -> (файлы, номер попытки, пул)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while queue and len(pending) < limit:
+                chunk, attempt = queue[0]
+                # последняя попытка — одна задача в пуле, чтобы сбой относился к ней
+                if (attempt == 2 and pending) or any(value[1] == 2 for value in pending.values()):
+                    break
+                queue.popleft()
+                pending[pool.submit(solve_chunk, chunk, options, cache_path, cache_size, mapped)] = (chunk, attempt, pool)
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk, attempt, owner = pending.pop(future)
+                try:
+                    records = future.result()
+                except Exception as ex:
+                    if isinstance(ex, BrokenProcessPool) and owner is pool:
+                        # после аварийного завершения процесса пул не принимает задачи
+                        pool.shutdown(wait=False)
+                        pool = ProcessPoolExecutor(max_workers=workers)
+                    if attempt == 2:
+                        records = error_records(chunk, ex)
+                    else:
+                        queue.extendleft(([path], attempt + 1) for path in reversed(chunk))
+                        records = []
+                yield from records
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    """
+        Точка входа командной строки:
+
+            python -m Services.batch задачи/ список.txt -j 8 --timeout 5 -o results.jsonl
+
+        Результаты выводятся по одной JSON-строке на задачу в порядке завершения.
+    """
+    parser = argparse.ArgumentParser(prog="python -m Services.batch", description="Пакетное решение задач (.bars, .mps, .lp) симплекс-методом")
+    parser.add_argument("paths", nargs="+", help="файлы задач (.bars, .mps, .lp), каталоги или списки задач")
+    parser.add_argument("-o", "--output", help="файл JSONL для результатов (по умолчанию stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="количество процессов")
+    parser.add_argument("--chunksize", type=int, default=16, help="файлов в одной задаче пула")
+    parser.add_argument("--timeout", type=float, default=None, help="ограничение времени на задачу, с (проверяется между шагами решателя; "
+                        "чтение файла и построение таблицы не прерываются)")
+    parser.add_argument("--max-iterations", type=int, default=None, help="ограничение числа шагов на задачу")
+    parser.add_argument("--method", default="tableau", choices=["tableau", "revised", "interior"])
+    parser.add_argument("--backend", default="fraction", choices=["fraction", "bareiss", "numpy"])
+    parser.add_argument("--pricing", default="dantzig", choices=["dantzig", "bland", "devex", "steepest-edge"])
+    parser.add_argument("--presolve", action="store_true", help="упростить задачи перед решением")
+    parser.add_argument("--cache", default=None, help="файл SQLite для кэша результатов между запусками")
+    parser.add_argument("--cache-size", type=int, default=10000, help="наибольшее число записей в кэше")
+    parser.add_argument("--mapped", action="store_true", help="двоичные кэши задач рядом с файлами (файл.map) для быстрой повторной загрузки")
+    args = parser.parse_args(argv)
+
+    options = {"method": args.method, "backend": args.backend, "pricing": args.pricing,
+               "max_iterations": args.max_iterations, "time_limit": args.timeout, "presolve": args.presolve}
+    files = collect_files(args.paths)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in solve_batch(files, args.workers, args.chunksize, options, args.cache, args.cache_size, args.mapped):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from datetime import datetime
+from fractions import Fraction
+from time import perf_counter
+import numpy as np
+from Services.model import LinearModel, compile_model
+from Services.pricing import PivotControl
+from Services.simplex import solve
+
+
+SIZES = {
+    "dense": (5, 10, 20, 40),
+    "transport": (3, 5, 8, 12),
+    "assignment": (3, 5, 8, 12),
+    "klee-minty": (3, 5, 7, 9),
+    "degenerate": (1, 2, 4, 8),
+    "gauss": (2, 4, 8, 16),
+}
+QUICK_SIZES = {family: sizes[:2] for family, sizes in SIZES.items()}
+SOLVERS = ("fraction", "bareiss", "numpy", "revised")
+GAUSS_SOLVERS = ("gauss-numeric", "gauss-symbolic")
+
+
+def dense_model(n, seed=0):
+    """
+        Плотная задача n×n: max c·x при A·x <= b (половина строк) и A·x >= b (другая
+        половина). Правые части строятся по случайной точке x0 из [0, 1]^n, поэтому задача
+        совместна, а строки ">=" требуют первой фазы.
+    """
+    rng = random.Random(seed)
+    model = LinearModel(n, 'max', [Fraction(rng.randint(1, 9)) for _ in range(n)])
+    point = [Fraction(rng.randint(0, 4), 4) for _ in range(n)]
+    for i in range(n):
+        row = {j: Fraction(rng.randint(1, 9)) for j in range(n)}
+        value = sum(row[j] * point[j] for j in range(n))
+        if i % 2 == 0:
+            model.add_constraint(row, "<=", value + rng.randint(1, 10))
+        else:
+            model.add_constraint(row, ">=", max(value - rng.randint(1, 10), 0))
+    return model
+
+
+def transport_model(k, seed=0):
+    """
+        Транспортная задача k поставщиков × k потребителей (k² переменных, 2k строк,
+        в каждой строке k элементов): min стоимости, Σ_j x_ij <= s_i, Σ_i x_ij >= d_j, Σs = Σd.
+    """
+    rng = random.Random(seed)
+    supply = [rng.randint(10, 50) for _ in range(k)]
+    demand = [rng.randint(10, 50) for _ in range(k)]
+    demand[-1] += sum(supply) - sum(demand)
+    if demand[-1] < 0:
+        supply[-1] -= demand[-1]
+        demand[-1] = 0
+    model = LinearModel(k * k, 'min', [Fraction(rng.randint(1, 20)) for _ in range(k * k)])
+    for i in range(k):
+        model.add_constraint({i * k + j: 1 for j in range(k)}, "<=", supply[i])
+    for j in range(k):
+        model.add_constraint({i * k + j: 1 for i in range(k)}, ">=", demand[j])
+    return model
+
+
+def assignment_model(k, seed=0):
+    """Задача о назначениях k×k: min стоимости, Σ_j x_ij = 1, Σ_i x_ij = 1 (сильно вырождена)."""
+    rng = random.Random(seed)
+    model = LinearModel(k * k, 'min', [Fraction(rng.randint(1, 20)) for _ in range(k * k)])
+    for i in range(k):
+        model.add_constraint({i * k + j: 1 for j in range(k)}, "=", 1)
+    for j in range(k):
+        model.add_constraint({i * k + j: 1 for i in range(k)}, "=", 1)
+    return model
+
+
+def klee_minty_model(n, seed=0):
+    """
+        Куб Кли–Минти размерности n: max Σ 2^(n-j)·x_j при
+        2·Σ_{j<i} 2^(i-j)·x_j + x_i <= 5^i. Правило Данцига обходит все 2^n вершин.
+    """
+    model = LinearModel(n, 'max', [Fraction(2 ** (n - j)) for j in range(1, n + 1)])
+    for i in range(1, n + 1):
+        row = {j - 1: 2 ** (i - j + 1) for j in range(1, i)}
+        row[i - 1] = 1
+        model.add_constraint(row, "<=", 5 ** i)
+    return model
+
+
+def degenerate_model(k, seed=0):
+    """
+        k независимых копий примера Била (4 переменные, 3 строки каждая): без защиты
+        от зацикливания правило Данцига возвращается к исходному базису.
+    """
+    objective = [Fraction(-3, 4), Fraction(20), Fraction(-1, 2), Fraction(6)]
+    rows = [([Fraction(1, 4), -8, -1, 9], 0), ([Fraction(1, 2), -12, Fraction(-1, 2), 3], 0), ([0, 0, 1, 0], 1)]
+    model = LinearModel(4 * k, 'min', objective * k)
+    for copy in range(k):
+        for coeffs, rhs in rows:
+            model.add_constraint({4 * copy + j: value for j, value in enumerate(coeffs) if value != 0}, "<=", rhs)
+    return model
+
+
+FAMILIES = {
+    "dense": dense_model,
+    "transport": transport_model,
+    "assignment": assignment_model,
+    "klee-minty": klee_minty_model,
+    "degenerate": degenerate_model,
+}
+
+
+def model_strings(model):
+    """
+        Записывает задачу строками, как в полях ввода App: (objective_fun, constraints).
+        Нужна, чтобы замерить разбор (compile_model) на тех же задачах.
+    """
+    def expression(items):
+        terms = []
+        for j, value in items:
+            if value != 0:
+                terms.append(f"{'-' if value < 0 else '+'} {abs(value)}x_{j + 1}")
+        text = " ".join(terms) or "0x_1"
+        return text[2:] if text.startswith("+ ") else text
+
+    objective = expression(enumerate(model.objective))
+    constraints = [f"{expression(model.row(i))} {model.senses[i]} {model.rhs[i]}" for i in range(model.num_constraints())]
+    return (model.sense, objective), constraints
+
+
+class StageControl(PivotControl):
+    def __init__(self, time_limit=None):
+        """
+            PivotControl, отмечающий начало фаз (start_phase вызывается в начале первой
+            фазы или двойственного симплекс-метода и в начале второй фазы — и для min,
+            и для max): время и число шагов к каждому началу — в marks.
+        """
+        PivotControl.__init__(self, "dantzig", None, time_limit)
+        self.marks = []
+
+    def start_phase(self, engine):
+        self.marks.append((perf_counter(), self.iterations))
+        PivotControl.start_phase(self, engine)
+
+
+def run_simplex(strings, count_vars, solver, time_limit):
+    """
+        Один прогон: разбор строк и решение.
+
+        Возвращает:
+        Словарь: stages (время этапов в секундах), pivots, phase1_pivots, status, objective.
+        Для solver="revised" этапы таблицы и фаз не выделяются (там нет таблицы).
+    """
+    started = perf_counter()
+    model = compile_model(strings[0], strings[1], count_vars)
+    parsed = perf_counter()
+    control = StageControl(time_limit)
+    if solver == "revised":
+        result = solve(model=model, method="revised", control=control)
+    else:
+        result = solve(model=model, backend=solver, control=control)
+    finished = perf_counter()
+    # первая отметка — таблица построена; вторая — начало второй фазы
+    # (у несовместной задачи второй фазы нет)
+    ready, _ = control.marks[0] if control.marks else (finished, 0)
+    phase2, phase1_pivots = control.marks[1] if len(control.marks) > 1 else (finished, result.iterations)
+    stages = {"parse": parsed - started, "total": finished - started}
+    if solver != "revised":
+        stages.update({"tableau": ready - parsed, "phase1": phase2 - ready, "phase2": finished - phase2})
+    return {"stages": stages, "pivots": result.iterations, "phase1_pivots": phase1_pivots,
+            "status": result.status, "objective": str(result.objective) if result.objective is not None else None,
+            "solve_time": finished - ready}
+
+
+def gauss_system(m, seed=0):
+    """Совместная система m уравнений с m + 2 неизвестными (целые коэффициенты) и целевая функция."""
+    rng = random.Random(seed)
+    A = [[rng.randint(-9, 9) or 1 for _ in range(m + 2)] for _ in range(m)]
+    point = [rng.randint(1, 5) for _ in range(m + 2)]
+    rhs = [sum(a * x for a, x in zip(row, point)) for row in A]
+    objective = [rng.randint(-5, 5) for _ in range(m + 2)]
+    return A, rhs, objective
+
+
+def run_gauss(system, mode, time_limit):
+    """
+        Один прогон GaussAlgorithm: исключение (doit), проверка базиса (check_matrix),
+        подстановка (podstanovka) и решение спроецированной задачи двух переменных.
+        Этапы: parse — построение матриц, tableau — исключение, phase1 — проверка и
+        подстановка, phase2 — решение спроецированной задачи.
+    """
+    from Services.graph import GaussAlgorithm
+    A, rhs, objective = system
+    started = perf_counter()
+    if mode == "symbolic":
+        from sympy import Matrix
+        A, rhs, objective = Matrix(A), Matrix(rhs), Matrix(objective)
+    gauss = GaussAlgorithm(A, rhs, objective, mode=mode)
+    built = perf_counter()
+    gauss.doit()
+    eliminated = perf_counter()
+    status, objective_value, pivots = "unsuitable", None, 0
+    if gauss.check_matrix():
+        gauss.podstanovka()
+        projected = perf_counter()
+        result = solve(model=gauss.reduced_model('min'), time_limit=time_limit)
+        status, pivots = result.status, result.iterations
+        objective_value = str(result.objective) if result.objective is not None else None
+    else:
+        projected = perf_counter()
+    finished = perf_counter()
+    stages = {"parse": built - started, "tableau": eliminated - built, "phase1": projected - eliminated,
+              "phase2": finished - projected, "total": finished - started}
+    return {"stages": stages, "pivots": pivots, "phase1_pivots": 0, "status": status, "objective": objective_value,
+            "solve_time": finished - projected}
+
+
+def measure(run, repeat):
+    """
+        Выполняет run() repeat раз и берёт медиану времени каждого этапа: на общих
+        машинах и виртуальных ядрах частота плавает, и минимум (как в timeit) между
+        запусками расходится сильнее медианы. Перед замерами — один
+        прогон вхолостую (отложенные импорты SciPy и SymPy не должны попасть в первый
+        размер). Сборщик мусора на время замеров выключается, как в timeit. Пиковая
+        память измеряется отдельным прогоном под tracemalloc (он замедляет выполнение
+        и в замеры времени не входит).
+    """
+    run()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        runs = [run() for _ in range(repeat)]
+    finally:
+        if enabled:
+            gc.enable()
+    result = dict(runs[0])
+    result["stages"] = {stage: float(np.median([r["stages"][stage] for r in runs])) for stage in runs[0]["stages"]}
+    result["solve_time"] = float(np.median([r["solve_time"] for r in runs]))
+    tracemalloc.start()
+    try:
+        run()
+        result["peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+    result["pivots_per_s"] = result["pivots"] / result["solve_time"] if result["solve_time"] > 0 else None
+    del result["solve_time"]
+    return result
+
+
+def run_suite(families=None, solvers=None, sizes=None, repeat=5, time_limit=60.0, seed=0, log=None):
+    """
+        Запускает замеры.
+
+        Аргументы:
+        - families: семейства задач (ключи SIZES; "gauss" — системы для GaussAlgorithm).
+        - solvers: бэкенды Simplex ("fraction", "bareiss", "numpy") и "revised"; для "gauss" —
+          всегда оба режима GaussAlgorithm.
+        - sizes: словарь {семейство: размеры} (по умолчанию SIZES).
+        - repeat: число прогонов на замер (берётся медиана).
+        - time_limit: ограничение времени одного решения; задача, не уложившаяся в него,
+          записывается со статусом "time_limit", большие размеры этого семейства и
+          решателя пропускаются.
+        - seed: зерно генераторов (одинаковое зерно — одинаковые задачи).
+        - log: файл для строк прогресса (например, sys.stderr) или None.
+
+        Возвращает:
+        Список записей: family, size, solver, rows, columns, nnz, stages, pivots,
+        phase1_pivots, pivots_per_s, peak_kb, status, objective.
+    """
+    families = families or list(SIZES)
+    solvers = solvers or list(SOLVERS)
+    sizes = sizes or SIZES
+    results = []
+    for family in families:
+        if family == "gauss":
+            for solver in GAUSS_SOLVERS:
+                for size in sizes[family]:
+                    system = gauss_system(size, seed)
+                    record = measure(lambda: run_gauss(system, solver.split("-")[1], time_limit), repeat)
+                    record.update({"family": family, "size": size, "solver": solver, "rows": size, "columns": size + 2,
+                                   "nnz": size * (size + 2)})
+                    results.append(record)
+                    report(record, log)
+            continue
+        for solver in solvers:
+            for size in sizes[family]:
+                model = FAMILIES[family](size, seed)
+                strings = model_strings(model)
+                record = measure(lambda: run_simplex(strings, model.count_vars, solver, time_limit), repeat)
+                record.update({"family": family, "size": size, "solver": solver, "rows": model.num_constraints(),
+                               "columns": model.count_vars, "nnz": len(model.values)})
+                results.append(record)
+                report(record, log)
+                if record["status"] == "time_limit":
+                    break
+    return results
+
+
+def report(record, log):
+    """Строка прогресса для одного замера."""
+    if log is not None:
+        rate = f"{record['pivots_per_s']:.0f}" if record["pivots_per_s"] else "—"
+        log.write(f"{record['family']:>11} {record['size']:>4} {record['solver']:>14}  {record['stages']['total'] * 1000:10.2f} мс"
+                  f"  шагов {record['pivots']:>6}  шагов/с {rate:>9}  пик {record['peak_kb']:>8} КБ  {record['status']}\n")
+        log.flush()
+
+
+def scaling(results):
+    """
+        Показатели роста: для каждой пары (семейство, решатель) — наклон прямой
+        log(время) от log(размер) по методу наименьших квадратов (1 — линейный рост,
+        2 — квадратичный; у Кли–Минти рост экспоненциальный, и наклон растёт с размером).
+        Учитываются замеры со статусом "optimal" и ненулевым временем.
+    """
+    groups = {}
+    for record in results:
+        if record["status"] == "optimal" and record["stages"]["total"] > 0:
+            groups.setdefault((record["family"], record["solver"]), []).append(record)
+    curves = []
+    for (family, solver), records in groups.items():
+        if len(records) < 2:
+            continue
+        x = np.log([record["size"] for record in records])
+        y = np.log([record["stages"]["total"] for record in records])
+        exponent = float(np.polyfit(x, y, 1)[0])
+        curves.append({"family": family, "solver": solver, "exponent": round(exponent, 3),
+                       "sizes": [record["size"] for record in records],
+                       "total": [record["stages"]["total"] for record in records]})
+    return curves
+
+
+def compare(baseline, current, threshold=1.5, min_time=0.005):
+    """
+        Сравнивает два прогона (словари из JSON, см. main) по совпадающим замерам
+        (семейство, размер, решатель).
+
+        Аргументы:
+        - threshold: допустимое отношение времени текущего прогона к базовому.
+        - min_time: разница меньше этой (в секундах) не считается замедлением — у очень
+          быстрых замеров она на уровне шума таймера.
+
+        Возвращает:
+        Список строк с описанием регрессий: общее время выросло больше чем в threshold раз
+        или число шагов увеличилось (шаги не зависят от нагрузки машины и ловят изменение
+        хода решения даже там, где время меньше min_time).
+    """
+    key = lambda record: (record["family"], record["size"], record["solver"])
+    base = {key(record): record for record in baseline["results"]}
+    problems = []
+    for record in current["results"]:
+        old = base.get(key(record))
+        if old is None:
+            continue
+        name = f"{record['family']} {record['size']} {record['solver']}"
+        new_time, old_time = record["stages"]["total"], old["stages"]["total"]
+        if new_time > old_time * threshold and new_time - old_time > min_time:
+            problems.append(f"{name}: время {old_time * 1000:.2f} -> {new_time * 1000:.2f} мс ({new_time / old_time:.2f}×)")
+        if record["pivots"] > old["pivots"]:
+            problems.append(f"{name}: шагов {old['pivots']} -> {record['pivots']}")
+        if record["status"] != old["status"]:
+            problems.append(f"{name}: статус {old['status']} -> {record['status']}")
+    return problems
+
+
+def main(argv=None):
+    """
+        Точка входа командной строки:
+
+            python -m Services.bench -o base.json
+            python -m Services.bench --quick --compare base.json --threshold 1.3
+
+        Печатает ход замеров и показатели роста, сохраняет результаты в JSON (-o).
+        С --compare завершается с кодом 1, если найдены регрессии (см. compare).
+    """
+    parser = argparse.ArgumentParser(prog="python -m Services.bench", description="Замеры производительности Simplex и GaussAlgorithm")
+    parser.add_argument("-o", "--output", help="файл JSON для результатов")
+    parser.add_argument("--families", nargs="+", choices=list(SIZES), help="семейства задач (по умолчанию все)")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), help="решатели (по умолчанию все)")
+    parser.add_argument("--quick", action="store_true", help="только два наименьших размера каждого семейства")
+    parser.add_argument("--repeat", type=int, default=5, help="прогонов на замер (берётся медиана)")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="ограничение времени одного решения, с")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генераторов задач")
+    parser.add_argument("--compare", help="файл JSON базового прогона для проверки регрессий")
+    parser.add_argument("--threshold", type=float, default=1.5, help="допустимое замедление относительно базового прогона")
+    parser.add_argument("--min-time", type=float, default=0.005, help="разница времени (с), меньше которой замедление не считается")
+    args = parser.parse_args(argv)
+
+    started = datetime.now()
+    results = run_suite(args.families, args.solvers, QUICK_SIZES if args.quick else SIZES, args.repeat, args.time_limit, args.seed, sys.stderr)
+    curves = scaling(results)
+    for curve in curves:
+        print(f"{curve['family']:>11} {curve['solver']:>14}  показатель роста {curve['exponent']:.2f}")
+    data = {
+        "meta": {"started": started.isoformat(timespec="seconds"), "python": platform.python_version(), "numpy": np.__version__,
+                 "platform": platform.platform(), "repeat": args.repeat, "seed": args.seed, "quick": args.quick},
+        "results": results,
+        "scaling": curves,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(baseline, data, args.threshold, args.min_time)
+        for problem in problems:
+            print("Регрессия:", problem)
+        if problems:
+            sys.exit(1)
+        print("Регрессий нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from fractions import Fraction
+from Services.model import LinearModel
+
+
+class StandardForm(object):
+    def __init__(self, model):
+        """
+            Приводит задачу с границами переменных к виду y >= 0 с верхними границами,
+            не добавляя строк ограничений.
+
+            Аргументы:
+            - model: скомпилированная задача (Services.model.LinearModel) с границами lower/upper.
+
+            Замена переменных (для каждой исходной x_j):
+            - конечная нижняя граница: x_j = lower + y, верхняя граница y — upper - lower (или нет);
+            - только верхняя граница: x_j = upper - y, y >= 0 без верхней границы;
+            - свободная переменная: x_j = y⁺ - y⁻ (два столбца).
+            Правые части сдвигаются на вклад сдвигов, целевая функция — на offset.
+
+            Если у всех переменных обычные границы (x >= 0), задача не копируется
+            и ничего не меняется (identity = True).
+
+            Атрибуты:
+            - model: задача над y (LinearModel без границ, кроме y >= 0).
+            - upper: верхние границы столбцов y (None — нет); их учитывает ограниченный
+              симплекс-метод (Simplex) или строки as_rows (для других методов).
+            - offset: свободный член целевой функции после замены.
+            - infeasible: True, если у какой-то переменной lower > upper.
+        """
+        self.original = model
+        self.identity = model.has_default_bounds()
+        self.infeasible = False
+        self.offset = Fraction(0)
+        if self.identity:
+            self.model = model
+            self.upper = [None] * model.count_vars
+            self.columns = None
+            return
+
+        self.columns = []  # (исходная переменная, знак y в x_j)
+        self.shift = []
+        self.upper = []
+        for j in range(model.count_vars):
+            lower, upper = model.lower[j], model.upper[j]
+            if lower is not None:
+                if upper is not None and lower > upper:
+                    self.infeasible = True
+                self.columns.append((j, 1))
+                self.upper.append(upper - lower if upper is not None else None)
+                self.shift.append(lower)
+            elif upper is not None:
+                self.columns.append((j, -1))
+                self.upper.append(None)
+                self.shift.append(upper)
+            else:
+                self.columns.extend([(j, 1), (j, -1)])
+                self.upper.extend([None, None])
+                self.shift.append(Fraction(0))
+
+        by_variable = {}
+        for k, (j, sign) in enumerate(self.columns):
+            by_variable.setdefault(j, []).append((k, sign))
+        objective = [sign * model.objective[j] for j, sign in self.columns]
+        self.model = LinearModel(len(self.columns), model.sense, objective)
+        for i in range(model.num_constraints()):
+            coeffs = {}
+            rhs = model.rhs[i]
+            for j, value in model.row(i):
+                rhs -= value * self.shift[j]
+                for k, sign in by_variable[j]:
+                    coeffs[k] = sign * value
+            self.model.add_constraint(coeffs, model.senses[i], rhs)
+        self.offset = sum((model.objective[j] * self.shift[j] for j in range(model.count_vars)), Fraction(0))
+
+    def has_upper(self):
+        """Есть ли у столбцов конечные верхние границы."""
+        return any(value is not None for value in self.upper)
+
+    def recover(self, values):
+        """
+            Переводит значения столбцов y ({"x_k": значение}) в исходные переменные x.
+            Для identity словарь возвращается без изменений.
+        """
+        if self.identity:
+            return values
+        result = {'x_' + str(j + 1): self.shift[j] for j in range(self.original.count_vars)}
+        for k, (j, sign) in enumerate(self.columns):
+            value = values['x_' + str(k + 1)]
+            if value is not None:
+                result['x_' + str(j + 1)] = result['x_' + str(j + 1)] + sign * value
+        return result
+
+    def as_rows(self):
+        """
+            Возвращает задачу над y, где верхние границы записаны строками y_k <= upper_k
+            (для методов без встроенной поддержки границ, например RevisedSimplex).
+        """
+        if not self.has_upper():
+            return self.model
+        model = self.model
+        rows = LinearModel(model.count_vars, model.sense, list(model.objective), list(model.indptr), list(model.indices), list(model.values), list(model.senses), list(model.rhs))
+        for k, upper in enumerate(self.upper):
+            if upper is not None:
+                rows.add_constraint({k: Fraction(1)}, "<=", upper)
+        return rows
@@ -0,0 +1,279 @@
+import heapq
+import math
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from fractions import Fraction
+from time import perf_counter
+from Services.bounds import StandardForm
+from Services.pricing import CancelledError
+from Services.simplex import SimplexResult, solve
+
+
+_BASE = None  # исходная задача в процессе пула (см. init_worker)
+
+
+def init_worker(model):
+    """Запоминает исходную задачу в процессе пула: она пересылается один раз, а не с каждым узлом."""
+    global _BASE
+    _BASE = model
+
+
+def solve_node(rows, basis, options, model=None):
+    """
+        Решает непрерывную релаксацию узла дерева ветвлений.
+
+        Аргументы:
+        - rows: строки ветвления узла — список (индекс переменной, знак, значение),
+          т. е. x_j <= value или x_j >= value.
+        - basis: базис для продолжения решения (см. Simplex.warm_start) или None.
+        - options: параметры solve (method, backend, pricing).
+        - model: исходная задача; в процессе пула — запомненная init_worker.
+
+        Возвращает:
+        SimplexResult релаксации.
+    """
+    # матрица исходной задачи не копируется: строки ветвления дописываются к ней (with_rows)
+    node = (model if model is not None else _BASE).with_rows([({index: 1}, sense, value) for index, sense, value in rows])
+    return solve(model=node, basis=basis, **options)
+
+
+class BranchAndBound(object):
+    def __init__(self, model, strategy="best-bound", workers=1, method="tableau", backend="fraction", pricing="dantzig", node_limit=None, time_limit=None, gap=0, control=None, log_interval=1.0):
+        """
+            Метод ветвей и границ для задач с целочисленными переменными (model.integer).
+
+            Аргументы:
+            - model: скомпилированная задача (Services.model.LinearModel).
+            - strategy: выбор следующего узла: "best-bound" — узел с лучшей оценкой
+              (меньше узлов до доказательства оптимальности), "depth-first" — самый глубокий
+              (быстрее находит допустимое решение, меньше открытых узлов).
+            - workers: количество процессов для параллельного решения узлов
+              (1 — в текущем процессе).
+            - method, backend, pricing: как у solve для релаксаций.
+            - node_limit, time_limit: ограничения на число узлов и время поиска в секундах.
+            - gap: допустимый относительный зазор |рекорд - граница| / max(1, |рекорд|);
+              узлы, которые не могут улучшить рекорд больше чем на gap, отсекаются.
+            - control: PivotControl для отмены поиска из другого потока (control.cancel()).
+            - log_interval: как часто (в секундах) записывать ход поиска в log.
+
+            Шаги:
+            1. Решается релаксация корня. Если все целочисленные переменные получили целые
+               значения, решение оптимально.
+            2. Иначе выбирается наиболее дробная переменная x_j = v и создаются два потомка
+               со строками x_j <= floor(v) и x_j >= ceil(v). Оценка потомков — значение
+               релаксации родителя.
+            3. Релаксация потомка решается с базиса родителя, дополненного дополнительной
+               переменной новой строки: базис остаётся двойственно допустимым, и обычно
+               хватает нескольких шагов двойственного симплекс-метода (method="tableau";
+               с верхними границами переменных warm_start не применяется, узел решается с начала).
+            4. Узел отсекается, если его оценка не лучше рекорда, релаксация несовместна или
+               решение целочисленно (тогда оно становится новым рекордом).
+
+            Атрибуты:
+            - status: "optimal", "infeasible", "unbounded", "node_limit", "time_limit",
+              "cancelled" или статус релаксации, на которой поиск остановился.
+            - solution, objective: лучшее найденное целочисленное решение (рекорд) или None.
+            - bound: граница оптимального значения (лучшая оценка открытых узлов).
+            - gap: относительный зазор между рекордом и границей (None — рекорда нет).
+            - nodes, iterations: количество решённых узлов и шагов симплекс-метода.
+            - elapsed, throughput: время поиска и узлов в секунду.
+            - log: ход поиска — словари time, nodes, open, incumbent, bound, gap; запись
+              делается при каждом новом рекорде, не реже раза в log_interval секунд и в конце.
+        """
+        if strategy not in ("best-bound", "depth-first"):
+            raise ValueError(f"Неизвестная стратегия выбора узла: {strategy}")
+        self.model = model
+        self.strategy = strategy
+        self.workers = workers or 1
+        self.options = {"method": method, "backend": backend, "pricing": pricing}
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.relative_gap = gap
+        self.control = control
+        self.log_interval = log_interval
+        self.sign = 1 if model.sense == 'min' else -1
+        self.integer = [j for j in range(model.count_vars) if model.integer[j]]
+        # номер дополнительной переменной первой строки ветвления в нумерации столбцов таблицы
+        self.first_slack = None
+        if method == "tableau":
+            columns = StandardForm(model).model.count_vars
+            self.first_slack = columns + sum(1 for sense in model.senses if sense != '=')
+
+        self.status = None
+        self.message = None
+        self.solution = None
+        self.objective = None
+        self.bound = None
+        self.gap = None
+        self.pruned_bound = None
+        self.nodes = 0
+        self.iterations = 0
+        self.log = []
+        self.open = []
+        self.running = {}
+        self.counter = 0
+        self.run()
+
+    def push(self, bound, depth, rows, basis, preferred):
+        """Добавляет узел в очередь; preferred — потомок, который при поиске в глубину решается первым."""
+        self.counter += 1
+        order = self.counter if preferred else self.counter + 0.5
+        if self.strategy == "best-bound":
+            key = (self.sign * bound if bound is not None else -math.inf, order)
+        else:
+            key = (-depth, order)
+        heapq.heappush(self.open, (key, bound, depth, rows, basis))
+
+    def tolerance(self, value):
+        """Допуск сравнения значений: точные дроби сравниваются точно."""
+        return 0 if isinstance(value, (Fraction, int)) else 1e-9
+
+    def pruned(self, bound):
+        """
+            Не может ли узел с оценкой bound улучшить рекорд (с учётом допустимого зазора).
+            Оценка узла, отсечённого только по зазору, запоминается в pruned_bound:
+            она остаётся в границе оптимального значения.
+        """
+        if bound is None or self.objective is None:
+            return False
+        allowed = self.relative_gap * max(1, abs(self.objective)) + self.tolerance(bound)
+        if self.sign * (self.objective - bound) > allowed:
+            return False
+        if self.sign * (bound - self.objective) < 0 and (self.pruned_bound is None or self.sign * (bound - self.pruned_bound) < 0):
+            self.pruned_bound = bound
+        return True
+
+    def is_integral(self, value):
+        """Целое ли значение переменной (float — с допуском 1e-6)."""
+        if isinstance(value, Fraction):
+            return value.denominator == 1
+        return abs(value - round(value)) <= 1e-6
+
+    def branching_variable(self, solution):
+        """
+            Выбирает наиболее дробную целочисленную переменную.
+
+            Возвращает:
+            (индекс, значение) или None, если все целочисленные переменные имеют целые значения.
+        """
+        best, best_score = None, None
+        for j in self.integer:
+            value = solution['x_' + str(j + 1)]
+            if self.is_integral(value):
+                continue
+            fraction = value - math.floor(value)
+            score = min(fraction, 1 - fraction)
+            if best_score is None or score > best_score:
+                best, best_score = (j, value), score
+        return best
+
+    def global_bound(self):
+        """Лучшая оценка среди открытых, решаемых и отсечённых по зазору узлов (или рекорд)."""
+        bounds = [node[1] for node in self.open] + [node[1] for node in self.running.values()]
+        if any(bound is None for bound in bounds):
+            return None
+        bounds += [bound for bound in (self.objective, self.pruned_bound) if bound is not None]
+        if not bounds:
+            return None
+        return min(bounds, key=lambda bound: self.sign * bound)
+
+    def record(self):
+        """Записывает ход поиска в log и обновляет bound и gap."""
+        self.bound = self.global_bound()
+        if self.objective is not None and self.bound is not None:
+            self.gap = float(abs(self.objective - self.bound)) / max(1.0, float(abs(self.objective)))
+        else:
+            self.gap = None
+        self.logged = perf_counter()
+        self.log.append({"time": round(self.logged - self.started, 6), "nodes": self.nodes, "open": len(self.open) + len(self.running),
+                         "incumbent": self.objective, "bound": self.bound, "gap": self.gap})
+
+    def process(self, node, result):
+        """
+            Обрабатывает решённую релаксацию узла: отсечение, новый рекорд или ветвление.
+            Если релаксация неограниченна или решатель остановлен ограничением, поиск
+            останавливается с её статусом.
+        """
+        bound, depth, rows, basis = node[1:]
+        self.nodes += 1
+        self.iterations += result.iterations
+        if result.status == "infeasible":
+            return
+        if result.status != "optimal":
+            self.status, self.message = result.status, result.message
+            return
+        if self.pruned(result.objective):
+            return
+        branch = self.branching_variable(result.solution)
+        if branch is None:
+            self.solution, self.objective = result.solution, result.objective
+            self.record()
+            return
+        index, value = branch
+        down, up = math.floor(value), math.ceil(value)
+        child_basis = None
+        if self.first_slack is not None and result.basis is not None:
+            child_basis = list(result.basis) + [self.first_slack + len(rows)]
+        up_first = value - down >= Fraction(1, 2)
+        self.push(result.objective, depth + 1, rows + [(index, "<=", down)], child_basis, not up_first)
+        self.push(result.objective, depth + 1, rows + [(index, ">=", up)], child_basis, up_first)
+
+    def stopped(self):
+        """Проверяет ограничения поиска; при срабатывании записывает статус."""
+        if self.control is not None and self.control.cancelled:
+            self.status, self.message = "cancelled", str(CancelledError("Решение отменено"))
+        elif self.node_limit is not None and self.nodes >= self.node_limit:
+            self.status, self.message = "node_limit", f"Превышено количество узлов: {self.node_limit}"
+        elif self.time_limit is not None and perf_counter() - self.started > self.time_limit:
+            self.status, self.message = "time_limit", f"Превышено время решения: {self.time_limit} с"
+        return self.status is not None
+
+    def run(self):
+        """Поиск по дереву: узлы выбираются из очереди и решаются в текущем процессе или в пуле."""
+        self.started = perf_counter()
+        self.logged = self.started
+        self.push(None, 0, [], None, True)
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self.model,))
+        try:
+            while (self.open or self.running) and not self.stopped():
+                if pool is None:
+                    node = heapq.heappop(self.open)
+                    if not self.pruned(node[1]):
+                        self.process(node, solve_node(node[3], node[4], self.options, self.model))
+                else:
+                    while self.open and len(self.running) < self.workers:
+                        node = heapq.heappop(self.open)
+                        if not self.pruned(node[1]):
+                            self.running[pool.submit(solve_node, node[3], node[4], self.options)] = node
+                    if self.running:
+                        done, _ = wait(list(self.running), return_when=FIRST_COMPLETED)
+                        for future in done:
+                            node = self.running.pop(future)
+                            if self.status is None:
+                                self.process(node, future.result())
+                if perf_counter() - self.logged >= self.log_interval:
+                    self.record()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        if self.status is None:
+            self.status = "optimal" if self.objective is not None else "infeasible"
+            if self.objective is None:
+                self.message = "Целочисленного решения не существует"
+        self.record()
+        self.running.clear()
+        self.elapsed = perf_counter() - self.started
+        self.throughput = self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def result(self):
+        """
+            Возвращает SimplexResult с лучшим целочисленным решением. Если поиск остановлен
+            ограничением, solution/objective — рекорд на момент остановки (или None).
+        """
+        return SimplexResult(self.status, self.solution, self.objective, iterations=self.iterations, message=self.message)
+
+    def report(self):
+        """Краткая статистика поиска: узлы, скорость, граница и зазор."""
+        gap = f"{self.gap:.2%}" if self.gap is not None else "—"
+        return f"Узлов: {self.nodes} ({self.throughput:.1f} в секунду), граница: {self.bound}, зазор: {gap}"
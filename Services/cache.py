@@ -0,0 +1,227 @@
+import hashlib
+import pickle
+import sqlite3
+from collections import OrderedDict
+from time import time
+
+
+def canonical_row(coeffs, sense, rhs):
+    """
+        Приводит ограничение к каноническому виду.
+
+        Аргументы:
+        - coeffs: список пар (индекс столбца, коэффициент).
+        - sense: "<=", ">=" или "=".
+        - rhs: правая часть.
+
+        Шаги:
+        1. Ограничение ">=" умножается на -1 и становится "<=".
+        2. Строка делится на модуль первого ненулевого коэффициента (положительный
+           множитель не меняет неравенство).
+        3. У равенства знак выбирается так, чтобы первый коэффициент был положительным.
+
+        Возвращает:
+        Кортеж (коэффициенты по возрастанию индекса, знак, правая часть).
+    """
+    items = sorted((index, value) for index, value in coeffs if value != 0)
+    if sense == ">=":
+        items = [(index, -value) for index, value in items]
+        rhs = -rhs
+        sense = "<="
+    if items:
+        scale = abs(items[0][1])
+        if sense == "=" and items[0][1] < 0:
+            scale = -scale
+        items = [(index, value / scale) for index, value in items]
+        rhs = rhs / scale
+    return tuple(items), sense, rhs
+
+
+def fingerprint(model, options=()):
+    """
+        Вычисляет отпечаток задачи, не зависящий от записи ограничений.
+
+        Аргументы:
+        - model: скомпилированная задача (Services.model.LinearModel).
+        - options: параметры решения, влияющие на результат (метод, бэкенд, правило).
+
+        Строки приводятся к каноническому виду (canonical_row) и сортируются, поэтому
+        "2x_1 + 4x_2 <= 8" и "-x_1 - 2x_2 >= -4", записанные в любом порядке, дают
+        один отпечаток. Целевая функция не масштабируется: от неё зависит значение.
+
+        Возвращает:
+        Кортеж (канонический отпечаток, отпечаток задачи как она есть) — строки SHA-256.
+        Второй нужен, чтобы базис и ход решения отдавались только для той же записи задачи.
+    """
+    rows = [(tuple(model.row(i)), model.senses[i], model.rhs[i]) for i in range(model.num_constraints())]
+    head = (model.count_vars, model.sense, tuple(model.objective), tuple(model.lower), tuple(model.upper), tuple(options))
+    canonical = repr((head, sorted(canonical_row(*row) for row in rows)))
+    source = repr((head, rows))
+    return hashlib.sha256(canonical.encode()).hexdigest(), hashlib.sha256(source.encode()).hexdigest()
+
+
+class SolveCache(object):
+    # кэшируются только окончательные ответы; остановка по ограничениям или отмена — нет
+    final_statuses = ("optimal", "unbounded", "infeasible")
+
+    def __init__(self, max_size=256, max_age=None, path=None):
+        """
+            Кэш результатов solve по отпечатку задачи (см. fingerprint).
+
+            Аргументы:
+            - max_size: наибольшее число записей; лишние вытесняются по давности
+              последнего обращения (LRU).
+            - max_age: срок жизни записи в секундах (None — бессрочно).
+            - path: файл SQLite для хранения между запусками (None — только в памяти).
+              Записи из файла подгружаются в память при первом обращении.
+
+            Запись — (SimplexResult, ход решения или None, параметры вывода хода,
+            отпечаток исходной записи задачи, время создания).
+
+            Атрибуты:
+            - hits, misses, evictions: счётчики попаданий, промахов и вытеснений.
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            # WAL: несколько процессов пакета читают файл одновременно, запись без fsync на каждый commit
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, created REAL, used REAL)")
+            self.stored = self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if self.max_age is not None or self.stored > self.max_size:
+                self.evict_stored()
+
+    def stats(self):
+        """Возвращает счётчики и текущий размер кэша."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.entries)}
+
+    def expired(self, created, now):
+        return self.max_age is not None and now - created > self.max_age
+
+    def lookup(self, key, now):
+        """Ищет запись в памяти, затем в файле; просроченные записи удаляются."""
+        entry = self.entries.get(key)
+        if entry is None and self.db is not None:
+            row = self.db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = pickle.loads(row[0])
+                self.entries[key] = entry
+        if entry is None:
+            return None
+        if self.expired(entry[4], now):
+            self.discard(key)
+            self.evictions += 1
+            return None
+        self.entries.move_to_end(key)
+        self.trim()
+        if self.db is not None:
+            self.db.execute("UPDATE results SET used = ? WHERE key = ?", (now, key))
+            self.db.commit()
+        return entry
+
+    def get(self, key, source, trace=None):
+        """
+            Возвращает сохранённый результат или None.
+
+            Аргументы:
+            - key, source: отпечатки из fingerprint.
+            - trace: наблюдатель (Services.trace.TraceRenderer) или None. Если ход решения
+              нужен, запись подходит только при той же записи задачи и тех же параметрах
+              вывода — тогда сохранённый текст сразу передаётся наблюдателю.
+
+            Возвращает:
+            SimplexResult (копию; базис и двойственные оценки — только для той же записи задачи) или None.
+        """
+        now = time()
+        entry = self.lookup(key, now)
+        if entry is not None and trace is not None:
+            if entry[1] is None or entry[2] != trace.settings() or entry[3] != source:
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        result = pickle.loads(pickle.dumps(entry[0]))
+        if entry[3] != source:
+            # строки другой записи задачи могут быть переставлены и отмасштабированы
+            result.basis = None
+            result.duals = None
+        if trace is not None:
+            trace.replay(entry[1])
+        return result
+
+    def put(self, key, source, result, trace=None):
+        """
+            Сохраняет результат (только окончательный: optimal, unbounded, infeasible).
+
+            Аргументы:
+            - key, source: отпечатки из fingerprint.
+            - result: SimplexResult.
+            - trace: наблюдатель, записывавший ход решения в trace.record, или None.
+        """
+        if result.status not in self.final_statuses:
+            return
+        now = time()
+        text = ''.join(trace.record) if trace is not None and trace.record is not None else None
+        settings = trace.settings() if trace is not None else None
+        # копия: вызывающий код может изменить result после сохранения
+        entry = (pickle.loads(pickle.dumps(result)), text, settings, source, now)
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        self.trim()
+        if self.db is not None:
+            # запись по тому же ключу (например, с другими параметрами вывода) заменяется, а не добавляется
+            added = self.db.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is None
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, pickle.dumps(entry), now, now))
+            if added:
+                self.stored += 1
+                if self.stored > self.max_size:
+                    self.evict_stored()
+            self.db.commit()
+
+    def trim(self):
+        """Вытесняет из памяти самые давно использованные записи сверх max_size (в файле они остаются)."""
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            if self.db is None:
+                self.evictions += 1
+
+    def discard(self, key):
+        """Удаляет запись из памяти и файла."""
+        self.entries.pop(key, None)
+        if self.db is not None:
+            self.db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.db.commit()
+
+    def evict_stored(self):
+        """Удаляет из файла просроченные записи и самые давно использованные сверх max_size."""
+        removed = 0
+        if self.max_age is not None:
+            removed += self.db.execute("DELETE FROM results WHERE created < ?", (time() - self.max_age,)).rowcount
+        removed += self.db.execute("DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY used DESC LIMIT ?)", (self.max_size,)).rowcount
+        self.db.commit()
+        self.evictions += removed
+        self.stored = self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        """Очищает кэш (и файл) и сбрасывает счётчики."""
+        self.entries.clear()
+        if self.db is not None:
+            self.db.execute("DELETE FROM results")
+            self.db.commit()
+            self.stored = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def close(self):
+        """Закрывает файл кэша."""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,692 @@
+import argparse
+import re
+from fractions import Fraction
+from Services.bars import open_bars, read_bars, write_bars
+from Services.model import LinearModel, csr_from_triplets
+
+
+INFINITY = Fraction(10) ** 30  # |значение| >= 1e30 в MPS означает отсутствие границы
+SUFFIXES = (".bars", ".mps", ".lp", ".mps.gz", ".lp.gz")
+
+
+def parse_number(text):
+    """
+        Число из файла MPS/LP точно (десятичная запись, в том числе 1.5e-3) как Fraction;
+        Inf/Infinity — ±INFINITY.
+    """
+    if text.lstrip("+-").lower() in ("inf", "infinity"):
+        return -INFINITY if text.startswith("-") else INFINITY
+    try:
+        return Fraction(int(text)) if text.isdigit() else Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Ожидалось число: {text!r}")
+
+
+def format_number(value):
+    """
+        Число для MPS/LP: целое — как есть, конечная десятичная дробь — точно,
+        остальные дроби (например, 1/3) — ближайшим float.
+    """
+    if not isinstance(value, Fraction):
+        value = Fraction(value)
+    if value.denominator == 1:
+        return str(value.numerator)
+    denominator, twos, fives = value.denominator, 0, 0
+    while denominator % 2 == 0:
+        denominator //= 2
+        twos += 1
+    while denominator % 5 == 0:
+        denominator //= 5
+        fives += 1
+    if denominator != 1:
+        return repr(float(value))
+    digits = max(twos, fives)
+    scaled = abs(value.numerator) * 10 ** digits // value.denominator
+    sign = "-" if value < 0 else ""
+    return f"{sign}{scaled // 10 ** digits}.{scaled % 10 ** digits:0{digits}d}"
+
+
+class ModelBuilder(object):
+    def __init__(self):
+        """
+            Накапливает задачу по частям при потоковом чтении файлов MPS и LP:
+            переменные и строки получают номера в порядке первого появления,
+            элементы матрицы хранятся тройками (строка, столбец, значение) и
+            собираются в CSR один раз в конце (build).
+        """
+        self.sense = 'min'
+        self.columns = {}
+        self.column_names = []
+        self.row_index = {}
+        self.row_names = []
+        self.senses = []
+        self.rhs = []
+        self.ranges = {}
+        self.objective = {}
+        self.constant = Fraction(0)
+        self.lower = []
+        self.upper = []
+        self.integer = []
+        self.entries_rows = []
+        self.entries_columns = []
+        self.entries_values = []
+
+    def column(self, name):
+        """Номер переменной name (новая переменная получает границы x >= 0)."""
+        index = self.columns.get(name)
+        if index is None:
+            index = self.columns[name] = len(self.column_names)
+            self.column_names.append(name)
+            self.lower.append(Fraction(0))
+            self.upper.append(None)
+            self.integer.append(False)
+        return index
+
+    def add_row(self, name, sense, rhs=0):
+        """Добавляет строку ограничения и возвращает её номер."""
+        if name in self.row_index:
+            raise ValueError(f"Ограничение {name} задано дважды")
+        index = self.row_index[name] = len(self.row_names)
+        self.row_names.append(name)
+        self.senses.append(sense)
+        self.rhs.append(Fraction(rhs))
+        return index
+
+    def add_entry(self, row, column, value):
+        """Добавляет элемент матрицы (нулевые пропускаются)."""
+        if value != 0:
+            self.entries_rows.append(row)
+            self.entries_columns.append(column)
+            self.entries_values.append(value)
+
+    def build(self):
+        """
+            Возвращает (LinearModel, имена переменных, имена ограничений).
+
+            Двусторонние ограничения (RANGES в MPS) становятся парой строк ">=" и "<="
+            (вторая получает имя с суффиксом "_range").
+        """
+        m = len(self.row_names)
+        rows, columns, values = self.entries_rows, self.entries_columns, self.entries_values
+        if self.ranges:
+            by_row = {}
+            for k, i in enumerate(rows):
+                if i in self.ranges:
+                    by_row.setdefault(i, []).append(k)
+            for i, (low, high) in self.ranges.items():
+                self.senses[i], self.rhs[i] = ">=", low
+                extra = self.add_row(self.row_names[i] + "_range", "<=", high)
+                for k in by_row.get(i, []):
+                    rows.append(extra)
+                    columns.append(columns[k])
+                    values.append(values[k])
+            m = len(self.row_names)
+        n = len(self.column_names)
+        objective = [Fraction(0)] * n
+        for j, value in self.objective.items():
+            objective[j] = value
+        indptr, indices, values = csr_from_triplets(m, rows, columns, values)
+        model = LinearModel(n, self.sense, objective, indptr, indices, values, self.senses, self.rhs,
+                            self.constant, self.lower, self.upper, self.integer)
+        return model, self.column_names, self.row_names
+
+
+def mps_fields(line, fixed):
+    """Поля строки данных MPS: в свободном формате — через пробелы, в фиксированном — по позициям."""
+    if not fixed:
+        return line.split()
+    fields = [line[1:3], line[4:12], line[14:22], line[24:36], line[39:47], line[49:61]]
+    fields = [field.strip() for field in fields]
+    while fields and not fields[-1]:
+        fields.pop()
+    return fields
+
+
+def read_mps(path, fixed=False):
+    """
+        Читает задачу в формате MPS (свободном или фиксированном) построчно.
+
+        Аргументы:
+        - path: путь к файлу (сжатие gzip определяется автоматически).
+        - fixed: фиксированный формат (поля по позициям, имена могут содержать пробелы).
+
+        Поддерживаются секции NAME, OBJSENSE, ROWS, COLUMNS (с маркерами INTORG/INTEND),
+        RHS (правая часть строки цели — свободный член с обратным знаком), RANGES и BOUNDS
+        (UP, LO, FX, FR, MI, PL, BV, LI, UI; |значение| >= 1e30 — бесконечность). Целевая
+        функция — первая строка типа N, остальные строки N пропускаются. Для UP с
+        отрицательным значением при нулевой нижней границе нижняя граница снимается
+        (как в CPLEX). Полунепрерывные переменные (SC) не поддерживаются.
+
+        Возвращает:
+        (LinearModel, имена переменных, имена ограничений).
+    """
+    builder = ModelBuilder()
+    objective_row = None
+    free_rows = set()
+    section = None
+    integer = False
+    with open_bars(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip() or line.startswith("*"):
+                continue
+            if not line[0].isspace():
+                words = line.split()
+                section = words[0].upper()
+                if section == "OBJSENSE" and len(words) > 1:
+                    builder.sense = 'max' if words[1].upper().startswith("MAX") else 'min'
+                if section == "ENDATA":
+                    break
+                if section not in ("NAME", "OBJSENSE", "OBJSENCE", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS"):
+                    raise ValueError(f"Строка {number}: неизвестная секция MPS {section}")
+                continue
+            fields = mps_fields(line, fixed)
+            if section in ("OBJSENSE", "OBJSENCE"):
+                builder.sense = 'max' if line.split()[0].upper().startswith("MAX") else 'min'
+                continue
+            if fixed and section in ("COLUMNS", "RHS", "RANGES"):
+                fields = fields[1:]  # первое поле (тип) в этих секциях пустое
+            if section == "ROWS":
+                kind, name = fields[0].upper(), fields[1]
+                if kind == "N":
+                    if objective_row is None:
+                        objective_row = name
+                    else:
+                        free_rows.add(name)
+                elif kind in ("L", "G", "E"):
+                    builder.add_row(name, {"L": "<=", "G": ">=", "E": "="}[kind])
+                else:
+                    raise ValueError(f"Строка {number}: неизвестный тип ограничения {kind}")
+            elif section == "COLUMNS":
+                if len(fields) >= 3 and fields[1].strip("'\"").upper() == "MARKER":
+                    marker = fields[-1].strip("'\"").upper()
+                    integer = marker == "INTORG" if marker in ("INTORG", "INTEND") else integer
+                    continue
+                j = builder.column(fields[0])
+                if integer:
+                    builder.integer[j] = True
+                for k in range(1, len(fields) - 1, 2):
+                    row, value = fields[k], parse_number(fields[k + 1])
+                    if row == objective_row:
+                        builder.objective[j] = builder.objective.get(j, 0) + value
+                    elif row not in free_rows:
+                        if row not in builder.row_index:
+                            raise ValueError(f"Строка {number}: неизвестное ограничение {row}")
+                        builder.add_entry(builder.row_index[row], j, value)
+            elif section in ("RHS", "RANGES"):
+                pairs = fields[1:] if len(fields) % 2 else fields
+                for k in range(0, len(pairs) - 1, 2):
+                    row, value = pairs[k], parse_number(pairs[k + 1])
+                    if section == "RHS" and row == objective_row:
+                        builder.constant = -value
+                    elif row in free_rows:
+                        continue
+                    elif row not in builder.row_index:
+                        raise ValueError(f"Строка {number}: неизвестное ограничение {row}")
+                    elif section == "RHS":
+                        builder.rhs[builder.row_index[row]] = value
+                    else:
+                        builder.ranges[builder.row_index[row]] = value
+            elif section == "BOUNDS":
+                kind = fields[0].upper()
+                valueless = kind in ("FR", "MI", "PL") or (kind == "BV" and len(fields) < 4)
+                column = fields[2] if len(fields) >= (3 if valueless else 4) else fields[1]
+                value = None if valueless else parse_number(fields[-1])
+                apply_mps_bound(builder, builder.column(column), kind, value, number)
+
+    # диапазоны: L — [rhs - |R|, rhs], G — [rhs, rhs + |R|], E — по знаку R
+    ranges = {}
+    for i, value in builder.ranges.items():
+        rhs, sense = builder.rhs[i], builder.senses[i]
+        if sense == "<=":
+            ranges[i] = (rhs - abs(value), rhs)
+        elif sense == ">=":
+            ranges[i] = (rhs, rhs + abs(value))
+        else:
+            ranges[i] = (rhs, rhs + value) if value >= 0 else (rhs + value, rhs)
+    builder.ranges = ranges
+    return builder.build()
+
+
+def apply_mps_bound(builder, j, kind, value, number):
+    """Применяет строку секции BOUNDS к переменной j."""
+    infinite = value is not None and abs(value) >= INFINITY
+    if kind == "UP":
+        builder.upper[j] = None if infinite else value
+        if value < 0 and builder.lower[j] == 0:
+            builder.lower[j] = None
+    elif kind == "LO":
+        builder.lower[j] = None if infinite else value
+    elif kind == "FX":
+        builder.lower[j] = builder.upper[j] = value
+    elif kind == "FR":
+        builder.lower[j] = builder.upper[j] = None
+    elif kind == "MI":
+        builder.lower[j] = None
+    elif kind == "PL":
+        builder.upper[j] = None
+    elif kind == "BV":
+        builder.lower[j], builder.upper[j] = Fraction(0), Fraction(1)
+        builder.integer[j] = True
+    elif kind == "LI":
+        builder.lower[j] = None if infinite else value
+        builder.integer[j] = True
+    elif kind == "UI":
+        builder.upper[j] = None if infinite else value
+        builder.integer[j] = True
+    else:
+        raise ValueError(f"Строка {number}: тип границы {kind} не поддерживается")
+
+
+def fixed_number(value):
+    """Число не длиннее 12 символов для поля фиксированного MPS."""
+    text = format_number(value)
+    precision = 12
+    while len(text) > 12 and precision > 1:
+        text = f"{float(value):.{precision}g}"
+        precision -= 1
+    return text
+
+
+def write_mps(path, model, column_names=None, row_names=None, fixed=False, compress=False):
+    """
+        Записывает задачу в формате MPS (по умолчанию свободном).
+
+        Аргументы:
+        - path: путь к файлу.
+        - model: Services.model.LinearModel.
+        - column_names, row_names: имена переменных и ограничений (по умолчанию x_1..., c_1...).
+        - fixed: фиксированный формат (имена не длиннее 8 символов, числа — 12).
+        - compress: сжать gzip.
+
+        Матрица хранится по строкам, а MPS перечисляет её по столбцам: перестановка
+        строится на номерах элементов, без копирования коэффициентов. Целочисленные
+        переменные окружаются маркерами INTORG/INTEND.
+    """
+    n, m = model.count_vars, model.num_constraints()
+    column_names = column_names or ['x_' + str(j + 1) for j in range(n)]
+    row_names = row_names or ['c_' + str(i + 1) for i in range(m)]
+    if fixed and any(len(name) > 8 for name in list(column_names) + list(row_names)):
+        raise ValueError("В фиксированном формате MPS имена не длиннее 8 символов")
+    number = fixed_number if fixed else format_number
+
+    def line(*fields):
+        if not fixed:
+            return " " + " ".join(fields) + "\n"
+        widths = [(1, 2), (4, 8), (14, 8), (24, 12), (39, 8), (49, 12)]
+        text = ""
+        for (start, width), field in zip(widths, fields):
+            text = text.ljust(start) + field.ljust(width)
+        return text.rstrip() + "\n"
+
+    by_column = [[] for _ in range(n)]
+    for i in range(m):
+        for k in range(model.indptr[i], model.indptr[i + 1]):
+            by_column[model.indices[k]].append((i, k))
+    with open_bars(path, "w", compress) as f:
+        f.write("NAME          model\n")
+        f.write(f"OBJSENSE\n    {model.sense.upper()}\n")
+        f.write("ROWS\n" + line("N", "obj"))
+        for i in range(m):
+            f.write(line({"<=": "L", ">=": "G", "=": "E"}[model.senses[i]], row_names[i]))
+        f.write("COLUMNS\n")
+        marker = 0
+        integer = False
+        for j in range(n):
+            if model.integer[j] != integer:
+                integer = model.integer[j]
+                f.write(line("", f"M{marker}", "'MARKER'", "", "'INTORG'" if integer else "'INTEND'"))
+                marker += 1
+            name = column_names[j]
+            entries = [("obj", model.objective[j])] if model.objective[j] != 0 or not by_column[j] else []
+            entries += [(row_names[i], model.values[k]) for i, k in by_column[j]]
+            for row, value in entries:
+                f.write(line("", name, row, number(value)))
+        if integer:
+            f.write(line("", f"M{marker}", "'MARKER'", "", "'INTEND'"))
+        f.write("RHS\n")
+        if model.objective_constant != 0:
+            f.write(line("", "RHS", "obj", number(-model.objective_constant)))
+        for i in range(m):
+            if model.rhs[i] != 0:
+                f.write(line("", "RHS", row_names[i], number(model.rhs[i])))
+        f.write("BOUNDS\n")
+        for j in range(n):
+            lower, upper, name = model.lower[j], model.upper[j], column_names[j]
+            if lower is not None and lower == upper:
+                f.write(line("FX", "BND", name, number(lower)))
+                continue
+            if lower is None and upper is None:
+                f.write(line("FR", "BND", name))
+                continue
+            # UP раньше LO: отрицательная UP при нулевой нижней границе снимает её (см. read_mps)
+            if upper is not None:
+                f.write(line("UP", "BND", name, number(upper)))
+            if lower is None:
+                f.write(line("MI", "BND", name))
+            elif lower != 0 or (upper is not None and upper < 0):
+                f.write(line("LO", "BND", name, number(lower)))
+        f.write("ENDATA\n")
+
+
+_LP_TOKEN = re.compile(r"\s*(?:(?P<rel><=|=<|>=|=>|<|>|=)|(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+                       r"|(?P<sign>[+-])|(?P<colon>:)|(?P<name>[A-Za-z_!\"#$%&()/,.;?@`'{}|~][\w!\"#$%&()/,.;?@`'{}|~]*)"
+                       r"|(?P<other>\S))")
+_LP_SECTIONS = {
+    "maximize": "max", "maximise": "max", "maximum": "max", "max": "max",
+    "minimize": "min", "minimise": "min", "minimum": "min", "min": "min",
+    "subject to": "rows", "such that": "rows", "st": "rows", "s.t.": "rows", "st.": "rows",
+    "bounds": "bounds", "bound": "bounds",
+    "general": "integer", "generals": "integer", "gen": "integer", "integer": "integer", "integers": "integer",
+    "binary": "binary", "binaries": "binary", "bin": "binary",
+    "end": "end",
+}
+_LP_SENSES = {"<=": "<=", "=<": "<=", "<": "<=", ">=": ">=", "=>": ">=", ">": ">=", "=": "="}
+
+
+def lp_tokens(f):
+    """
+        Разбивает файл LP на токены построчно: (секция, None) для строки-ключевого слова
+        и (вид, текст) для остальных. Комментарии начинаются с обратной косой черты.
+    """
+    for number, line in enumerate(f, 1):
+        line = line.split("\\", 1)[0]
+        key = " ".join(line.split()).lower()
+        if key in _LP_SECTIONS:
+            yield "section", _LP_SECTIONS[key], number
+            continue
+        pos = 0
+        while pos < len(line):
+            match = _LP_TOKEN.match(line, pos)
+            if match is None or match.end() == pos:
+                break
+            pos = match.end()
+            kind = match.lastgroup
+            if kind == "other":
+                raise ValueError(f"Строка {number}: неподдерживаемый символ {match.group(kind)!r}")
+            yield kind, match.group(kind), number
+
+
+def read_lp(path):
+    """
+        Читает задачу в формате CPLEX LP построчно.
+
+        Поддерживаются: целевая функция (Maximize/Minimize, с именем и свободным членом),
+        Subject To (ограничения "имя: выражение знак число", выражения в несколько строк),
+        Bounds ("x free", "x <= 4", "-inf <= x <= 5", "2 <= x", "x = 3"), General и Binary,
+        End. Квадратичные члены, индикаторные ограничения и SOS не поддерживаются.
+
+        Возвращает:
+        (LinearModel, имена переменных, имена ограничений).
+    """
+    builder = ModelBuilder()
+    section = None
+    statement = []
+    relation = False  # в текущем ограничении уже прочитан знак отношения
+    handlers = {"max": lp_objective, "min": lp_objective, "rows": lp_constraint, "bounds": lp_bound,
+                "integer": lp_integer, "binary": lp_integer}
+    with open_bars(path) as f:
+        for kind, text, number in lp_tokens(f):
+            if kind == "section":
+                if section is not None and statement:
+                    handlers[section](builder, statement, section)
+                statement, relation = [], False
+                if text == "end":
+                    section = None
+                    break
+                section = text
+                if text in ("max", "min"):
+                    builder.sense = text
+                continue
+            if section is None:
+                raise ValueError(f"Строка {number}: данные вне секции LP")
+            if section == "bounds" and statement and statement[-1][2] != number:
+                # границы записываются по одной на строку: "2 <= x" и "2 <= x <= 5"
+                # различаются только концом строки
+                lp_bound(builder, statement, section)
+                statement = []
+            statement.append((kind, text, number))
+            if section == "rows":
+                # ограничение закончено числом (со знаком) после знака отношения
+                if kind == "rel":
+                    relation = True
+                elif relation and kind in ("num", "name"):
+                    lp_constraint(builder, statement, section)
+                    statement, relation = [], False
+            elif section in ("integer", "binary"):
+                lp_integer(builder, statement, section)
+                statement = []
+        if section is not None and statement:
+            handlers[section](builder, statement, section)
+    return builder.build()
+
+
+def lp_expression(builder, tokens, number):
+    """
+        Разбирает линейное выражение из токенов (коэффициенты перед именами переменных,
+        знаки + и -). Возвращает (словарь {номер переменной: коэффициент}, свободный член).
+    """
+    coeffs = {}
+    constant = Fraction(0)
+    sign, coefficient = 1, None
+    for kind, text, line in tokens:
+        if kind == "sign":
+            if coefficient is not None:
+                constant += sign * coefficient
+                coefficient = None
+                sign = 1
+            sign = -sign if text == "-" else sign
+        elif kind == "num":
+            if coefficient is not None:
+                raise ValueError(f"Строка {line}: два числа подряд")
+            coefficient = parse_number(text)
+        elif kind == "name":
+            j = builder.column(text)
+            value = coefficient if coefficient is not None else Fraction(1)
+            value = value if sign > 0 else -value
+            coeffs[j] = coeffs[j] + value if j in coeffs else value
+            sign, coefficient = 1, None
+        else:
+            raise ValueError(f"Строка {line}: неожиданный символ {text!r}")
+    if coefficient is not None:
+        constant += sign * coefficient
+    return coeffs, constant
+
+
+def split_name(tokens):
+    """Отделяет необязательное имя "имя:" в начале оператора."""
+    if len(tokens) >= 2 and tokens[0][0] == "name" and tokens[1][0] == "colon":
+        return tokens[0][1], tokens[2:]
+    return None, tokens
+
+
+def lp_objective(builder, tokens, section):
+    """Целевая функция: выражение, возможно со свободным членом."""
+    name, tokens = split_name(tokens)
+    coeffs, constant = lp_expression(builder, tokens, tokens[0][2] if tokens else 0)
+    for j, value in coeffs.items():
+        builder.objective[j] = builder.objective.get(j, 0) + value
+    builder.constant += constant
+
+
+def lp_constraint(builder, tokens, section):
+    """Ограничение "имя: выражение знак число"; без имени получает имя c_<номер>."""
+    name, tokens = split_name(tokens)
+    k = next(k for k, token in enumerate(tokens) if token[0] == "rel")
+    coeffs, constant = lp_expression(builder, tokens[:k], tokens[k][2])
+    rhs_coeffs, rhs = lp_expression(builder, tokens[k + 1:], tokens[k][2])
+    if rhs_coeffs:
+        raise ValueError(f"Строка {tokens[k][2]}: в правой части ограничения должно быть число")
+    i = builder.add_row(name or f"c_{len(builder.row_names) + 1}", _LP_SENSES[tokens[k][1]], rhs - constant)
+    for j, value in coeffs.items():
+        builder.add_entry(i, j, value)
+
+
+def lp_value(tokens):
+    """Число границы со знаком; inf/infinity — бесконечность (None)."""
+    sign = -1 if sum(1 for kind, text, line in tokens if text == "-") % 2 else 1
+    value = sign * parse_number(tokens[-1][1])
+    return None if abs(value) >= INFINITY else value
+
+
+def lp_bound(builder, tokens, section):
+    """Граница переменной: "x free", "x знак число", "число знак x [знак число]"."""
+    number = tokens[0][2]
+    if tokens[-1][1].lower() == "free":
+        j = builder.column(tokens[0][1])
+        builder.lower[j] = builder.upper[j] = None
+        return
+    parts, current = [], []
+    for token in tokens:
+        if token[0] == "rel":
+            parts.append(current)
+            parts.append(token)
+            current = []
+        else:
+            current.append(token)
+    parts.append(current)
+    if len(parts) not in (3, 5) or not all(parts[k] for k in range(0, len(parts), 2)):
+        raise ValueError(f"Строка {number}: не удалось разобрать границу")
+    if tokens[0][0] == "name":
+        j = builder.column(tokens[0][1])
+        pairs = [(_LP_SENSES[parts[1][1]], parts[2])]
+    else:
+        j = builder.column(parts[2][-1][1])
+        flip = {"<=": ">=", ">=": "<=", "=": "="}
+        pairs = [(flip[_LP_SENSES[parts[1][1]]], parts[0])]
+        if len(parts) == 5:
+            pairs.append((_LP_SENSES[parts[3][1]], parts[4]))
+    for sense, value_tokens in pairs:
+        value = lp_value(value_tokens)
+        if sense in (">=", "="):
+            builder.lower[j] = value
+        if sense in ("<=", "="):
+            builder.upper[j] = value
+
+
+def lp_integer(builder, tokens, section):
+    """Имена в секциях General/Binary; двоичные переменные получают границы [0, 1]."""
+    for kind, text, number in tokens:
+        j = builder.column(text)
+        builder.integer[j] = True
+        if section == "binary":
+            builder.lower[j], builder.upper[j] = Fraction(0), Fraction(1)
+
+
+def lp_terms(items, width=8):
+    """Слагаемые выражения LP, по width на строку (строки файла LP ограничены по длине)."""
+    terms = []
+    for name, value in items:
+        text = format_number(abs(value))
+        terms.append(("- " if value < 0 else "+ ") + (name if text == "1" else f"{text} {name}"))
+    if terms and terms[0].startswith("+ "):
+        terms[0] = terms[0][2:]
+    return "\n   ".join(" ".join(terms[k:k + width]) for k in range(0, len(terms), width))
+
+
+def write_lp(path, model, column_names=None, row_names=None, compress=False):
+    """
+        Записывает задачу в формате CPLEX LP.
+
+        Аргументы: как у write_mps. Дроби с бесконечной десятичной записью (1/3)
+        записываются ближайшим float — формат LP не допускает обыкновенных дробей.
+        Целевая функция перечисляет все переменные (нулевые коэффициенты тоже),
+        чтобы read_lp восстановил их порядок и количество.
+    """
+    n, m = model.count_vars, model.num_constraints()
+    column_names = column_names or ['x_' + str(j + 1) for j in range(n)]
+    row_names = row_names or ['c_' + str(i + 1) for i in range(m)]
+    with open_bars(path, "w", compress) as f:
+        f.write("Maximize\n" if model.sense == 'max' else "Minimize\n")
+        # все переменные (в том числе с нулевым коэффициентом) — в порядке номеров:
+        # при чтении номера присваиваются по первому появлению
+        text = lp_terms(zip(column_names, model.objective))
+        if model.objective_constant != 0:
+            text += (" - " if model.objective_constant < 0 else " + ") + format_number(abs(model.objective_constant))
+        f.write(f" obj: {text}\n")
+        f.write("Subject To\n")
+        for i in range(m):
+            row = [(column_names[j], value) for j, value in model.row(i)]
+            text = lp_terms(row) or f"0 {column_names[0]}"
+            f.write(f" {row_names[i]}: {text} {model.senses[i]} {format_number(model.rhs[i])}\n")
+        f.write("Bounds\n")
+        for j in range(n):
+            lower, upper, name = model.lower[j], model.upper[j], column_names[j]
+            if lower is None and upper is None:
+                f.write(f" {name} free\n")
+            elif lower is not None and lower == upper:
+                f.write(f" {name} = {format_number(lower)}\n")
+            elif lower != 0 or upper is not None:
+                low = "-inf" if lower is None else format_number(lower)
+                high = "+inf" if upper is None else format_number(upper)
+                f.write(f" {low} <= {name} <= {high}\n")
+        integer = [column_names[j] for j in range(n) if model.integer[j]]
+        if integer:
+            f.write("General\n")
+            for k in range(0, len(integer), 8):
+                f.write(" " + " ".join(integer[k:k + 8]) + "\n")
+        f.write("End\n")
+
+
+def model_format(path):
+    """Формат файла задачи по расширению (без учёта .gz): "bars", "mps" или "lp"."""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    for suffix in ("mps", "lp"):
+        if name.endswith("." + suffix):
+            return suffix
+    return "bars"
+
+
+def read_model(path):
+    """Читает задачу из файла .bars, .mps или .lp (в том числе .gz) — только LinearModel."""
+    kind = model_format(path)
+    if kind == "mps":
+        return read_mps(path)[0]
+    if kind == "lp":
+        return read_lp(path)[0]
+    return read_bars(path)
+
+
+def write_model(path, model, compress=None):
+    """Записывает задачу в формате по расширению файла; .gz в конце имени включает сжатие."""
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+    kind = model_format(path)
+    if kind == "mps":
+        write_mps(path, model, compress=compress)
+    elif kind == "lp":
+        write_lp(path, model, compress=compress)
+    else:
+        write_bars(path, model, compress=compress)
+
+
+def main(argv=None):
+    """
+        Преобразование задач между форматами по расширениям файлов:
+
+            python -m Services.formats модель.mps.gz модель.bars
+    """
+    parser = argparse.ArgumentParser(prog="python -m Services.formats", description="Преобразование задач: .bars, .mps, .lp")
+    parser.add_argument("source", help="исходный файл (.bars, .mps, .lp, можно .gz)")
+    parser.add_argument("target", help="файл результата; формат — по расширению")
+    parser.add_argument("--fixed", action="store_true", help="фиксированный формат MPS (для чтения и записи)")
+    args = parser.parse_args(argv)
+    if model_format(args.source) == "mps":
+        model, columns, rows = read_mps(args.source, fixed=args.fixed)
+    elif model_format(args.source) == "lp":
+        model, columns, rows = read_lp(args.source)
+    else:
+        model, columns, rows = read_bars(args.source), None, None
+    compress = args.target.lower().endswith(".gz")
+    kind = model_format(args.target)
+    if kind == "mps":
+        write_mps(args.target, model, columns, rows, fixed=args.fixed, compress=compress)
+    elif kind == "lp":
+        write_lp(args.target, model, columns, rows, compress=compress)
+    else:
+        write_bars(args.target, model, compress=compress)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,9 @@
-from sympy import *
 from fractions import Fraction
-import copy
+import numpy as np
 
 class GaussAlgorithm:
     
-    def __init__(self, A, rhs, f0):
+    def __init__(self, A, rhs, f0, mode="symbolic", eps=1e-10):
         """
             Конструктор класса. Инициализирует основные данные задачи.
 
@@ -12,12 +11,25 @@ class GaussAlgorithm:
             - A: матрица коэффициентов.
             - rhs: вектор правых частей (свободные члены).
             - f0: целевая функция (вектор коэффициентов целевой функции).
+            - mode: "symbolic" — точные вычисления над Matrix SymPy (для учебного вывода);
+                    "numeric" — приведение к ступенчатому виду над массивами NumPy float64
+                    с выбором главного элемента по столбцу (см. rref).
+            - eps: допуск, ниже которого элемент считается нулём (только для "numeric").
 
             Сохраняет копии переданных данных, чтобы избежать изменения оригинальных матриц.
         """
-        self.A = A.copy()
-        self.rhs = rhs.copy()
-        self.f0 = f0
+        if mode not in ("symbolic", "numeric"):
+            raise ValueError(f"Неизвестный режим: {mode}")
+        self.mode = mode
+        self.eps = eps
+        if mode == "numeric":
+            self.A = np.array(A.tolist() if hasattr(A, "tolist") else A, dtype=np.float64)
+            self.rhs = np.array(rhs.tolist() if hasattr(rhs, "tolist") else rhs, dtype=np.float64).reshape(-1, 1)
+            self.f0 = np.array(f0.tolist() if hasattr(f0, "tolist") else f0, dtype=np.float64).reshape(-1)
+        else:
+            self.A = A.copy()
+            self.rhs = rhs.copy()
+            self.f0 = f0
 
     def forward_step(self, row_idx):
         """
@@ -86,7 +98,11 @@ class GaussAlgorithm:
 
             Возвращает:
             - rhs: решение системы (модифицированный вектор правых частей).
+
+            В режиме "numeric" вместо пошаговых прямого и обратного хода выполняется rref.
         """
+        if self.mode == "numeric":
+            return self.rref()
         A, rhs = self.A, self.rhs
         for row in range(A.rows):
             self.forward_step(row)
@@ -95,6 +111,59 @@ class GaussAlgorithm:
         return rhs
     
 
+    def rref(self):
+        """
+            Приводит расширенную матрицу [A | rhs] к приведённому ступенчатому виду
+            над числами с плавающей точкой (режим "numeric").
+
+            Шаги:
+            1. Для очередного столбца главный элемент выбирается как наибольший по модулю
+               среди ещё не использованных строк (частичный выбор главного элемента);
+               если он меньше допуска, столбец свободный.
+            2. Строка главного элемента переставляется наверх и делится на него.
+            3. Столбец обнуляется во всех остальных строках одной операцией над массивом
+               (вычитание внешнего произведения).
+            4. Элементы меньше допуска заменяются точными нулями.
+
+            Результат сохраняется в атрибутах:
+            - rank: ранг матрицы A.
+            - pivot_cols: индексы базисных (ведущих) столбцов по порядку строк.
+            - free_cols: индексы свободных столбцов.
+            - consistent: совместна ли система (нет строк 0 = b с b ≠ 0).
+
+            Возвращает:
+            - rhs: вектор правых частей после преобразований.
+        """
+        rows, cols = self.A.shape
+        M = np.hstack((self.A, self.rhs))
+        tol = self.eps * max(1.0, float(np.abs(M).max(initial=0.0)))
+        pivot_cols = []
+        row = 0
+        for col in range(cols):
+            if row == rows:
+                break
+            p = row + int(np.argmax(np.abs(M[row:, col])))
+            if abs(M[p, col]) <= tol:
+                M[row:, col] = 0.0
+                continue
+            if p != row:
+                M[[row, p]] = M[[p, row]]
+            M[row] /= M[row, col]
+            factors = M[:, col].copy()
+            factors[row] = 0.0
+            M -= np.outer(factors, M[row])
+            pivot_cols.append(col)
+            row += 1
+        M[np.abs(M) <= tol] = 0.0
+
+        self.A = M[:, :cols]
+        self.rhs = M[:, cols:]
+        self.rank = len(pivot_cols)
+        self.pivot_cols = np.array(pivot_cols, dtype=np.int64)
+        self.free_cols = np.setdiff1d(np.arange(cols), self.pivot_cols)
+        self.consistent = not np.any(self.rhs[self.rank:, 0] != 0.0)
+        return self.rhs
+
     def check_matrix(self):
         """
             Проверяет матрицу на наличие подходящих столбцов для базиса.
@@ -107,6 +176,14 @@ class GaussAlgorithm:
             - True, если матрица подходит для симплексного метода.
             - False, если не подходит.
         """
+        if self.mode == "numeric":
+            nonzero = self.A != 0.0
+            single = np.flatnonzero(nonzero.sum(axis=0) == 1)
+            rows = nonzero[:, single].argmax(axis=0)
+            self.indexs = list(zip(rows.tolist(), single.tolist()))
+            count_one = int(np.count_nonzero(np.abs(self.A - 1.0) <= self.eps))
+            return self.A.shape[1] - 2 == len(self.indexs) or count_one == self.A.shape[1] - 2
+
         self.indexs = []
         A, rhs = self.A, self.rhs
         countOne = []
@@ -129,48 +206,37 @@ class GaussAlgorithm:
     
     def podstanovka(self):
         """
-            Выполняет подстановку для нахождения значений переменных.
+            Выполняет подстановку: выражает базисные переменные через свободные и
+            проецирует задачу на две свободные переменные.
 
             Шаги:
-            1. Создаёт выражения для переменных на основе коэффициентов в матрице.
-            2. Преобразует эти выражения в символьную форму для дальнейшего анализа.
-            3. Сохраняет результат для использования в целевой функции.
-        """
-        self.expressions = []
-        self.constraint = []
-        self.create_symbols()
-        for expression in self.indexs:
-            x = self.symbolsList[expression[1]]
-            y = self.symbolsList[expression[1]]
-            row = self.A.row(expression[0])
-            for col,koeff in enumerate(row) :
-                if col != expression[1] and koeff != 0:
-                    x += -1*koeff * self.symbolsList[col]
-                    y +=  1*koeff * self.symbolsList[col]
-            x -=  self.symbolsList[expression[1]]
-            y -=  self.symbolsList[expression[1]]
-            self.constraint.append(y <= S(self.rhs.row(expression[0])[0]))
-            x += S(self.rhs.row(expression[0])[0])
-            
-            self.symbolsList[expression[1]] = x
-        self.create_new_f()
-        self.expressions = copy.deepcopy(self.symbolsList)
-        for index,expression in enumerate(self.symbolsList):
-            self.symbolsList[index] = expression 
-           
-            
-    def create_new_f(self):
+            1. Для каждого найденного check_matrix базисного столбца j в строке r:
+               x_j = rhs_r - Σ A[r, f]·x_f ≥ 0, то есть Σ A[r, f]·x_f <= rhs_r.
+            2. Коэффициенты этих неравенств по свободным столбцам f образуют A' и b'.
+            3. Целевая функция после подстановки: c' = c_f - c_базис·A[строки, f],
+               свободный член — c_базис·rhs.
+
+            Результат — массивы (для режима "numeric" — float64, для "symbolic" — точные
+            числа SymPy в массивах object), без построения выражений:
+            - basic: список пар (строка, базисный столбец).
+            - free: индексы свободных столбцов.
+            - A_reduced, b_reduced: ограничения A'·x_free <= b' (плюс x_free >= 0).
+            - c_reduced, c_constant: целевая функция c'·x_free + c_constant.
+            Выражения SymPy строятся по требованию: symbolic_constraints, symbolic_objective, region.
         """
-           Создаёт новую целевую функцию на основе подставленных значений переменных.
-
-           Шаги:
-           1. Для каждой переменной умножает её значение на соответствующий коэффициент из начальной целевой функции.
-           2. Формирует обновлённое выражение целевой функции.
-        """
-        f = symbols("f")
-        for index ,koeff in enumerate(self.f0):
-            f +=  koeff * ( self.symbolsList[index])
-        self.f0 = f -symbols("f")  
+        dtype = np.float64 if self.mode == "numeric" else object
+        A = np.array(self.A.tolist(), dtype=dtype)
+        rhs = np.array(self.rhs.tolist(), dtype=dtype).reshape(-1)
+        c = np.array(list(self.f0), dtype=dtype).reshape(-1)
+        self.basic = list(self.indexs)
+        rows = [row for row, col in self.basic]
+        basic_cols = [col for row, col in self.basic]
+        self.free = [col for col in range(A.shape[1]) if col not in set(basic_cols)]
+
+        self.A_reduced = A[np.ix_(rows, self.free)]
+        self.b_reduced = rhs[rows]
+        self.c_reduced = c[self.free] - c[basic_cols].dot(self.A_reduced)
+        self.c_constant = c[basic_cols].dot(self.b_reduced)
 
     def create_symbols(self):
         """
@@ -179,50 +245,68 @@ class GaussAlgorithm:
            Шаги:
            1. Для каждого столбца матрицы создаётся символ x_1, x_2, ..., x_n.
         """
+        from sympy import symbols
         self.symbolsList = []
-        for col in range(self.A.cols):
+        for col in range(self.A.shape[1]):
             x = symbols(f"x_{col + 1}")  
             self.symbolsList.append(x)
-
-    def recursion(self, n=0):
+        return self.symbolsList
+
+    def free_symbols(self):
+        """Возвращает символы свободных переменных (оси графика)."""
+        symbols_list = self.create_symbols()
+        return [symbols_list[col] for col in self.free]
+
+    def symbolic_constraints(self):
+        """Возвращает ограничения A'·x_free <= b' выражениями SymPy (для вывода)."""
+        from sympy import Add, S
+        x = self.free_symbols()
+        return [Add(*[S(koeff) * x[k] for k, koeff in enumerate(row) if koeff != 0]) <= S(b)
+                for row, b in zip(self.A_reduced.tolist(), self.b_reduced.tolist())]
+
+    def symbolic_objective(self):
+        """Возвращает целевую функцию после подстановки выражением SymPy (для вывода)."""
+        from sympy import Add, S
+        x = self.free_symbols()
+        return Add(*[S(koeff) * x[k] for k, koeff in enumerate(self.c_reduced.tolist())]) + S(self.c_constant)
+
+    def region(self):
+        """Возвращает допустимую область на плоскости свободных переменных (And для plot_implicit)."""
+        from sympy import And
+        return And(*self.symbolic_constraints(), *[x >= 0 for x in self.free_symbols()])
+
+    def reduced_model(self, sense="min"):
         """
-            Рекурсивная функция для обработки списка символьных переменных.
+            Возвращает спроецированную задачу как Services.model.LinearModel для Simplex
+            (переменные x_1, x_2 модели — свободные переменные в порядке free).
 
             Аргументы:
-            - n: текущий индекс переменной.
+            - sense: "min" или "max".
 
-            Возвращает:
-            - символ переменной на текущем шаге или результат дальнейшей рекурсии.
+            Свободный член c_constant в модель не входит (как и при разборе строк).
         """
-        if n == len(self.symbolsList) - 1:
-            return self.symbolsList[n]
-        return self.symbolsList[n] & self.recursion(n+1)
+        from Services.model import LinearModel
+
+        def exact(value):
+            return Fraction(value) if isinstance(value, float) else Fraction(str(value))
 
+        model = LinearModel(len(self.free), sense, [exact(koeff) for koeff in self.c_reduced.tolist()])
+        for row, b in zip(self.A_reduced.tolist(), self.b_reduced.tolist()):
+            model.add_constraint({k: exact(koeff) for k, koeff in enumerate(row)}, "<=", exact(b))
+        return model
 
 
-# проверка
+
+# проверка (запуск из корня проекта: python -m Services.graph)
 if __name__ == "__main__":
+    from sympy import Matrix
     dsa = GaussAlgorithm(Matrix([[1,2,5,-1],[1,-1,-1,2]]),Matrix([4,1]),Matrix([-2,-1,-3,-1]))
     dsa.doit()
     if dsa.check_matrix():
         dsa.podstanovka()
-        #dsa.symbolsList.append()
-        from cvxopt.modeling import variable, op   
-        print(dsa.constraint)
-        my_str = [str(expr).replace('*', '').replace('-','- ').replace(' x',' 1x').replace('-  ','- ') for expr in dsa.constraint]
-        my_str = [strr if strr[0] != 'x' else '1' + strr[:] for strr in my_str ]
-        print(my_str)
-        if str(dsa.f0)[0] == 'x':
-           f0 = '1' + str(dsa.f0)[:]
-        else: f0 = str(dsa.f0)
-        from simplex import Simplex
-        from tkinter import *
-        objective = ('min',f0)
-        from tkinter import scrolledtext
-        text = scrolledtext.ScrolledText( state='disable')
-        Lp = Simplex(count_vars=2, constraints=my_str, objective_fun=objective,text = text, char = END)
-        dsa2 = Lp.solution
-        dsa2.pop("val")
+        print(dsa.symbolic_constraints())
+        print(dsa.symbolic_objective())
+        from Services.simplex import solve
+        dsa2 = solve(model=dsa.reduced_model('min')).solution
         print(dsa2)
-        print(dsa.f0.subs([(dsa.expressions[-2] , int(dsa2["x_1"])),(dsa.expressions[-1] , int(dsa2["x_2"]))]))
-
+        print(dsa.c_reduced.dot([dsa2["x_1"], dsa2["x_2"]]) + dsa.c_constant)
@@ -0,0 +1,227 @@
+import numpy as np
+from scipy.sparse import csc_matrix, diags, hstack, identity
+from scipy.sparse.linalg import splu, cg, LinearOperator
+from Services.pricing import PivotControl
+from Services.revised import RevisedSimplex
+
+
+class InteriorPoint(object):
+    def __init__(self, model, observer=None, eps=1e-8, max_iterations=200, crossover=True, pricing="dantzig", time_limit=None, control=None):
+        """
+            Прямо-двойственный метод внутренней точки (предиктор–корректор Мехротры)
+            с кроссовером в вершину модифицированным симплекс-методом.
+
+            Аргументы:
+            - model: скомпилированная задача (Services.model.LinearModel), границы — как у
+              RevisedSimplex (x >= 0; верхние границы передаются строками, см. solve).
+            - observer: наблюдатель; получает шаги кроссовера (RevisedSimplex) и on_finish.
+            - eps: относительная точность по невязкам и зазору двойственности.
+            - max_iterations: наибольшее число итераций метода внутренней точки.
+            - crossover: перейти от внутренней точки к вершине (базисному решению).
+              Без кроссовера ответ — точка внутренней точки (не обязательно вершина).
+            - pricing, time_limit, control: как у Simplex; отмена и ограничение времени
+              проверяются на каждой итерации.
+
+            Шаги:
+            1. Задача приводится к виду min cᵀx, A·x = b, x >= 0 добавлением дополнительных
+               переменных к неравенствам (A хранится разреженной, CSC).
+            2. Итерации Мехротры: на каждой — одно разложение матрицы A·D·Aᵀ (D = X·Z⁻¹)
+               и два решения с ним (предиктор и корректор). Разложение — разреженное LU
+               (SuperLU); если матрица вырождена, система решается методом сопряжённых
+               градиентов с диагональным предобуславливателем.
+            3. Кроссовер: переменные с x_j > z_j считаются базисными, по убыванию x_j/z_j
+               они передаются в RevisedSimplex как начальный базис (crash), и вторая фаза
+               доводит решение до вершины за несколько шагов.
+            4. Если итерации не сходятся (задача несовместна или неограниченна — значения
+               уходят в бесконечность), ответ и статус определяет RevisedSimplex с нуля.
+
+            Стоимость итерации определяется числом ненулевых элементов A·D·Aᵀ и его
+            разложения, а не размером плотной таблицы.
+
+            Результат совпадает по форме с RevisedSimplex: solution, optimize_val,
+            basic_vars, iterations (итерации метода и шаги кроссовера), feasible, dual_values.
+        """
+        self.observer = observer
+        self.eps = eps
+        self.max_iterations = max_iterations
+        if control is None:
+            control = PivotControl(pricing, None, time_limit)
+        self.control = control
+        self.model = model
+        self.count_vars = model.count_vars
+        self.objective = model.sense
+        self.setup()
+        self.converged = self.iterate()
+        self.ipm_iterations = self.iterations
+        if self.converged and not crossover:
+            self.finish_interior()
+            return
+        crash = self.crash_order() if self.converged else None
+        lp = RevisedSimplex(model, observer=observer, control=control, crash=crash)
+        self.simplex = lp
+        self.solution = lp.solution
+        self.optimize_val = lp.optimize_val
+        self.basic_vars = lp.basic_vars
+        self.feasible = lp.feasible
+        self.iterations = self.ipm_iterations + lp.iterations
+
+    def setup(self):
+        """
+            Строит стандартную форму: A = [A_исх | S], где S — столбцы дополнительных
+            переменных (+1 для "<=", -1 для ">="), c дополняется нулями.
+        """
+        model = self.model
+        m, n = model.num_constraints(), self.count_vars
+        slack = [i for i in range(m) if model.senses[i] != '=']
+        signs = [1.0 if model.senses[i] == '<=' else -1.0 for i in slack]
+        S = csc_matrix((signs, (slack, range(len(slack)))), shape=(m, len(slack)))
+        self.A = csc_matrix(hstack((model.matrix(), S)))
+        self.AT = self.A.T.tocsr()
+        self.b = np.array(model.rhs, dtype=np.float64)
+        c = np.array(model.objective, dtype=np.float64)
+        self.c = np.concatenate((c if model.sense == 'min' else -c, np.zeros(len(slack))))
+        self.slack_rows = np.array(slack, dtype=np.int64)
+        self.m, self.n = m, n
+        self.iterations = 0
+
+    def solve_normal(self, rhs):
+        """
+            Решает (A·D·Aᵀ)·u = rhs. Матрица раскладывается один раз за итерацию
+            (self.factor), поэтому предиктор и корректор используют одно разложение.
+        """
+        if self.factor is not None:
+            return self.factor.solve(rhs)
+        u, info = cg(self.normal, rhs, rtol=1e-12, maxiter=10 * self.m, M=self.preconditioner)
+        return u
+
+    def factorize(self, d):
+        """Строит A·D·Aᵀ с небольшой регуляризацией и раскладывает её (или готовит CG)."""
+        normal = (self.A @ diags(d) @ self.AT).tocsc()
+        scale = max(1.0, float(np.abs(normal.diagonal()).max(initial=0.0)))
+        normal = normal + 1e-14 * scale * identity(self.m, format="csc")
+        try:
+            # матрица симметрична и положительно определена: симметричное упорядочение
+            # и диагональные опорные элементы сохраняют разреженность (как у Холецкого)
+            self.factor = splu(normal, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0, options={"SymmetricMode": True})
+        except RuntimeError:
+            self.factor = None
+            self.normal = normal
+            diagonal = normal.diagonal()
+            inverse = np.where(diagonal > 0, 1.0 / np.where(diagonal > 0, diagonal, 1.0), 1.0)
+            self.preconditioner = LinearOperator((self.m, self.m), matvec=lambda v: inverse * v)
+
+    def newton_step(self, x, z, d, r_b, r_c, r_xz):
+        """
+            Решает систему Ньютона
+                A·Δx = -r_b,  Aᵀ·Δy + Δz = -r_c,  Z·Δx + X·Δz = r_xz
+            через нормальные уравнения (A·D·Aᵀ)·Δy = -r_b - A·(D·r_c + Z⁻¹·r_xz).
+        """
+        rhs = -r_b - self.A @ (d * r_c + r_xz / z)
+        dy = self.solve_normal(rhs)
+        dx = d * (self.AT @ dy + r_c) + r_xz / z
+        dz = (r_xz - z * dx) / x
+        return dx, dy, dz
+
+    @staticmethod
+    def step_length(v, dv):
+        """Наибольший шаг α <= 1, при котором v + α·dv >= 0."""
+        negative = dv < 0
+        if not negative.any():
+            return 1.0
+        return min(1.0, float(np.min(-v[negative] / dv[negative])))
+
+    def starting_point(self):
+        """
+            Начальная точка Мехротры: решение с наименьшей нормой для A·x = b и
+            двойственных ограничений, сдвинутое внутрь положительного ортанта.
+        """
+        self.factorize(np.ones(self.A.shape[1]))
+        x = self.AT @ self.solve_normal(self.b)
+        y = self.solve_normal(self.A @ self.c)
+        z = self.c - self.AT @ y
+        x = x + max(-1.5 * float(x.min(initial=0.0)), 0.0)
+        z = z + max(-1.5 * float(z.min(initial=0.0)), 0.0)
+        dot = float(x @ z)
+        x = x + 0.5 * dot / max(float(z.sum()), 1e-12)
+        z = z + 0.5 * dot / max(float(x.sum()), 1e-12)
+        x = np.maximum(x, 1e-4)
+        z = np.maximum(z, 1e-4)
+        return x, y, z
+
+    def iterate(self):
+        """
+            Итерации предиктор–корректор.
+
+            Возвращает:
+            True, если относительные невязки A·x - b, Aᵀ·y + z - c и зазор cᵀx - bᵀy меньше eps;
+            False, если итерации не сошлись или значения неограниченно растут.
+        """
+        if self.m == 0 or self.A.shape[1] == 0:
+            return False
+        x, y, z = self.starting_point()
+        b_norm = 1.0 + float(np.linalg.norm(self.b))
+        c_norm = 1.0 + float(np.linalg.norm(self.c))
+        count = len(x)
+        # при расходимости возможны переполнения — они обнаруживаются проверкой ниже
+        with np.errstate(all="ignore"):
+            while self.iterations < self.max_iterations:
+                self.control.check_limits()
+                r_b = self.A @ x - self.b
+                r_c = self.AT @ y + z - self.c
+                primal, dual = float(self.c @ x), float(self.b @ y)
+                if (np.linalg.norm(r_b) / b_norm < self.eps and np.linalg.norm(r_c) / c_norm < self.eps
+                        and abs(primal - dual) / (1.0 + abs(primal)) < self.eps):
+                    self.x, self.y, self.z = x, y, z
+                    return True
+                values = np.concatenate((x, y, z))
+                if not np.isfinite(values).all() or float(np.abs(values).max()) > 1e12:
+                    # несовместная или неограниченная задача: точка уходит в бесконечность
+                    return False
+                mu = float(x @ z) / count
+                d = x / z
+                self.factorize(d)
+
+                # предиктор: аффинное направление
+                dx, dy, dz = self.newton_step(x, z, d, r_b, r_c, -x * z)
+                alpha_p, alpha_d = self.step_length(x, dx), self.step_length(z, dz)
+                mu_aff = float((x + alpha_p * dx) @ (z + alpha_d * dz)) / count
+                sigma = (mu_aff / mu) ** 3
+
+                # корректор: центрирование и поправка второго порядка
+                dx, dy, dz = self.newton_step(x, z, d, r_b, r_c, -x * z - dx * dz + sigma * mu)
+                alpha_p = min(1.0, 0.99 * self.step_length(x, dx))
+                alpha_d = min(1.0, 0.99 * self.step_length(z, dz))
+                x = x + alpha_p * dx
+                y = y + alpha_d * dy
+                z = z + alpha_d * dz
+                self.iterations += 1
+        return False
+
+    def crash_order(self):
+        """
+            Кандидаты в базис для кроссовера: столбцы с x_j > z_j по убыванию x_j/z_j
+            в нумерации RevisedSimplex (исходные 0..n-1, дополнительная переменная строки i — n + i).
+        """
+        columns = np.concatenate((np.arange(self.n), self.n + self.slack_rows))
+        ratio = self.x / self.z
+        order = np.argsort(-ratio, kind="stable")
+        return [int(columns[j]) for j in order if self.x[j] > self.z[j]]
+
+    def finish_interior(self):
+        """Записывает ответ без кроссовера: значения внутренней точки."""
+        x = self.x[:self.n]
+        self.solution = {'x_' + str(j + 1): float(x[j]) for j in range(self.n)}
+        self.optimize_val = float(np.array(self.model.objective, dtype=np.float64) @ x)
+        self.solution["val"] = self.optimize_val
+        self.basic_vars = [0]
+        self.feasible = True
+        self.simplex = None
+        if self.observer is not None:
+            self.observer.on_finish(self)
+
+    def dual_values(self):
+        """Двойственные оценки ограничений (см. Simplex.dual_values)."""
+        if self.simplex is not None:
+            return self.simplex.dual_values()
+        sign = 1.0 if self.objective == 'min' else -1.0
+        return [float(value) * sign for value in self.y]
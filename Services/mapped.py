@@ -0,0 +1,333 @@
+import argparse
+import hashlib
+import json
+import os
+from fractions import Fraction
+import numpy as np
+from Services.model import LinearModel
+
+
+MAGIC = b"BARSMAP\x01"
+VERSION = 1
+ALIGN = 64  # смещение каждого массива в файле кратно 64 байтам
+SENSES = ("<=", ">=", "=")
+_CHUNK = 1 << 16
+# атрибуты MappedModel, которые хранятся в процессе обычными списками
+SMALL = ("sense", "objective", "senses", "rhs", "objective_constant", "lower", "upper", "integer")
+
+
+def source_hash(path):
+    """SHA-256 содержимого файла задачи (читается частями по 1 МБ)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sidecar_path(path):
+    """Файл кэша рядом с файлом задачи: задача.mps -> задача.mps.map."""
+    return path + ".map"
+
+
+class MappedArray(object):
+    def __init__(self, array):
+        """
+            Целочисленный массив из отображённого файла с поведением списка только для
+            чтения: элементы и срезы — обычные int (как в списках LinearModel),
+            np.asarray возвращает сам массив без копирования.
+        """
+        self.array = array
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.array[key].tolist()
+        return int(self.array[key])
+
+    def __iter__(self):
+        for start in range(0, len(self.array), _CHUNK):
+            yield from self.array[start:start + _CHUNK].tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype, copy=False)
+
+
+class FractionArray(object):
+    def __init__(self, numerators, denominators, floats):
+        """
+            Коэффициенты из отображённого файла: точные значения (Fraction) собираются
+            из числителей и знаменателей при обращении, np.asarray (например, в
+            LinearModel.matrix) получает готовый массив float64 без копирования.
+        """
+        self.numerators = numerators
+        self.denominators = denominators
+        self.floats = floats
+
+    def __len__(self):
+        return len(self.numerators)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [Fraction(p, q) for p, q in zip(self.numerators[key].tolist(), self.denominators[key].tolist())]
+        return Fraction(int(self.numerators[key]), int(self.denominators[key]))
+
+    def __iter__(self):
+        for start in range(0, len(self.numerators), _CHUNK):
+            yield from self[start:start + _CHUNK]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.floats if dtype is None else self.floats.astype(dtype, copy=False)
+
+
+class MappedModel(LinearModel):
+    def __init__(self, path, header, arrays):
+        """
+            Задача, матрица которой читается из отображённого в память файла кэша
+            (см. write_mapped): indptr, indices и values не копируются в процесс, а
+            страницы файла разделяются всеми процессами, открывшими тот же файл.
+
+            Целевая функция, правые части, знаки и границы (размера n + m) читаются
+            в обычные списки. Изменение матрицы (add_constraint, remove_constraint,
+            resize) сначала копирует её в списки (materialize), после чего модель
+            ведёт себя как обычная LinearModel.
+
+            При передаче в другой процесс (pickle, например в пул BranchAndBound)
+            пересылаются путь к файлу и небольшие списки (SMALL), пока матрица не скопирована.
+        """
+        self.path = path
+        indptr = MappedArray(arrays["indptr"])
+        indices = MappedArray(arrays["indices"])
+        values = FractionArray(arrays["numerators"], arrays["denominators"], arrays["floats"])
+        LinearModel.__init__(self, header["count_vars"], header["sense"], fractions(arrays, "objective"), indptr, indices, values,
+                             [SENSES[k] for k in arrays["senses"].tolist()], fractions(arrays, "rhs"), Fraction(header["constant"]),
+                             fractions(arrays, "lower"), fractions(arrays, "upper"), [bool(k) for k in arrays["integer"].tolist()])
+
+    def materialize(self):
+        """Копирует матрицу из файла в списки (нужно перед её изменением)."""
+        if self.path is not None:
+            self.indptr, self.indices, self.values = list(self.indptr), list(self.indices), list(self.values)
+            self.path = None
+
+    def add_constraint(self, coeffs, sense, rhs):
+        self.materialize()
+        LinearModel.add_constraint(self, coeffs, sense, rhs)
+
+    def remove_constraint(self, i):
+        self.materialize()
+        LinearModel.remove_constraint(self, i)
+
+    def resize(self, count_vars):
+        if count_vars > self.count_vars:
+            self.materialize()
+        LinearModel.resize(self, count_vars)
+
+    def copy(self):
+        """Копия, разделяющая матрицу из файла (копируются небольшие списки); матрица копируется в списки при изменении."""
+        if self.path is None:
+            return LinearModel.copy(self)
+        model = MappedModel.__new__(MappedModel)
+        model.__dict__.update(self.__dict__)
+        for name in SMALL:
+            value = getattr(self, name)
+            if isinstance(value, list):
+                setattr(model, name, list(value))
+        return model
+
+    def __reduce__(self):
+        if self.path is None:
+            return LinearModel, (self.count_vars, self.sense, self.objective, self.indptr, self.indices, self.values,
+                                 self.senses, self.rhs, self.objective_constant, self.lower, self.upper, self.integer)
+        # небольшие списки могли измениться (set_rhs, set_bounds) — они пересылаются как есть
+        state = {name: getattr(self, name) for name in SMALL}
+        return restore_mapped, (self.path, state)
+
+
+def restore_mapped(path, state):
+    """Открывает файл кэша в другом процессе и восстанавливает небольшие списки (см. MappedModel.__reduce__)."""
+    model = open_mapped(path)
+    for name, value in state.items():
+        setattr(model, name, value)
+    return model
+
+
+def fractions(arrays, name):
+    """
+        Список Fraction (None там, где флаг name + "_set" равен 0) из массивов
+        name + "_num" и name + "_den".
+    """
+    numerators = arrays[name + "_num"].tolist()
+    denominators = arrays[name + "_den"].tolist()
+    present = arrays[name + "_set"].tolist() if name + "_set" in arrays else [1] * len(numerators)
+    return [(Fraction(p) if q == 1 else Fraction(p, q)) if flag else None for p, q, flag in zip(numerators, denominators, present)]
+
+
+def split_fractions(values, count):
+    """
+        Числители и знаменатели (int64) и флаги наличия для списка Fraction/None.
+        Значение, не помещающееся в int64, — ValueError: такая задача не кэшируется.
+    """
+    numerators = np.zeros(count, dtype=np.int64)
+    denominators = np.ones(count, dtype=np.int64)
+    present = np.zeros(count, dtype=np.uint8)
+    try:
+        for k, value in enumerate(values):
+            if value is not None:
+                value = Fraction(value)
+                numerators[k], denominators[k], present[k] = value.numerator, value.denominator, 1
+    except OverflowError:
+        raise ValueError("Коэффициент задачи не помещается в 64-битные числитель и знаменатель")
+    return numerators, denominators, present
+
+
+def write_mapped(path, model, digest=""):
+    """
+        Записывает задачу в двоичный файл кэша для отображения в память.
+
+        Аргументы:
+        - path: путь к файлу кэша.
+        - model: Services.model.LinearModel.
+        - digest: SHA-256 исходного файла (source_hash); по нему open_mapped проверяет,
+          что кэш соответствует источнику.
+
+        Формат: 8 байт MAGIC, длина заголовка (8 байт, little-endian), заголовок JSON
+        (размеры, направление, свободный член, хеш источника и для каждого массива —
+        смещение, тип и длина), затем массивы little-endian со смещениями, кратными ALIGN:
+        - indptr, indices — матрица CSR (int32, если помещается, иначе int64);
+        - numerators, denominators (int64) и floats (float64) — коэффициенты матрицы;
+        - objective, rhs, lower, upper — пары _num/_den (int64), у границ флаги _set (uint8);
+        - senses (int8, номер в SENSES), integer (uint8).
+        Запись идёт во временный файл, который затем заменяет path: процессы, уже
+        отобразившие старый файл, продолжают работать с ним.
+
+        Если коэффициент не помещается в int64 — ValueError.
+    """
+    n, m, nnz = model.count_vars, model.num_constraints(), len(model.values)
+    index_type = np.int32 if max(n, nnz) < 2 ** 31 else np.int64
+    arrays = {
+        "indptr": np.fromiter(model.indptr, dtype=index_type, count=m + 1),
+        "indices": np.fromiter(model.indices, dtype=index_type, count=nnz),
+    }
+    arrays["numerators"], arrays["denominators"], _ = split_fractions(model.values, nnz)
+    arrays["floats"] = arrays["numerators"] / arrays["denominators"]
+    for name, values, size in (("objective", model.objective, n), ("rhs", model.rhs, m), ("lower", model.lower, n), ("upper", model.upper, n)):
+        arrays[name + "_num"], arrays[name + "_den"], present = split_fractions(values, size)
+        if name in ("lower", "upper"):
+            arrays[name + "_set"] = present
+    arrays["senses"] = np.array([SENSES.index(sense) for sense in model.senses], dtype=np.int8)
+    arrays["integer"] = np.array(model.integer, dtype=np.uint8)
+
+    header = {"version": VERSION, "source": digest, "sense": model.sense, "count_vars": n, "num_constraints": m,
+              "constant": str(model.objective_constant), "arrays": {}}
+    layout = []
+    offset = 0  # смещения относительно начала данных; начало данных тоже кратно ALIGN
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        header["arrays"][name] = [offset, array.dtype.str, len(array)]
+        layout.append((offset, array))
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    text = json.dumps(header).encode()
+    start = -(-(len(MAGIC) + 8 + len(text)) // ALIGN) * ALIGN
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(MAGIC + len(text).to_bytes(8, "little") + text)
+            for position, array in layout:
+                f.seek(start + position)
+                f.write(array.tobytes())
+            f.truncate(start + offset)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def read_mapped_header(path):
+    """Заголовок файла кэша и смещение начала данных; (None, None) — файл не является кэшем этой версии."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None, None
+        length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(length))
+    if header.get("version") != VERSION:
+        return None, None
+    return header, -(-(len(MAGIC) + 8 + length) // ALIGN) * ALIGN
+
+
+def open_mapped(path, digest=None):
+    """
+        Открывает файл кэша (см. write_mapped) отображением в память без копирования.
+
+        Аргументы:
+        - path: путь к файлу кэша.
+        - digest: ожидаемый хеш источника (None — не проверять).
+
+        Возвращает:
+        MappedModel или None, если файла нет, он другой версии или построен по другому
+        содержимому источника.
+    """
+    if not os.path.exists(path):
+        return None
+    header, start = read_mapped_header(path)
+    if header is None or (digest is not None and header["source"] != digest):
+        return None
+    if os.path.getsize(path) == start:
+        data = np.zeros(0, dtype=np.uint8)  # пустая задача: mmap не отображает 0 байт
+    else:
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, (offset, dtype, length) in header["arrays"].items():
+        dtype = np.dtype(dtype)
+        arrays[name] = data[start + offset:start + offset + length * dtype.itemsize].view(dtype)
+    return MappedModel(path, header, arrays)
+
+
+def load_model(path):
+    """
+        Читает задачу через двоичный кэш рядом с файлом (sidecar_path).
+
+        Шаги:
+        1. Вычисляется хеш содержимого файла задачи (source_hash).
+        2. Если кэш есть и построен по тому же содержимому, он отображается в память —
+           без разбора текста.
+        3. Иначе задача читается из файла (Services.formats.read_model), кэш
+           записывается заново и открывается. Если задачу нельзя записать в кэш
+           (коэффициенты больше int64) или каталог недоступен для записи, возвращается
+           прочитанная модель.
+
+        Возвращает:
+        MappedModel или LinearModel.
+    """
+    from Services.formats import read_model
+    digest = source_hash(path)
+    cache = sidecar_path(path)
+    model = open_mapped(cache, digest)
+    if model is not None:
+        return model
+    model = read_model(path)
+    try:
+        write_mapped(cache, model, digest)
+    except (ValueError, OSError):
+        return model
+    return open_mapped(cache, digest)
+
+
+def main(argv=None):
+    """
+        Построение кэшей заранее (например, перед пакетным запуском):
+
+            python -m Services.mapped задачи/*.mps.gz
+    """
+    parser = argparse.ArgumentParser(prog="python -m Services.mapped", description="Двоичные кэши задач для отображения в память")
+    parser.add_argument("paths", nargs="+", help="файлы задач (.bars, .mps, .lp)")
+    args = parser.parse_args(argv)
+    for path in args.paths:
+        model = load_model(path)
+        state = "кэш" if isinstance(model, MappedModel) else "без кэша"
+        print(f"{path}: {state}, переменных {model.count_vars}, ограничений {model.num_constraints()}, ненулевых {len(model.values)}")
+
+
+if __name__ == "__main__":
+    main()
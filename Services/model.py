@@ -0,0 +1,415 @@
+from fractions import Fraction
+import re
+import numpy as np
+
+
+_TOKEN = re.compile(r"\s*(?:(?P<rel><=|>=|=<|=>|=)|(?P<sign>[+-])|(?P<num>\d+(?:\.\d*)?(?:/\d+)?|\.\d+)|(?P<var>[xX]_?(?P<index>\d+))|(?P<mul>\*))")
+_ARROW = re.compile(r"-+>")
+_SENSES = {"<=": "<=", "=<": "<=", ">=": ">=", "=>": ">=", "=": "="}
+
+
+class LinearModel(object):
+    def __init__(self, count_vars, sense, objective, indptr=None, indices=None, values=None, senses=None, rhs=None, objective_constant=0, lower=None, upper=None, integer=None):
+        """
+            Скомпилированная задача линейного программирования.
+
+            Аргументы:
+            - count_vars: количество переменных x_1 ... x_n.
+            - sense: "min" или "max".
+            - objective: список коэффициентов целевой функции длины count_vars (Fraction).
+            - indptr, indices, values: матрица ограничений в разреженном построчном виде (CSR):
+              коэффициенты строки i — это values[indptr[i]:indptr[i+1]] в столбцах
+              indices[indptr[i]:indptr[i+1]] (нумерация столбцов с нуля).
+            - senses: знаки ограничений ("<=", ">=" или "=").
+            - rhs: правые части ограничений (Fraction).
+            - objective_constant: свободный член целевой функции (в оптимальное значение не входит,
+              как и раньше при разборе строк).
+            - lower, upper: границы переменных lower_j <= x_j <= upper_j (Fraction или None —
+              граница отсутствует). По умолчанию x_j >= 0 без верхней границы; свободная
+              переменная — lower = upper = None. Границы не являются строками ограничений
+              и не увеличивают симплекс-таблицу (см. Services.bounds).
+            - integer: признаки целочисленности переменных (список bool длины count_vars).
+              Симплекс-метод решает непрерывную релаксацию; целочисленность учитывает
+              метод ветвей и границ (Services.branch).
+
+            Модель строится один раз функцией compile_model и затем используется
+            симплекс-методом, построением градиента и графиком без повторного разбора строк.
+        """
+        self.count_vars = count_vars
+        self.sense = sense
+        self.objective = objective
+        self.indptr = indptr if indptr is not None else [0]
+        self.indices = indices if indices is not None else []
+        self.values = values if values is not None else []
+        self.senses = senses if senses is not None else []
+        self.rhs = rhs if rhs is not None else []
+        self.objective_constant = Fraction(objective_constant)
+        self.lower = lower if lower is not None else [Fraction(0)] * count_vars
+        self.upper = upper if upper is not None else [None] * count_vars
+        self.integer = integer if integer is not None else [False] * count_vars
+
+    def num_constraints(self):
+        """Возвращает количество ограничений."""
+        return len(self.senses)
+
+    def row(self, i):
+        """
+            Возвращает ненулевые коэффициенты ограничения i.
+
+            Возвращает:
+            Список пар (индекс столбца, коэффициент).
+        """
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return list(zip(self.indices[start:stop], self.values[start:stop]))
+
+    def add_constraint(self, coeffs, sense, rhs):
+        """
+            Добавляет ограничение в конец модели.
+
+            Аргументы:
+            - coeffs: словарь {индекс столбца: коэффициент}.
+            - sense: "<=", ">=" или "=".
+            - rhs: правая часть.
+        """
+        if sense not in ("<=", ">=", "="):
+            raise ValueError(f"Неизвестный знак ограничения: {sense}")
+        for index in sorted(coeffs):
+            if index >= self.count_vars:
+                self.resize(index + 1)
+            if coeffs[index] != 0:
+                self.indices.append(index)
+                self.values.append(Fraction(coeffs[index]))
+        self.indptr.append(len(self.indices))
+        self.senses.append(sense)
+        self.rhs.append(Fraction(rhs))
+
+    def remove_constraint(self, i):
+        """Удаляет ограничение i (нумерация с нуля)."""
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        del self.indices[start:stop]
+        del self.values[start:stop]
+        self.indptr = self.indptr[:i] + [index - (stop - start) for index in self.indptr[i + 1:]]
+        del self.senses[i]
+        del self.rhs[i]
+
+    def set_rhs(self, i, value):
+        """Заменяет правую часть ограничения i."""
+        self.rhs[i] = Fraction(value)
+
+    def set_objective(self, index, value):
+        """Заменяет коэффициент целевой функции при x_(index+1)."""
+        if index >= self.count_vars:
+            raise ValueError(f"Нет переменной x_{index + 1}")
+        self.objective[index] = Fraction(value)
+
+    def resize(self, count_vars):
+        """Увеличивает количество переменных до count_vars (новые — с нулевым коэффициентом и x >= 0)."""
+        if count_vars <= self.count_vars:
+            return
+        extra = count_vars - self.count_vars
+        self.count_vars = count_vars
+        self.objective.extend([Fraction(0)] * extra)
+        self.lower.extend([Fraction(0)] * extra)
+        self.upper.extend([None] * extra)
+        self.integer.extend([False] * extra)
+
+    def set_bounds(self, index, lower=0, upper=None):
+        """
+            Задаёт границы переменной x_(index+1): lower <= x <= upper.
+            None — граница отсутствует (lower=None, upper=None — свободная переменная).
+        """
+        if index >= self.count_vars:
+            raise ValueError(f"Нет переменной x_{index + 1}")
+        self.lower[index] = Fraction(lower) if lower is not None else None
+        self.upper[index] = Fraction(upper) if upper is not None else None
+
+    def set_integer(self, index, integer=True):
+        """Отмечает переменную x_(index+1) как целочисленную (или снимает отметку)."""
+        if index >= self.count_vars:
+            raise ValueError(f"Нет переменной x_{index + 1}")
+        self.integer[index] = bool(integer)
+
+    def copy(self):
+        """Возвращает независимую копию модели (списки коэффициентов не разделяются)."""
+        return LinearModel(self.count_vars, self.sense, list(self.objective), list(self.indptr), list(self.indices), list(self.values),
+                           list(self.senses), list(self.rhs), self.objective_constant, list(self.lower), list(self.upper), list(self.integer))
+
+    def with_rows(self, rows):
+        """
+            Возвращает копию модели с дополнительными ограничениями, не копируя матрицу:
+            indptr, indices и values копии — AppendedArray поверх массивов этой модели,
+            копируются только списки размера n и m.
+
+            Аргументы:
+            - rows: список (коэффициенты {индекс столбца: коэффициент}, знак, правая часть).
+
+            Копия предназначена для решения (например, узлы Services.branch); удалять из
+            неё строки нельзя, а матрицу этой модели нельзя менять, пока копия используется.
+        """
+        model = LinearModel(self.count_vars, self.sense, list(self.objective), AppendedArray(self.indptr), AppendedArray(self.indices), AppendedArray(self.values),
+                            list(self.senses), list(self.rhs), self.objective_constant, list(self.lower), list(self.upper), list(self.integer))
+        for coeffs, sense, rhs in rows:
+            model.add_constraint(coeffs, sense, rhs)
+        return model
+
+    def has_default_bounds(self):
+        """Все ли переменные имеют обычные границы x_j >= 0 без верхней границы."""
+        return all(value == 0 for value in self.lower) and all(value is None for value in self.upper)
+
+    def matrix(self):
+        """
+            Возвращает матрицу ограничений как scipy.sparse.csr_matrix (float64)
+            без построения плотной таблицы. Массивы, уже лежащие в numpy (отображённый
+            файл, см. Services.mapped), не копируются.
+        """
+        from scipy.sparse import csr_matrix
+        return csr_matrix((np.asarray(self.values, dtype=np.float64), np.asarray(self.indices), np.asarray(self.indptr)), shape=(self.num_constraints(), self.count_vars))
+
+    def dense_row(self, i):
+        """Возвращает ограничение i в виде плотного списка коэффициентов длины count_vars."""
+        row = [Fraction(0)] * self.count_vars
+        for index, value in self.row(i):
+            row[index] = value
+        return row
+
+
+class AppendedArray(object):
+    def __init__(self, base):
+        """
+            Массив base (список или массив отображённого файла, см. Services.mapped) с
+            элементами, дописанными в конец (append), без копирования base: новые
+            элементы хранятся в отдельном списке tail. Элементы и срезы — как у списка,
+            np.asarray склеивает base и tail.
+        """
+        self.base = base
+        self.tail = []
+
+    def __len__(self):
+        return len(self.base) + len(self.tail)
+
+    def __getitem__(self, key):
+        size = len(self.base)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return list(self)[key]
+            if stop <= size:
+                return list(self.base[start:stop])
+            if start >= size:
+                return self.tail[start - size:stop - size]
+            return list(self.base[start:size]) + self.tail[:stop - size]
+        if key < 0:
+            key += len(self)
+        return self.base[key] if key < size else self.tail[key - size]
+
+    def __iter__(self):
+        yield from self.base
+        yield from self.tail
+
+    def append(self, value):
+        self.tail.append(value)
+
+    def __array__(self, dtype=None, copy=None):
+        base = np.asarray(self.base, dtype=dtype)
+        return np.concatenate((base, np.asarray(self.tail, dtype=base.dtype)))
+
+
+def csr_from_triplets(num_rows, rows, columns, values):
+    """
+        Собирает матрицу ограничений в виде CSR (indptr, indices, values) из элементов
+        (строка, столбец, значение), заданных в любом порядке, — например, по столбцам,
+        как в файлах MPS.
+
+        Элементы раскладываются по строкам сортировкой подсчётом (линейное время);
+        внутри строки они упорядочиваются по столбцам, только если пришли не по порядку.
+        Повторно заданный элемент — ValueError.
+
+        Возвращает:
+        (indptr, indices, values) для LinearModel.
+    """
+    indptr = [0] * (num_rows + 1)
+    for i in rows:
+        indptr[i + 1] += 1
+    for i in range(num_rows):
+        indptr[i + 1] += indptr[i]
+    position = indptr[:-1]
+    indices = [0] * len(values)
+    result = [None] * len(values)
+    for i, j, value in zip(rows, columns, values):
+        k = position[i]
+        indices[k] = j
+        result[k] = value
+        position[i] = k + 1
+    for i in range(num_rows):
+        start, stop = indptr[i], indptr[i + 1]
+        if any(indices[k] >= indices[k + 1] for k in range(start, stop - 1)):
+            order = sorted(range(start, stop), key=indices.__getitem__)
+            indices[start:stop] = [indices[k] for k in order]
+            result[start:stop] = [result[k] for k in order]
+            if any(indices[k] == indices[k + 1] for k in range(start, stop - 1)):
+                raise ValueError(f"Элемент матрицы ограничений задан дважды (строка {i + 1})")
+    return indptr, indices, result
+
+
+def parse_linear(text, allow_relation=True):
+    """
+        Разбирает линейное выражение вида "2x_1 - 3/2x_2 + x_3 <= 5" за один проход.
+
+        Допускаются произвольные пробелы, знак умножения "*", пропущенный коэффициент (x_1 = 1x_1),
+        десятичные и обыкновенные дроби. Стрелка "--> min" в конце целевой функции игнорируется.
+
+        Аргументы:
+        - text: строка выражения.
+        - allow_relation: разрешён ли знак отношения и правая часть (для ограничений).
+
+        Возвращает:
+        Кортеж (коэффициенты {индекс столбца: Fraction}, знак или None, правая часть или None).
+        Для целевой функции (allow_relation=False) вместо правой части возвращается свободный член.
+    """
+    if not allow_relation:
+        text = _ARROW.split(text, 1)[0]
+    coeffs = {}
+    sense = None
+    rhs = None
+    sign = 1
+    coeff = None
+    constant = Fraction(0)
+    pos = 0
+    length = len(text)
+    while pos < length:
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            if text[pos:].strip() == '':
+                break
+            raise ValueError(f"Не удалось разобрать выражение: {text!r} (позиция {pos})")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'index':
+            kind = 'var'
+
+        if sense is not None:
+            if kind == 'sign' and rhs is None:
+                sign = -sign if match.group('sign') == '-' else sign
+            elif kind == 'num' and rhs is None:
+                rhs = sign * Fraction(match.group('num'))
+            else:
+                raise ValueError(f"Правая часть должна быть числом: {text!r}")
+            continue
+
+        if kind == 'sign':
+            if coeff is not None:
+                if allow_relation:
+                    raise ValueError(f"Свободный член в левой части не поддерживается: {text!r}")
+                constant += sign * coeff
+                sign = 1
+                coeff = None
+            if match.group('sign') == '-':
+                sign = -sign
+        elif kind == 'num':
+            if coeff is not None:
+                raise ValueError(f"Два числа подряд: {text!r}")
+            coeff = Fraction(match.group('num'))
+        elif kind == 'mul':
+            if coeff is None:
+                raise ValueError(f"Знак умножения без коэффициента: {text!r}")
+        elif kind == 'var':
+            index = int(match.group('index')) - 1
+            if index < 0:
+                raise ValueError(f"Переменные нумеруются с x_1: {text!r}")
+            value = sign * (coeff if coeff is not None else Fraction(1))
+            coeffs[index] = coeffs.get(index, Fraction(0)) + value
+            sign = 1
+            coeff = None
+        elif kind == 'rel':
+            if not allow_relation:
+                raise ValueError(f"В целевой функции не должно быть знака отношения: {text!r}")
+            if coeff is not None:
+                raise ValueError(f"Свободный член в левой части не поддерживается: {text!r}")
+            sense = _SENSES[match.group('rel')]
+            sign = 1
+
+    if coeff is not None:
+        if allow_relation:
+            raise ValueError(f"Свободный член в левой части не поддерживается: {text!r}")
+        constant += sign * coeff
+    if not allow_relation:
+        return coeffs, None, constant
+    if sense is None or rhs is None:
+        raise ValueError(f"Ограничение должно иметь вид '... <= число': {text!r}")
+    return coeffs, sense, rhs
+
+
+def compile_model(objective_fun, constraints, count_vars=None):
+    """
+        Компилирует целевую функцию и ограничения из строк в LinearModel.
+
+        Аргументы:
+        - objective_fun: кортеж ("min" или "max", строка целевой функции).
+        - constraints: список строк ограничений.
+        - count_vars: количество переменных; если в выражениях встречается x_k с большим
+          номером, количество переменных увеличивается до k.
+
+        Возвращает:
+        LinearModel. Каждая строка разбирается ровно один раз.
+    """
+    sense = 'min' if 'min' in objective_fun[0].lower() else 'max'
+    objective_coeffs, _, objective_constant = parse_linear(objective_fun[1], allow_relation=False)
+    parsed = [parse_linear(constraint) for constraint in constraints]
+
+    n = count_vars or 0
+    for coeffs in [objective_coeffs] + [row[0] for row in parsed]:
+        if coeffs:
+            n = max(n, max(coeffs) + 1)
+
+    objective = [Fraction(0)] * n
+    for index, value in objective_coeffs.items():
+        objective[index] = value
+
+    model = LinearModel(n, sense, objective, objective_constant=objective_constant)
+    for coeffs, row_sense, rhs in parsed:
+        model.add_constraint(coeffs, row_sense, rhs)
+    return model
+
+
+def model_from_bars(data):
+    """
+        Компилирует задачу из содержимого файла .bars (словарь, который пишет App.save_as_file).
+
+        Аргументы:
+        - data: словарь с ключами "objective", "min" (0 — минимизация, иначе максимизация;
+          в старых файлах — строка) и "constraints"; необязательный ключ "bounds" —
+          {"x_3": [нижняя, верхняя]} (null — граница отсутствует, числа — как в ограничениях);
+          необязательный ключ "integer" — список целочисленных переменных ["x_1", "x_3"].
+
+        Возвращает:
+        LinearModel, как App.compile_task для тех же полей ввода.
+    """
+    objective = data["objective"]
+    sense = 'min' if int(data["min"]) == 0 else 'max'
+    constraints = [constraint.lower() for constraint in data["constraints"]]
+    model = compile_model((sense, objective), constraints, count_vars=objective.lower().count('x'))
+    apply_bounds(model, data.get("bounds", {}))
+    apply_integer(model, data.get("integer", []))
+    return model
+
+
+def apply_bounds(model, bounds):
+    """
+        Записывает в модель границы переменных из словаря {"x_3": [нижняя, верхняя]}
+        (формат ключа "bounds" файла .bars; None — граница отсутствует).
+    """
+    for name, (lower, upper) in bounds.items():
+        index = int(name.lower().lstrip('x').lstrip('_')) - 1
+        model.resize(index + 1)
+        model.set_bounds(index, Fraction(str(lower)) if lower is not None else None, Fraction(str(upper)) if upper is not None else None)
+
+
+def apply_integer(model, names):
+    """
+        Отмечает в модели целочисленные переменные из списка ["x_1", "x_3"]
+        (формат ключа "integer" файла .bars).
+    """
+    for name in names:
+        index = int(name.lower().lstrip('x').lstrip('_')) - 1
+        model.resize(index + 1)
+        model.set_integer(index)
@@ -0,0 +1,143 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+def nice_limit(value):
+    """Округляет границу осей вверх до 1, 2 или 5·10^k, чтобы она реже менялась при вводе."""
+    value = max(float(value), 1.0)
+    power = 10.0 ** np.floor(np.log10(value))
+    for step in (1.0, 2.0, 5.0, 10.0):
+        if value <= step * power:
+            return step * power
+    return 10.0 * power
+
+
+class RegionView(object):
+    def __init__(self, parent, figsize=(6, 3.5)):
+        """
+            График допустимой области, встроенный в окно Tk (FigureCanvasTkAgg).
+
+            Аргументы:
+            - parent: виджет Tk, в котором размещается холст.
+            - figsize: размер рисунка в дюймах.
+
+            Рисунок и все объекты на нём создаются один раз и затем только обновляются:
+            прямые ограничений (кэш по коэффициентам — меняется лишь прямая изменённого
+            ограничения), многоугольник области, вершины, нормаль, точка оптимума и ответ.
+            Эти объекты "анимированные": неподвижная часть (оси, подписи, легенда)
+            сохраняется картинкой после полной отрисовки, а при обновлении поверх неё
+            рисуются только они (blit). Полная отрисовка нужна лишь при смене границ осей.
+        """
+        self.figure = Figure(figsize=figsize, dpi=100)
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.widget = self.canvas.get_tk_widget()
+        self.background = None
+        self.limit = None
+        self.labels = None
+        self.lines = []
+        self.line_keys = []
+
+        ax = self.ax
+        self.region = Polygon([[0, 0]], closed=True, color="r", alpha=0.4, animated=True, label="Искомая область")
+        ax.add_patch(self.region)
+        self.vertices, = ax.plot([], [], "o", color="r", markersize=3, animated=True)
+        self.normal = ax.quiver([0], [0], [0], [0], color="g", angles="xy", scale_units="xy", scale=1, animated=True, label="Нормаль")
+        self.point, = ax.plot([], [], "o", color="orange", markersize=7, animated=True, label="Оптимум")
+        self.answer = ax.text(0.02, 0.02, "", transform=ax.transAxes, color="C0", animated=True)
+        ax.spines['right'].set_color('none')
+        ax.spines['top'].set_color('none')
+        ax.spines['bottom'].set_position('zero')
+        ax.set_title("Графическое решение")
+        ax.legend(handles=[self.region, self.normal, self.point], loc=1)
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def grid(self, **kwargs):
+        """Размещает холст в родительском виджете (параметры grid)."""
+        self.widget.grid(**kwargs)
+
+    def animated(self):
+        """Объекты, которые перерисовываются при каждом обновлении."""
+        return self.lines + [self.region, self.vertices, self.normal, self.point, self.answer]
+
+    def on_draw(self, event):
+        """После полной отрисовки запоминает неподвижный фон и дорисовывает анимированные объекты."""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.draw_animated()
+
+    def draw_animated(self):
+        for artist in self.animated():
+            self.ax.draw_artist(artist)
+
+    def show(self, planes, region, normal, point=None, answer="", labels=("x_1", "x_2")):
+        """
+            Обновляет график.
+
+            Аргументы:
+            - planes: ограничения a_1·x + a_2·y <= b — список троек (a_1, a_2, b) для прямых.
+            - region: допустимая область (Services.region.FeasibleRegion).
+            - normal: направление нормали (x, y).
+            - point: точка оптимума (x, y) или None.
+            - answer: текст ответа под графиком.
+            - labels: имена переменных по осям.
+        """
+        limit = nice_limit(1.1 * np.abs(region.vertices).max(initial=1.0) if region.bounded else region.limit)
+        full = limit != self.limit or tuple(labels) != self.labels or self.background is None
+        if full:
+            self.limit = limit
+            self.labels = tuple(labels)
+            self.ax.set_xlim(-0.1 * limit, limit)
+            self.ax.set_ylim(-0.1 * limit, limit)
+            self.ax.set_xlabel(rf'(${labels[0]}$)')
+            self.ax.set_ylabel(rf'(${labels[1]}$)')
+
+        self.update_lines([tuple(float(v) for v in plane) for plane in planes], full)
+        vertices = region.vertices if not region.is_empty() else np.zeros((0, 2))
+        self.region.set_xy(vertices if len(vertices) else [[0, 0]])
+        self.region.set_visible(len(vertices) > 0)
+        self.vertices.set_data(vertices[:, 0], vertices[:, 1])
+        self.normal.set_UVC([float(normal[0])], [float(normal[1])])
+        if point is None:
+            self.point.set_data([], [])
+        else:
+            self.point.set_data([float(point[0])], [float(point[1])])
+        self.answer.set_text(answer)
+
+        if full:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self.draw_animated()
+            self.canvas.blit(self.ax.bbox)
+
+    def update_lines(self, keys, full):
+        """
+            Обновляет прямые ограничений: пересчитываются только прямые, коэффициенты
+            которых изменились (или все — при смене границ осей).
+        """
+        for i, key in enumerate(keys):
+            if i == len(self.lines):
+                line, = self.ax.plot([], [], linewidth=1, animated=True)
+                self.lines.append(line)
+                self.line_keys.append(None)
+            elif self.line_keys[i] == key and not full:
+                continue
+            self.lines[i].set_data(*self.line_points(*key))
+            self.line_keys[i] = key
+        for line in self.lines[len(keys):]:
+            line.remove()
+        del self.lines[len(keys):]
+        del self.line_keys[len(keys):]
+
+    def line_points(self, a1, a2, b):
+        """Две точки прямой a1·x + a2·y = b на краях видимой области (пусто для 0 = b)."""
+        low, high = -0.1 * self.limit, self.limit
+        if abs(a2) >= abs(a1) and a2 != 0:
+            x = np.array([low, high])
+            return x, (b - a1 * x) / a2
+        if a1 != 0:
+            y = np.array([low, high])
+            return (b - a2 * y) / a1, y
+        return [], []
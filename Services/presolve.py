@@ -0,0 +1,251 @@
+from fractions import Fraction
+from Services.model import LinearModel
+
+
+def violates(value, sense, rhs):
+    """Нарушает ли значение левой части value ограничение (sense, rhs)."""
+    if sense == "<=":
+        return value > rhs
+    if sense == ">=":
+        return value < rhs
+    return value != rhs
+
+
+class Presolve(object):
+    def __init__(self, model):
+        """
+            Упрощение задачи перед построением симплекс-таблицы (presolve).
+
+            Аргументы:
+            - model: скомпилированная задача (Services.model.LinearModel), не изменяется.
+
+            Шаги (повторяются, пока что-то меняется):
+            1. Фиксированные переменные подставляются в ограничения.
+            2. Пустые строки (0 <= b) проверяются и удаляются.
+            3. Строки с одной переменной становятся границами этой переменной
+               (a·x_j <= b даёт x_j <= b/a и т. д., равенство фиксирует x_j); границы
+               от нескольких таких строк сужаются до самой строгой.
+            4. Строки, выполненные при любых значениях в границах переменных, удаляются;
+               невыполнимые при любых значениях означают несовместность.
+            5. Параллельные строки (совпадающие после деления на первый коэффициент)
+               сливаются в одну: остаётся самая строгая правая часть или равенство.
+            6. Переменная с равными границами фиксируется; переменная, не входящая ни
+               в одну строку, фиксируется на выгодной для целевой функции границе.
+
+            Для границ используются только явные (границы переменных модели и строки с одной
+            переменной): границы, выведенные из других строк, могли бы удалить строку,
+            из которой сами выведены.
+
+            Атрибуты:
+            - model: упрощённая задача (LinearModel). Найденные границы переменных записываются
+              в её lower/upper, а не строками (см. Services.bounds).
+            - status: None или "infeasible" (тогда message — причина).
+            - columns: номера исходных переменных для столбцов упрощённой задачи.
+            - fixed: значения фиксированных переменных {номер: значение}.
+            - offset: вклад фиксированных переменных в значение целевой функции.
+            - removed_rows: сколько строк исходной задачи не вошло в упрощённую.
+        """
+        self.original = model
+        self.status = None
+        self.message = None
+        self.lower = list(model.lower)
+        self.upper = list(model.upper)
+        self.fixed = {}
+        self.offset = Fraction(0)
+        self.columns = []
+        rows = [[dict(model.row(i)), model.senses[i], model.rhs[i]] for i in range(model.num_constraints())]
+        rows = self.reduce(rows)
+        self.removed_rows = model.num_constraints() - len(rows)
+        self.model = self.build(rows) if self.status is None else None
+
+    def infeasible(self, message):
+        self.status = "infeasible"
+        self.message = message
+
+    def reduce(self, rows):
+        """Выполняет шаги 1–6, пока задача меняется. Возвращает оставшиеся строки."""
+        changed = True
+        while changed and self.status is None:
+            changed = False
+            kept = []
+            for coeffs, sense, rhs in rows:
+                for j in [j for j in coeffs if j in self.fixed]:
+                    rhs -= coeffs.pop(j) * self.fixed[j]
+                if not coeffs:
+                    if violates(Fraction(0), sense, rhs):
+                        self.infeasible(f"Несовместное ограничение: 0 {sense} {rhs}")
+                    changed = True
+                elif len(coeffs) == 1:
+                    (j, a), = coeffs.items()
+                    self.bound(j, a, sense, rhs)
+                    changed = True
+                elif self.redundant(coeffs, sense, rhs):
+                    changed = True
+                else:
+                    kept.append([coeffs, sense, rhs])
+                if self.status is not None:
+                    return kept
+            merged = self.merge_parallel(kept)
+            changed = changed or len(merged) < len(kept)
+            rows = merged
+            if self.status is None and self.fix_variables(rows):
+                changed = True
+        return rows
+
+    def bound(self, j, a, sense, rhs):
+        """Переводит строку a·x_j (sense) rhs в границы переменной x_j."""
+        value = rhs / a
+        if a < 0 and sense != "=":
+            sense = ">=" if sense == "<=" else "<="
+        if sense in ("<=", "="):
+            self.upper[j] = value if self.upper[j] is None else min(self.upper[j], value)
+        if sense in (">=", "="):
+            self.lower[j] = value if self.lower[j] is None else max(self.lower[j], value)
+        if self.lower[j] is not None and self.upper[j] is not None and self.lower[j] > self.upper[j]:
+            self.infeasible(f"Несовместные границы x_{j + 1}: {self.lower[j]} > {self.upper[j]}")
+
+    def activity(self, coeffs):
+        """
+            Наименьшее и наибольшее значение левой части при границах переменных.
+            None — значение не ограничено.
+        """
+        low, high = Fraction(0), Fraction(0)
+        for j, a in coeffs.items():
+            at_lower = a * self.lower[j] if self.lower[j] is not None else None
+            at_upper = a * self.upper[j] if self.upper[j] is not None else None
+            if a < 0:
+                at_lower, at_upper = at_upper, at_lower
+            # для a > 0 наименьшее значение на нижней границе, для a < 0 — на верхней
+            low = None if low is None or at_lower is None else low + at_lower
+            high = None if high is None or at_upper is None else high + at_upper
+        return low, high
+
+    def redundant(self, coeffs, sense, rhs):
+        """Выполнена ли строка при любых значениях в границах (при невыполнимой — несовместность)."""
+        low, high = self.activity(coeffs)
+        if (sense in ("<=", "=") and low is not None and low > rhs) or (sense in (">=", "=") and high is not None and high < rhs):
+            self.infeasible("Ограничение невыполнимо при допустимых значениях переменных")
+            return False
+        if sense == "<=":
+            return high is not None and high <= rhs
+        if sense == ">=":
+            return low is not None and low >= rhs
+        return low is not None and low == high == rhs
+
+    def merge_parallel(self, rows):
+        """
+            Сливает параллельные строки. Строка нормируется делением на первый
+            коэффициент (при отрицательном знак неравенства меняется); для одинаковых
+            левых частей оставляются самая строгая верхняя и нижняя граница или равенство.
+        """
+        groups = {}
+        for coeffs, sense, rhs in rows:
+            first = coeffs[min(coeffs)]
+            key = tuple(sorted((j, a / first) for j, a in coeffs.items()))
+            value = rhs / first
+            if first < 0 and sense != "=":
+                sense = ">=" if sense == "<=" else "<="
+            group = groups.setdefault(key, {"<=": None, ">=": None, "=": None})
+            if sense == "<=":
+                group["<="] = value if group["<="] is None else min(group["<="], value)
+            elif sense == ">=":
+                group[">="] = value if group[">="] is None else max(group[">="], value)
+            elif group["="] is not None and group["="] != value:
+                self.infeasible("Несовместные равенства с одинаковой левой частью")
+                return rows
+            else:
+                group["="] = value
+
+        merged = []
+        for key, group in groups.items():
+            coeffs = dict(key)
+            upper, lower, equal = group["<="], group[">="], group["="]
+            if upper is not None and lower is not None and lower > upper:
+                self.infeasible("Несовместные параллельные ограничения")
+                return rows
+            if equal is None and upper is not None and upper == lower:
+                equal = upper
+            if equal is not None:
+                if (upper is not None and equal > upper) or (lower is not None and equal < lower):
+                    self.infeasible("Несовместные параллельные ограничения")
+                    return rows
+                merged.append([coeffs, "=", equal])
+                continue
+            if upper is not None:
+                merged.append([coeffs, "<=", upper])
+            if lower is not None:
+                merged.append([dict(coeffs), ">=", lower])
+        return merged
+
+    def fix_variables(self, rows):
+        """
+            Фиксирует переменные с равными границами и переменные, не входящие в строки
+            (на границе, выгодной для целевой функции; при неограниченной выгодной
+            границе переменная остаётся — симплекс-метод сообщит о неограниченности).
+
+            Возвращает:
+            True, если зафиксирована хотя бы одна новая переменная.
+        """
+        used = set()
+        for coeffs, sense, rhs in rows:
+            used.update(coeffs)
+        sign = 1 if self.original.sense == "min" else -1
+        changed = False
+        for j in range(self.original.count_vars):
+            if j in self.fixed:
+                continue
+            value = None
+            if self.upper[j] is not None and self.lower[j] == self.upper[j]:
+                value = self.lower[j]
+            elif j not in used:
+                cost = sign * self.original.objective[j]
+                if cost > 0 or (cost == 0 and self.lower[j] is not None):
+                    value = self.lower[j]
+                elif cost < 0 or self.upper[j] is not None:
+                    value = self.upper[j]
+                else:
+                    # свободная переменная с нулевой ценой
+                    value = Fraction(0)
+            if value is not None:
+                self.fixed[j] = value
+                self.offset += self.original.objective[j] * value
+                changed = True
+        return changed
+
+    def build(self, rows):
+        """Собирает упрощённую задачу: оставшиеся столбцы и строки, границы переменных."""
+        self.columns = [j for j in range(self.original.count_vars) if j not in self.fixed]
+        position = {j: k for k, j in enumerate(self.columns)}
+        objective = [self.original.objective[j] for j in self.columns]
+        model = LinearModel(len(self.columns), self.original.sense, objective,
+                            lower=[self.lower[j] for j in self.columns], upper=[self.upper[j] for j in self.columns])
+        for coeffs, sense, rhs in rows:
+            model.add_constraint({position[j]: a for j, a in coeffs.items()}, sense, rhs)
+        return model
+
+    def postsolve(self, solution, objective):
+        """
+            Переводит решение упрощённой задачи в переменные исходной.
+
+            Аргументы:
+            - solution: словарь {"x_k": значение} упрощённой задачи.
+            - objective: значение её целевой функции.
+
+            Возвращает:
+            Кортеж (словарь {"x_i": значение} для всех исходных переменных, значение
+            исходной целевой функции).
+        """
+        values = {}
+        for j in range(self.original.count_vars):
+            if j in self.fixed:
+                values['x_' + str(j + 1)] = self.fixed[j]
+        for k, j in enumerate(self.columns):
+            values['x_' + str(j + 1)] = solution['x_' + str(k + 1)]
+        ordered = {'x_' + str(j + 1): values['x_' + str(j + 1)] for j in range(self.original.count_vars)}
+        return ordered, objective + self.offset
+
+    def stats(self):
+        """Размеры задачи до и после упрощения."""
+        return {"rows": (self.original.num_constraints(), self.model.num_constraints() if self.model is not None else 0),
+                "columns": (self.original.count_vars, len(self.columns)),
+                "fixed": len(self.fixed)}
@@ -0,0 +1,245 @@
+from time import perf_counter
+import numpy as np
+
+
+class IterationLimitError(RuntimeError):
+    """Превышено допустимое количество шагов симплекс-метода."""
+
+
+class TimeLimitError(RuntimeError):
+    """Превышено допустимое время решения."""
+
+
+class CancelledError(RuntimeError):
+    """Решение отменено пользователем (PivotControl.cancel)."""
+
+
+class DantzigPricing(object):
+    """
+        Правило Данцига: в базис вводится столбец с наибольшей оценкой улучшения.
+        При равенстве выбирается первый столбец (как max_index/min_index).
+    """
+    name = "dantzig"
+    anti_cycling = False
+
+    def reset(self, engine):
+        """Вызывается в начале каждой фазы."""
+
+    def select(self, engine, scores):
+        """
+            Выбирает вводимый столбец.
+
+            Аргументы:
+            - engine: Simplex или RevisedSimplex.
+            - scores: оценки улучшения по столбцам (положительная — целевая функция улучшается).
+
+            Возвращает:
+            Индекс столбца или None, если улучшающих столбцов нет (оптимум).
+        """
+        if isinstance(scores, np.ndarray):
+            best = int(np.argmax(scores))
+        else:
+            best = max(range(len(scores)), key=scores.__getitem__)
+        if engine.is_improving(scores[best]):
+            return best
+        return None
+
+    def update(self, engine, key_row, key_column):
+        """Вызывается перед заменой базиса (для правил с весами)."""
+
+
+class BlandPricing(DantzigPricing):
+    """
+        Правило Бленда: вводится улучшающий столбец с наименьшим номером, а при равных
+        отношениях выводится переменная с наименьшим номером. Исключает зацикливание.
+    """
+    name = "bland"
+    anti_cycling = True
+
+    def select(self, engine, scores):
+        if isinstance(scores, np.ndarray):
+            improving = np.flatnonzero(scores > engine.eps)
+            return int(improving[0]) if len(improving) else None
+        for j in range(len(scores)):
+            if engine.is_improving(scores[j]):
+                return j
+        return None
+
+
+class DevexPricing(DantzigPricing):
+    """
+        Приближённое правило наибольшего ребра (devex, Харрис): оценка делится на
+        вес столбца, который пересчитывается по ведущей строке при каждой замене базиса.
+    """
+    name = "devex"
+
+    def reset(self, engine):
+        self.weights = np.ones(engine.pricing_width())
+
+    def select(self, engine, scores):
+        values = np.asarray(scores, dtype=np.float64)
+        improving = values > engine.eps
+        if not improving.any():
+            return None
+        ratio = np.where(improving, values * values / self.weights[:len(values)], -1.0)
+        return int(np.argmax(ratio))
+
+    def update(self, engine, key_row, key_column):
+        row = np.asarray(engine.pivot_row(key_row), dtype=np.float64)
+        pivot = row[key_column]
+        w_q = self.weights[key_column]
+        leaving = engine.leaving_column(key_row)
+        scaled = (row / pivot) ** 2 * w_q
+        np.maximum(self.weights[:len(scaled)], scaled, out=self.weights[:len(scaled)])
+        if leaving is not None and leaving < len(self.weights):
+            self.weights[leaving] = max(w_q / (pivot * pivot), 1.0)
+        self.weights[key_column] = 1.0
+
+
+class SteepestEdgePricing(DevexPricing):
+    """
+        Правило наибольшего ребра: оценка делится на длину ребра sqrt(1 + ||B⁻¹·a_j||²).
+        Для симплекс-таблицы нормы столбцов считаются точно; если движок их не
+        предоставляет (RevisedSimplex), используются веса devex.
+    """
+    name = "steepest-edge"
+
+    def select(self, engine, scores):
+        norms = engine.column_norms()
+        if norms is None:
+            return DevexPricing.select(self, engine, scores)
+        values = np.asarray(scores, dtype=np.float64)
+        improving = values > engine.eps
+        if not improving.any():
+            return None
+        ratio = np.where(improving, values * values / (1.0 + norms[:len(values)]), -1.0)
+        return int(np.argmax(ratio))
+
+    def update(self, engine, key_row, key_column):
+        if engine.column_norms_available():
+            return
+        DevexPricing.update(self, engine, key_row, key_column)
+
+
+PRICING = {
+    "dantzig": DantzigPricing,
+    "bland": BlandPricing,
+    "devex": DevexPricing,
+    "steepest-edge": SteepestEdgePricing,
+}
+
+
+def make_pricing(pricing):
+    """
+        Возвращает объект правила выбора вводимого столбца.
+
+        Аргументы:
+        - pricing: имя правила ("dantzig", "bland", "devex", "steepest-edge") или готовый объект.
+    """
+    if isinstance(pricing, str):
+        if pricing not in PRICING:
+            raise ValueError(f"Неизвестное правило выбора столбца: {pricing}")
+        return PRICING[pricing]()
+    return pricing
+
+
+class PivotControl(object):
+    def __init__(self, pricing="dantzig", max_iterations=None, time_limit=None):
+        """
+            Управление итерациями симплекс-метода: правило выбора столбца, ограничения
+            по числу шагов и времени, обнаружение зацикливания.
+
+            Аргументы:
+            - pricing: имя правила выбора столбца или объект правила.
+            - max_iterations: наибольшее число шагов (None — без ограничения).
+            - time_limit: ограничение времени в секундах (None — без ограничения).
+
+            Зацикливание возможно только на вырожденных шагах (значение целевой функции
+            не меняется), поэтому базисы запоминаются лишь на сериях вырожденных шагов.
+            Если базис повторился, до конца решения включается правило Бленда.
+
+            Атрибуты:
+            - iterations: всего выполнено шагов.
+            - stats: количество шагов по каждому использованному правилу.
+            - cycling_detected: было ли обнаружено повторение базиса.
+            - cancelled: запрошена ли отмена (см. cancel).
+        """
+        self.pricing = make_pricing(pricing)
+        self.active = self.pricing
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.started = perf_counter()
+        self.iterations = 0
+        self.stats = {}
+        self.cycling_detected = False
+        self.seen = set()
+        self.cancelled = False
+
+    def cancel(self):
+        """
+            Запрашивает отмену решения. Можно вызывать из другого потока: решатель
+            проверяет флаг перед каждым шагом и завершается с CancelledError.
+        """
+        self.cancelled = True
+
+    def summary(self):
+        """Статистика для SimplexResult: шаги по правилам и флаг зацикливания."""
+        return {"pivots": dict(self.stats), "cycling_detected": self.cycling_detected}
+
+    def start_phase(self, engine):
+        """Вызывается в начале фазы: сбрасывает историю базисов и веса правила."""
+        self.seen.clear()
+        self.active.reset(engine)
+
+    def select(self, engine, scores):
+        """
+            Выбирает вводимый столбец текущим правилом (см. DantzigPricing.select).
+            Ограничения проверяются только если нужен ещё один шаг, поэтому задача,
+            решённая ровно за max_iterations шагов, ошибкой не считается.
+        """
+        key_column = self.active.select(engine, scores)
+        if key_column is not None:
+            self.check_limits()
+        return key_column
+
+    def check_limits(self):
+        """Вызывается перед очередным шагом; при отмене или превышении ограничений — исключение."""
+        if self.cancelled:
+            raise CancelledError("Решение отменено")
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            raise IterationLimitError(f"Превышено количество итераций: {self.max_iterations}")
+        if self.time_limit is not None and perf_counter() - self.started > self.time_limit:
+            raise TimeLimitError(f"Превышено время решения: {self.time_limit} с")
+
+    def anti_cycling(self):
+        """Нужно ли при равных отношениях выводить переменную с наименьшим номером."""
+        return self.active.anti_cycling
+
+    def before_pivot(self, engine, key_row, key_column):
+        """Вызывается перед заменой базиса, пока таблица и базис ещё не изменены."""
+        self.active.update(engine, key_row, key_column)
+
+    def after_pivot(self, engine, basis, degenerate):
+        """
+            Учитывает выполненный шаг: счётчики и проверку повторения базиса.
+
+            Аргументы:
+            - engine: движок симплекс-метода (нужен для сброса весов при смене правила).
+            - basis: текущий список базисных столбцов.
+            - degenerate: был ли шаг вырожденным (нулевой шаг по ведущей строке).
+        """
+        self.iterations += 1
+        self.stats[self.active.name] = self.stats.get(self.active.name, 0) + 1
+        if not degenerate:
+            self.seen.clear()
+            return
+        if self.active.anti_cycling:
+            return
+        key = hash(tuple(sorted(basis)))
+        if key in self.seen:
+            self.cycling_detected = True
+            self.active = BlandPricing()
+            self.active.reset(engine)
+            self.seen.clear()
+        else:
+            self.seen.add(key)
@@ -0,0 +1,178 @@
+import numpy as np
+
+
+def half_planes(model):
+    """
+        Переводит ограничения задачи с двумя переменными в полуплоскости a·x <= b.
+
+        Аргументы:
+        - model: скомпилированная задача (Services.model.LinearModel); учитываются
+          коэффициенты при x_1 и x_2, как в прежнем построении области через SymPy.
+
+        Шаги:
+        1. Первыми идут нижние границы x_1 >= lower_1 и x_2 >= lower_2 (по умолчанию
+           неотрицательность); у переменной без нижней границы — пустое условие 0 <= 0.
+        2. Ограничение ">=" умножается на -1, равенство даёт две полуплоскости.
+        3. В конец добавляются верхние границы x_1 <= upper_1, x_2 <= upper_2, если они есть.
+
+        Возвращает:
+        Кортеж (a — массив k×2, b — массив длины k), float64.
+    """
+    rows, rhs = [], []
+    for j, unit in enumerate([(1.0, 0.0), (0.0, 1.0)]):
+        lower = model.lower[j] if j < model.count_vars else 0
+        rows.append((-unit[0], -unit[1]) if lower is not None else (0.0, 0.0))
+        rhs.append(-float(lower) if lower is not None else 0.0)
+    for i in range(model.num_constraints()):
+        ax1, ax2 = 0.0, 0.0
+        for index, value in model.row(i):
+            if index == 0:
+                ax1 = float(value)
+            elif index == 1:
+                ax2 = float(value)
+        bx = float(model.rhs[i])
+        if model.senses[i] in ("<=", "="):
+            rows.append((ax1, ax2))
+            rhs.append(bx)
+        if model.senses[i] in (">=", "="):
+            rows.append((-ax1, -ax2))
+            rhs.append(-bx)
+    for j, unit in enumerate([(1.0, 0.0), (0.0, 1.0)]):
+        if j < model.count_vars and model.upper[j] is not None:
+            rows.append(unit)
+            rhs.append(float(model.upper[j]))
+    return np.array(rows, dtype=np.float64), np.array(rhs, dtype=np.float64)
+
+
+def clip_polygon(polygon, a, b, eps=1e-9):
+    """
+        Отсекает выпуклый многоугольник полуплоскостью a·x <= b (шаг Сазерленда — Ходжмана).
+
+        Аргументы:
+        - polygon: вершины многоугольника по обходу, массив n×2.
+        - a, b: нормаль (2 числа) и правая часть полуплоскости.
+        - eps: допуск, с которым вершина на границе считается внутренней.
+
+        Возвращает:
+        Вершины отсечённого многоугольника (массив m×2, возможно пустой).
+        Все рёбра обрабатываются одной операцией над массивами: для каждой вершины
+        выводится она сама (если внутри) и точка пересечения ребра с границей
+        (если ребро её пересекает).
+    """
+    if len(polygon) == 0:
+        return polygon
+    s = polygon.dot(a) - b
+    inside = s <= eps
+    following = np.roll(polygon, -1, axis=0)
+    s_next = np.roll(s, -1)
+    crossing = inside != np.roll(inside, -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(crossing, s / (s - s_next), 0.0)
+    points = polygon + t[:, None] * (following - polygon)
+    candidates = np.stack((polygon, points), axis=1).reshape(-1, 2)
+    keep = np.stack((inside, crossing), axis=1).reshape(-1)
+    return candidates[keep]
+
+
+class FeasibleRegion(object):
+    def __init__(self, a, b, eps=1e-9):
+        """
+            Допустимая область задачи с двумя переменными как выпуклый многоугольник.
+
+            Аргументы:
+            - a, b: полуплоскости a·x <= b (см. half_planes).
+            - eps: допуск сравнения.
+
+            Область строится аналитически: квадрат, заведомо содержащий все вершины
+            (все попарные пересечения граничных прямых), последовательно отсекается
+            каждой полуплоскостью. Вершина на стороне квадрата означает, что область
+            неограничена (bounded = False) — такие вершины только обрезают рисунок.
+
+            Атрибуты:
+            - vertices: вершины многоугольника по обходу (массив n×2; пустой — область пуста).
+            - bounded: ограничена ли область.
+            - limit: сторона квадрата отсечения (удобна для границ осей).
+        """
+        self.a = np.asarray(a, dtype=np.float64)
+        self.b = np.asarray(b, dtype=np.float64)
+        self.eps = eps
+        self.limit = self.bounding_limit()
+        # при x_1, x_2 >= 0 область лежит в первой четверти, иначе квадрат отсечения симметричен
+        nonnegative = len(self.b) >= 2 and np.array_equal(self.a[:2], -np.eye(2)) and np.all(self.b[:2] <= 0)
+        low, high = (-1.0 if nonnegative else -self.limit), self.limit
+        polygon = np.array([[low, low], [high, low], [high, high], [low, high]])
+        for normal, rhs in zip(self.a, self.b):
+            polygon = clip_polygon(polygon, normal, rhs, eps)
+        self.vertices = self.unique_vertices(polygon)
+        tol = eps * max(1.0, self.limit)
+        self.bounded = not np.any((np.abs(self.vertices - low) <= tol) | (np.abs(self.vertices - high) <= tol))
+
+    @classmethod
+    def from_model(cls, model, eps=1e-9):
+        """Строит область по скомпилированной задаче (см. half_planes)."""
+        a, b = half_planes(model)
+        return cls(a, b, eps)
+
+    def bounding_limit(self):
+        """
+            Возвращает сторону квадрата отсечения: в полтора раза больше наибольшей
+            координаты пересечения граничных прямых (и не меньше 10).
+        """
+        a1, a2 = self.a[:, None, :], self.a[None, :, :]
+        det = a1[..., 0] * a2[..., 1] - a1[..., 1] * a2[..., 0]
+        b1, b2 = self.b[:, None], self.b[None, :]
+        ok = np.abs(det) > self.eps
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.where(ok, (b1 * a2[..., 1] - b2 * a1[..., 1]) / det, 0.0)
+            y = np.where(ok, (a1[..., 0] * b2 - a2[..., 0] * b1) / det, 0.0)
+        extent = max(float(np.abs(x).max(initial=0.0)), float(np.abs(y).max(initial=0.0)))
+        return max(10.0, 1.5 * extent + 1.0)
+
+    def unique_vertices(self, polygon):
+        """Убирает совпадающие соседние вершины (остаются после отсечения по вершине)."""
+        if len(polygon) == 0:
+            return polygon
+        tol = self.eps * max(1.0, self.limit)
+        following = np.roll(polygon, -1, axis=0)
+        keep = np.abs(polygon - following).max(axis=1) > tol
+        if not keep.any():
+            return polygon[:1]
+        return polygon[keep]
+
+    def is_empty(self):
+        """Пуста ли область (задача несовместна)."""
+        return len(self.vertices) == 0
+
+    def best_vertex(self, c, sense="max"):
+        """
+            Находит вершину с наилучшим значением целевой функции c·x.
+
+            Аргументы:
+            - c: коэффициенты при x_1 и x_2.
+            - sense: "min" или "max".
+
+            Возвращает:
+            Кортеж (вершина, значение) или None, если область пуста.
+            Для неограниченной области результат — лучшая из видимых вершин,
+            и оптимумом он является, только если bounded истинно.
+        """
+        if self.is_empty():
+            return None
+        values = self.vertices.dot(np.asarray(c, dtype=np.float64))
+        best = int(np.argmin(values) if sense == "min" else np.argmax(values))
+        return self.vertices[best], float(values[best])
+
+    def draw(self, ax, **kwargs):
+        """
+            Рисует область одним вызовом ax.fill.
+
+            Аргументы:
+            - ax: оси Matplotlib.
+            - kwargs: параметры fill (color, alpha, label ...).
+
+            Возвращает:
+            Список патчей fill (пустой, если область пуста).
+        """
+        if self.is_empty():
+            return []
+        return ax.fill(self.vertices[:, 0], self.vertices[:, 1], **kwargs)
@@ -0,0 +1,348 @@
+import numpy as np
+from scipy.sparse import csc_matrix, diags
+from scipy.sparse.linalg import splu
+from Services.pricing import PivotControl
+from Services.simplex import UnboundedError
+
+
+class RevisedSimplex(object):
+    def __init__(self, model, observer=None, eps=1e-9, refactor_interval=50, pricing="dantzig", max_iterations=None, time_limit=None, control=None, crash=None):
+        """
+            Модифицированный (revised) симплекс-метод для больших разреженных задач.
+
+            Аргументы:
+            - model: скомпилированная задача (Services.model.LinearModel).
+            - observer: наблюдатель за ходом решения (получает только on_pivot — таблицы здесь нет).
+            - eps: допуск для проверок оптимальности и отношения.
+            - refactor_interval: через сколько шагов LU-разложение базиса строится заново.
+            - pricing, max_iterations, time_limit, control: правило выбора столбца и ограничения,
+              как у Simplex. Точные нормы столбцов здесь не считаются, поэтому
+              "steepest-edge" использует веса devex.
+            - crash: столбцы-кандидаты в начальный базис (номера в [A | S], по убыванию
+              приоритета), например по решению метода внутренней точки (см. crash_basis).
+
+            Матрица ограничений хранится в формате CSC, дополнительные и искусственные
+            переменные не хранятся вовсе (их столбцы — единичные векторы). Базис хранится как
+            LU-разложение (SuperLU) и мультипликативные η-поправки, накапливаемые между
+            переразложениями. Память — O(nnz(A) + m), а не O(m·(n+m)), как у таблицы.
+
+            Результат совпадает по форме с Simplex: solution (словарь x_i и "val"),
+            optimize_val, basic_vars, iterations, feasible.
+        """
+        self.observer = observer
+        self.eps = eps
+        self.refactor_interval = refactor_interval
+        self.iterations = 0
+        if control is None:
+            control = PivotControl(pricing, max_iterations, time_limit)
+        self.control = control
+        self.model = model
+        self.count_vars = model.count_vars
+        self.objective = model.sense
+        try:
+            self.setup()
+            if crash is not None:
+                self.crash_basis(crash)
+            self.phase1()
+            self.feasible = self.phase1_value() <= self.eps * max(1.0, float(np.abs(self.b).sum()))
+            if self.feasible:
+                self.drive_out_artificials()
+                self.phase2()
+        finally:
+            if self.observer is not None:
+                self.observer.on_finish(self)
+
+        x = self.primal_values()
+        self.solution = {}
+        for j in range(self.count_vars):
+            self.solution['x_' + str(j + 1)] = float(x[j])
+        self.optimize_val = float(np.dot(self.c, x))
+        self.solution["val"] = self.optimize_val
+        self.basic_vars = [0] + [self.tableau_index(k) for k in self.head]
+
+    def setup(self):
+        """
+            Подготавливает данные: матрицу в CSC, правые части, знаки ограничений и начальный базис.
+
+            Шаги:
+            1. Строки с отрицательной правой частью умножаются на -1 (знак неравенства меняется).
+            2. Для строки "<=" начальный базисный столбец — дополнительная переменная,
+               для ">=" и "=" — искусственная.
+            3. Строится LU-разложение начального (единичного) базиса.
+        """
+        model = self.model
+        m, n = model.num_constraints(), self.count_vars
+        rhs = np.array(model.rhs, dtype=np.float64)
+        sign = np.where(rhs < 0, -1.0, 1.0)
+        self.A = csc_matrix(diags(sign) @ model.matrix())
+        self.AT = self.A.T.tocsr()
+        self.b = rhs * sign
+        flip = {'<=': '>=', '>=': '<=', '=': '='}
+        senses = [flip[s] if sign[i] < 0 else s for i, s in enumerate(model.senses)]
+        self.senses = senses
+        self.slack_sign = np.array([1.0 if s == '<=' else -1.0 if s == '>=' else 0.0 for s in senses])
+        self.has_artificial = np.array([s != '<=' for s in senses], dtype=bool)
+        self.m, self.n = m, n
+
+        c = np.array(model.objective, dtype=np.float64)
+        self.c = c
+        self.cost = c if model.sense == 'min' else -c
+
+        # номера столбцов: 0..n-1 — исходные, n..n+m-1 — дополнительные, n+m..n+2m-1 — искусственные
+        self.head = np.array([n + i if s == '<=' else n + m + i for i, s in enumerate(senses)], dtype=np.int64)
+        self.is_basic = np.zeros(n + 2 * m, dtype=bool)
+        self.is_basic[self.head] = True
+        self.refactor()
+
+    def column(self, k):
+        """Возвращает столбец k расширенной матрицы [A | S | R] в плотном виде."""
+        a = np.zeros(self.m)
+        if k < self.n:
+            start, stop = self.A.indptr[k], self.A.indptr[k + 1]
+            a[self.A.indices[start:stop]] = self.A.data[start:stop]
+        elif k < self.n + self.m:
+            a[k - self.n] = self.slack_sign[k - self.n]
+        else:
+            a[k - self.n - self.m] = 1.0
+        return a
+
+    def refactor(self):
+        """
+            Строит LU-разложение текущего базиса заново, сбрасывает η-поправки
+            и пересчитывает значения базисных переменных.
+        """
+        structural = self.head < self.n
+        positions = np.flatnonzero(structural)
+        columns = self.A[:, self.head[structural]].tocoo()
+        logical = np.flatnonzero(~structural)
+        logical_rows = (self.head[logical] - self.n) % self.m
+        logical_data = np.where(self.head[logical] < self.n + self.m, self.slack_sign[logical_rows], 1.0)
+        rows = np.concatenate((columns.row, logical_rows))
+        cols = np.concatenate((positions[columns.col], logical))
+        data = np.concatenate((columns.data, logical_data))
+        basis = csc_matrix((data, (rows, cols)), shape=(self.m, self.m))
+        self.lu = splu(basis)
+        self.etas = []
+        self.x_B = self.ftran(self.b.copy())
+
+    def ftran(self, a):
+        """Решает B·x = a с учётом накопленных η-поправок."""
+        x = self.lu.solve(a)
+        for r, index, values, pivot in self.etas:
+            t = x[r] / pivot
+            x[index] -= values * t
+            x[r] = t
+        return x
+
+    def btran(self, c):
+        """Решает yᵀ·B = cᵀ с учётом накопленных η-поправок."""
+        z = c.copy()
+        for r, index, values, pivot in reversed(self.etas):
+            dot = np.dot(z[index], values)
+            z[r] = (z[r] - dot + z[r] * pivot) / pivot
+        return self.lu.solve(z, trans='T')
+
+    def reduced_costs(self, cost, artificial_cost):
+        """
+            Вычисляет оценки (приведённые стоимости) всех небазисных столбцов.
+
+            Аргументы:
+            - cost: стоимости исходных переменных.
+            - artificial_cost: стоимость искусственных переменных (1 на первой фазе).
+
+            Возвращает:
+            Массив оценок длины n + 2m; у базисных и недопустимых для ввода столбцов — 0.
+        """
+        extended = np.concatenate((cost, np.zeros(self.m), np.full(self.m, artificial_cost)))
+        y = self.btran(extended[self.head])
+        d = np.zeros(self.n + 2 * self.m)
+        d[:self.n] = cost - self.AT.dot(y)
+        d[self.n:self.n + self.m] = -self.slack_sign * y
+        d[self.is_basic] = 0.0
+        return d
+
+    def choose_entering(self, d):
+        """Выбор вводимого столбца текущим правилом по оценкам -d или None, если базис оптимален."""
+        return self.control.select(self, -d)
+
+    def choose_leaving(self, alpha):
+        """
+            Тест отношений: позиция базиса с минимальным x_B[i] / alpha[i] при alpha[i] > eps или None.
+            При правиле Бленда из равных отношений выбирается столбец с наименьшим номером.
+        """
+        mask = alpha > self.eps
+        if not mask.any():
+            return None
+        ratios = np.full(self.m, np.inf)
+        ratios[mask] = self.x_B[mask] / alpha[mask]
+        r = int(np.argmin(ratios))
+        if self.control.anti_cycling():
+            ties = np.flatnonzero(ratios <= ratios[r] + self.eps)
+            r = int(ties[np.argmin(self.head[ties])])
+        return r
+
+    # Интерфейс для правил выбора столбца (Services.pricing)
+    def is_improving(self, value):
+        return value > self.eps
+
+    def pricing_width(self):
+        return self.n + 2 * self.m
+
+    def pivot_row(self, r):
+        e = np.zeros(self.m)
+        e[r] = 1.0
+        rho = self.btran(e)
+        return np.concatenate((self.AT.dot(rho), self.slack_sign * rho, rho))
+
+    def leaving_column(self, r):
+        return int(self.head[r])
+
+    def column_norms(self):
+        return None
+
+    def column_norms_available(self):
+        return False
+
+    def pivot(self, r, q, alpha):
+        """
+            Выполняет замену базиса: столбец q входит на позицию r.
+
+            Аргументы:
+            - r: позиция выводимой переменной в базисе.
+            - q: номер вводимого столбца.
+            - alpha: B⁻¹·a_q.
+        """
+        if self.observer is not None:
+            self.observer.on_pivot(self, r + 1, q, alpha[r])
+        self.replace(r, q, alpha)
+        self.iterations += 1
+
+    def replace(self, r, q, alpha):
+        """Замена базиса без учёта шага (см. pivot): значения базиса, η-поправка, переразложение."""
+        theta = self.x_B[r] / alpha[r]
+        self.x_B -= theta * alpha
+        self.x_B[r] = theta
+        self.is_basic[self.head[r]] = False
+        self.is_basic[q] = True
+        self.head[r] = q
+        index = np.flatnonzero(alpha)
+        self.etas.append((r, index, alpha[index], alpha[r]))
+        if len(self.etas) >= self.refactor_interval:
+            self.refactor()
+
+    def iterate(self, cost, artificial_cost):
+        """
+            Итерации симплекс-метода с текущими стоимостями до достижения оптимума.
+            Искусственные переменные в базис не вводятся.
+        """
+        d_mask = np.zeros(self.n + 2 * self.m, dtype=bool)
+        d_mask[self.n + self.m:] = True
+        d_mask[self.n:self.n + self.m] = self.slack_sign == 0
+        self.control.start_phase(self)
+        while True:
+            d = self.reduced_costs(cost, artificial_cost)
+            d[d_mask] = 0.0
+            q = self.choose_entering(d)
+            if q is None:
+                return
+            alpha = self.ftran(self.column(q))
+            r = self.choose_leaving(alpha)
+            if r is None:
+                raise UnboundedError("Решение неограниченно")
+            self.control.before_pivot(self, r, q)
+            degenerate = self.x_B[r] <= self.eps
+            self.pivot(r, q, alpha)
+            self.control.after_pivot(self, self.head, degenerate)
+
+    def crash_basis(self, columns):
+        """
+            Вводит в начальный базис столбцы-кандидаты (кроссовер после метода внутренней точки).
+
+            Кандидаты вводятся по очереди с обычным тестом отношений, поэтому базис остаётся
+            допустимым (значения неотрицательны, искусственные переменные разрешены). Кандидат
+            пропускается, если по тесту отношений из базиса пришлось бы вывести другой
+            кандидат (уже базисные кандидаты — дополнительные переменные строк "<=" — тоже
+            остаются на месте) или если его столбец почти линейно зависим от базиса.
+            Затем обычные первая и вторая фазы продолжают с этого базиса; если кандидаты
+            близки к оптимальному базису, шагов почти не остаётся.
+        """
+        taken = np.isin(self.head, columns)
+        for q in columns:
+            if self.is_basic[q] or (self.n <= q < self.n + self.m and self.slack_sign[q - self.n] == 0):
+                continue
+            alpha = self.ftran(self.column(q))
+            mask = alpha > self.eps
+            if not mask.any():
+                continue
+            ratios = np.full(self.m, np.inf)
+            ratios[mask] = self.x_B[mask] / alpha[mask]
+            # из равных отношений выводится не кандидат
+            r = int(np.lexsort((taken, ratios))[0])
+            if taken[r]:
+                continue
+            self.replace(r, q, alpha)
+            taken[r] = True
+
+    def phase1(self):
+        """Первая фаза: минимизация суммы искусственных переменных."""
+        if self.has_artificial.any():
+            self.iterate(np.zeros(self.n), 1.0)
+
+    def phase1_value(self):
+        """Сумма значений искусственных переменных в текущем базисе."""
+        return float(sum(self.x_B[i] for i, k in enumerate(self.head) if k >= self.n + self.m))
+
+    def drive_out_artificials(self):
+        """
+            Выводит из базиса искусственные переменные, оставшиеся на нулевом уровне после первой фазы.
+            Если в строке нет подходящего столбца, ограничение линейно зависимо и искусственная
+            переменная остаётся в базисе (её значение больше не меняется).
+        """
+        for r in range(self.m):
+            if self.head[r] < self.n + self.m:
+                continue
+            e = np.zeros(self.m)
+            e[r] = 1.0
+            rho = self.btran(e)
+            row = np.concatenate((self.AT.dot(rho), self.slack_sign * rho))
+            row[self.is_basic[:self.n + self.m]] = 0.0
+            candidates = np.flatnonzero(np.abs(row) > self.eps)
+            if len(candidates):
+                q = int(candidates[np.argmax(np.abs(row[candidates]))])
+                self.pivot(r, q, self.ftran(self.column(q)))
+
+    def phase2(self):
+        """Вторая фаза: оптимизация исходной целевой функции (максимизация сводится к минимизации -c)."""
+        self.iterate(self.cost, 0.0)
+
+    def primal_values(self):
+        """Значения исходных переменных x_1 ... x_n в текущем базисе."""
+        x = np.zeros(self.n)
+        for position, k in enumerate(self.head):
+            if k < self.n:
+                x[k] = self.x_B[position]
+        return x
+
+    def dual_values(self):
+        """
+            Двойственные оценки (теневые цены) ограничений, как Simplex.dual_values:
+            y = c_B·B⁻¹ (btran) с учётом направления оптимизации и умножения строк на -1.
+        """
+        if not self.feasible:
+            return None
+        extended = np.concatenate((self.cost, np.zeros(2 * self.m)))
+        y = self.btran(extended[self.head])
+        sign = np.where(np.array(self.model.rhs, dtype=np.float64) < 0, -1.0, 1.0)
+        if self.objective != 'min':
+            sign = -sign
+        return [float(value) for value in y * sign]
+
+    def tableau_index(self, k):
+        """Переводит номер столбца в нумерацию симплекс-таблицы класса Simplex."""
+        if k < self.n:
+            return int(k)
+        if k < self.n + self.m:
+            i = k - self.n
+            return self.n + int(np.count_nonzero(self.slack_sign[:i]))
+        i = k - self.n - self.m
+        return self.n + int(np.count_nonzero(self.slack_sign)) + int(np.count_nonzero(self.has_artificial[:i]))
@@ -1,42 +1,125 @@
 from fractions import Fraction
 from warnings import warn
+from Services.model import compile_model
+from Services.bounds import StandardForm
+from Services.pricing import PivotControl, IterationLimitError, TimeLimitError, CancelledError
+from Services.tableau import make_tableau
+from Services.trace import TextTrace
+
+
+class UnboundedError(ValueError):
+    """Целевая функция не ограничена на допустимом множестве."""
 
 
 class Simplex(object):
-    def __init__(self, count_vars, constraints, objective_fun, text, char):
+    def __init__(self, count_vars=None, constraints=None, objective_fun=None, text=None, char=None, backend="fraction", observer=None, model=None, pricing="dantzig", max_iterations=None, time_limit=None, control=None, basis=None):
         """
                 Инициализация класса Simplex.
                 count_vars: количество переменных.
                 constraints: список ограничений.
                 objective_fun: целевая функция (минимизация или максимизация).
+                model: заранее скомпилированная задача (Services.model.LinearModel);
+                       если задана, count_vars, constraints и objective_fun не нужны.
+                text, char: текстовый виджет и позиция вставки для вывода хода решения
+                            (необязательно, равносильно observer=TextTrace(text, char)).
+                backend: вычислительный бэкенд таблицы — "fraction" (точные дроби),
+                         "bareiss" (точно, целые числа с общим знаменателем — быстрее "fraction"
+                         при том же ответе и ходе решения) или "numpy" (float64 с допуском eps).
+                observer: наблюдатель за ходом решения (см. Services.trace.SimplexObserver).
+                          Если не задан, таблицы не форматируются и не выводятся.
+                pricing: правило выбора вводимого столбца — "dantzig" (как раньше, max/min
+                         элемент целевой строки), "bland", "devex" или "steepest-edge".
+                max_iterations, time_limit: ограничения на число шагов и время в секундах;
+                                            при превышении — IterationLimitError/TimeLimitError.
+                control: готовый Services.pricing.PivotControl вместо pricing/max_iterations/time_limit
+                         (по нему после ошибки можно узнать число шагов).
+                basis: начальный базис (например, basic_vars[1:] или SimplexResult.basis прошлого
+                       решения) — см. warm_start. Если он не подходит, решение идёт с первой фазы.
         """
-        self.coloumn_pivot = []
-        self.char = char
-        self.check_eq = True
-        self.hod_simplex = text
-        self.count_vars = count_vars
-        self.constraints = constraints
-        self.objective = objective_fun[0]
-        self.objective_fun = objective_fun[1]
-        self.coeff_matrix, self.r_rows, self.num_s_vars, self.num_r_vars = self.construct_matrix_from_constraints()
-        del self.constraints
-        self.basic_vars = [0 for i in range(len(self.coeff_matrix))]
-        self.phase1()
-        r_index = self.num_r_vars + self.num_s_vars
-
-        # for i in self.basic_vars:
-        #     if i > r_index:
-        #         raise ValueError("Решения не существует")
+        if observer is None and text is not None:
+            observer = TextTrace(text, char)
+        self.observer = observer
+        self.iterations = 0
+        if control is None:
+            control = PivotControl(pricing, max_iterations, time_limit)
+        self.control = control
+        if model is None:
+            model = compile_model(objective_fun, constraints, count_vars)
+        self.model = model
+        self.backend = backend
+        self.run(basis)
+
+    def run(self, basis=None):
+        """
+            Решает текущую задачу self.model: с базиса basis (warm_start) или, если он
+            не задан или не подходит, двухфазным симплекс-методом. В конце (в том числе
+            при исключении) наблюдатель получает on_finish.
+        """
+        try:
+            self.run_phases(basis)
+        finally:
+            if self.observer is not None:
+                self.observer.on_finish(self)
 
-        self.delete_r_vars()
+    def run_phases(self, basis=None):
+        """
+            Фазы решения для run (см. run).
 
-        if 'min' in self.objective.lower():
+            Границы переменных (LinearModel.lower/upper) переводятся в вид y >= 0
+            (Services.bounds.StandardForm); верхние границы учитываются в тесте отношений
+            (ограниченный симплекс-метод, см. find_bounded_key_row) и не добавляют строк в таблицу.
+        """
+        self.coloumn_pivot = []
+        self.check_eq = True
+        self.standard = StandardForm(self.model)
+        self.count_vars = self.standard.model.count_vars
+        self.upper = self.standard.upper
+        self.has_upper = self.standard.has_upper()
+        self.flipped = set()
+        self.leaving_to_upper = None
+        self.objective = self.model.sense
+        self.warm_started = False
+        self.dual_started = False
+        self.removed_rows = []
+        self.feasible = not self.standard.infeasible
+        coeff_matrix, self.r_rows, self.num_s_vars, self.num_r_vars, self.basic_vars = self.construct_matrix_from_constraints()
+        self.coeff_matrix = make_tableau(coeff_matrix, self.backend)
+        if basis is None and self.feasible and self.dual_start_possible():
+            # базис из дополнительных переменных двойственно допустим: первая фаза не нужна,
+            # warm_start построит его и запустит двойственный симплекс-метод
+            basis = list(range(self.count_vars, self.count_vars + self.num_s_vars))
+            self.dual_started = True
+        if basis is not None and self.feasible:
+            self.warm_started = self.warm_start(basis)
+            if not self.warm_started:
+                coeff_matrix, self.r_rows, self.num_s_vars, self.num_r_vars, self.basic_vars = self.construct_matrix_from_constraints()
+                self.coeff_matrix = make_tableau(coeff_matrix, self.backend)
+
+        if not self.warm_started and self.feasible:
+            self.phase1()
+            self.feasible = not self.coeff_matrix.is_positive(self.coeff_matrix.get(0, -1))
+            if self.feasible:
+                self.drive_out_r_vars()
+                self.delete_r_vars()
+
+        if not self.feasible:
+            # вторая фаза для несовместной задачи не имеет смысла: искусственные
+            # переменные остаются в базисе с ненулевыми значениями
+            self.solution = self.original_solution(self.basic_solution())
+            self.solution["val"] = None
+            self.optimize_val = None
+            return
+
+        if self.objective == 'min':
             self.solution = self.objective_minimize()
 
         else:
             self.solution = self.objective_maximize()
-        self.solution["val"] = self.coeff_matrix[0][-1]
-        self.optimize_val = self.coeff_matrix[0][-1]
+        self.solution = self.original_solution(self.solution)
+        self.optimize_val = self.coeff_matrix.get(0, -1)
+        if not self.standard.identity:
+            self.optimize_val = self.optimize_val + self.standard.offset
+        self.solution["val"] = self.optimize_val
 
     def construct_matrix_from_constraints(self):
         """
@@ -48,72 +131,77 @@ class Simplex(object):
             3. Инициализировать базисные переменные для начала симплексного метода.
 
             Аргументы:
-            - self.constraints: список ограничений, каждое из которых содержит строки вида "2_x1 + 3_x2 <= 5".
+            - self.standard.model: скомпилированная задача после замены переменных по границам
+              (ограничения в разреженном виде, знаки и правые части).
             - self.count_vars: количество исходных переменных задачи.
 
             Шаги:
-            1. Определить количество избыточных переменных (slack variables) и искусственных переменных (artificial variables).
-            2. Создать матрицу коэффициентов (начальная симплекс-таблица) с учётом всех переменных.
-            3. Для каждого ограничения обновить соответствующую строку матрицы, добавляя коэффициенты переменных и дополнительные переменные.
+            1. Ограничения с отрицательной правой частью умножаются на -1 (знак неравенства меняется).
+            2. Определить количество избыточных переменных (slack variables) и искусственных переменных (artificial variables).
+            3. Создать матрицу коэффициентов (начальная симплекс-таблица) с учётом всех переменных.
+            4. Для каждого ограничения заполнить соответствующую строку матрицы коэффициентами переменных и дополнительными переменными.
 
             Возвращает:
             - coeff_matrix: симплекс-таблица, готовая для использования в симплекс-методе.
             - r_rows: список строк, которые связаны с искусственными переменными.
             - num_s_vars: количество избыточных переменных.
             - num_r_vars: количество искусственных переменных.
+            - basic_vars: начальный базис — для строки "<=" её избыточная переменная,
+              для ">=" и "=" — искусственная (нулевой элемент соответствует целевой строке).
         """
+        model = self.standard.model
+        flip = {'<=': '>=', '>=': '<=', '=': '='}
+        senses = []
+        for i in range(model.num_constraints()):
+            if model.rhs[i] < 0:
+                senses.append(flip[model.senses[i]])
+            else:
+                senses.append(model.senses[i])
+
         num_s_vars = 0  # количество резервных и избыточных переменных
-        num_r_vars = 0  # количество дополнительных переменных, чтобы сбалансировать равенство и меньше, чем равно
-        for expression in self.constraints:
-            if '>=' in expression:
+        num_r_vars = 0  # количество искусственных переменных (для >= и =)
+        for sense in senses:
+            if sense != '=':
                 num_s_vars += 1
                 self.check_eq = False
-
-            elif '<=' in expression:
-                num_s_vars += 1
+            if sense != '<=':
                 num_r_vars += 1
-                self.check_eq = False
-
-            elif '=' in expression:
-               num_r_vars += 1
 
         total_vars = self.count_vars + num_s_vars + num_r_vars
 
-        coeff_matrix = [[Fraction("0/1") for i in range(total_vars+1)] for j in range(len(self.constraints)+1)]
+        coeff_matrix = [[Fraction("0/1") for i in range(total_vars+1)] for j in range(len(senses)+1)]
         s_index = self.count_vars
         r_index = self.count_vars + num_s_vars
         r_rows = [] # хранит ненулевой индекс r
-        for i in range(1, len(self.constraints)+1):
-            constraint = self.constraints[i-1].split(' ')
+        basic_vars = [0]
+        for i in range(1, len(senses)+1):
+            sign = -1 if model.rhs[i-1] < 0 else 1
             # построение начальной матрицы
-            for j in range(len(constraint)):
-
-                if '_' in constraint[j]:
-                    coeff, index = constraint[j].split('_')
-                    if constraint[j-1] is '-':
-                        coeff_matrix[i][int(index)-1] = Fraction("-" + coeff[:-1])
-                    else:
-                        coeff_matrix[i][int(index)-1] = Fraction(coeff[:-1])
+            for index, value in model.row(i-1):
+                coeff_matrix[i][index] = sign * value
 
-                elif constraint[j] == '<=':
-                    coeff_matrix[i][s_index] = Fraction("1/1")  # добавить избыточную переменную
-                    s_index += 1
+            if senses[i-1] == '<=':
+                coeff_matrix[i][s_index] = Fraction("1/1")  # добавить избыточную переменную
+                basic_vars.append(s_index)
+                s_index += 1
 
-                elif constraint[j] == '>=':
-                    coeff_matrix[i][s_index] = Fraction("-1/1")  # резервная переменная
-                    coeff_matrix[i][r_index] = Fraction("1/1")
-                    s_index += 1
-                    r_index += 1
-                    r_rows.append(i)
+            elif senses[i-1] == '>=':
+                coeff_matrix[i][s_index] = Fraction("-1/1")  # резервная переменная
+                coeff_matrix[i][r_index] = Fraction("1/1")
+                basic_vars.append(r_index)
+                s_index += 1
+                r_index += 1
+                r_rows.append(i)
 
-                elif constraint[j] == '=':
-                    coeff_matrix[i][r_index] = Fraction("1/1")
-                    r_index += 1
-                    r_rows.append(i)
+            else:
+                coeff_matrix[i][r_index] = Fraction("1/1")
+                basic_vars.append(r_index)
+                r_index += 1
+                r_rows.append(i)
 
-            coeff_matrix[i][-1] = Fraction(constraint[-1])
+            coeff_matrix[i][-1] = sign * model.rhs[i-1]
 
-        return coeff_matrix, r_rows, num_s_vars, num_r_vars
+        return coeff_matrix, r_rows, num_s_vars, num_r_vars, basic_vars
 
     def phase1(self):
         """
@@ -131,38 +219,36 @@ class Simplex(object):
         """
         # Целевая функция здесь минимизирует r1+ r2 + r3 + ... + rn
         r_index = self.count_vars + self.num_s_vars
-        for i in range(r_index, len(self.coeff_matrix[0])-1):
-            self.coeff_matrix[0][i] = Fraction("-1/1")
-        coeff_0 = 0
+        for i in range(r_index, self.coeff_matrix.width()-1):
+            self.coeff_matrix.set(0, i, Fraction("-1/1"))
         for i in self.r_rows:
-            self.coeff_matrix[0] = add_row(self.coeff_matrix[0], self.coeff_matrix[i])
-            self.basic_vars[i] = r_index
-            r_index += 1
-        s_index = self.count_vars
-        for i in range(1, len(self.basic_vars)):
-            if self.basic_vars[i] == 0:
-                self.basic_vars[i] = s_index
-                s_index += 1
+            self.coeff_matrix.add_multiple(0, i)
 
         # Запускает симплексные итерации
-        key_column = max_index(self.coeff_matrix[0])
-        condition = self.coeff_matrix[0][key_column] > 0
-        nl_char = '\n'
-        probel = ' '
-        while condition is True:
+        self.control.start_phase(self)
+        key_column = self.choose_key_column(1)
+        while key_column is not None:
             self.print_matrix(check=self.check_eq)
 
             key_row = self.find_key_row(key_column = key_column)
+            if key_row is None:
+                self.bound_flip(key_column)
+                key_column = self.choose_key_column(1)
+                continue
+            degenerate = self.before_pivot(key_row, key_column)
 
             self.basic_vars[key_row] = key_column
             self.coloumn_pivot.append(key_column)
-            pivot = self.coeff_matrix[key_row][key_column]
-            self.hod_simplex.insert(self.char, nl_char + f"Следующий опорный элемент строка/столбец({key_row},{key_column + 1}) {pivot}: {nl_char}")
+            pivot = self.coeff_matrix.get(key_row, key_column)
+            if self.observer is not None:
+                self.observer.on_pivot(self, key_row, key_column, pivot)
             self.normalize_to_pivot(key_row, pivot)
             self.make_key_column_zero(key_column, key_row)
+            self.complement_leaving()
+            self.iterations += 1
+            self.control.after_pivot(self, self.basic_vars[1:], degenerate)
 
-            key_column = max_index(self.coeff_matrix[0])
-            condition = self.coeff_matrix[0][key_column] > 0
+            key_column = self.choose_key_column(1)
 
 
         self.print_matrix(check=self.check_eq)
@@ -173,19 +259,134 @@ class Simplex(object):
                Возвращает индекс строки с минимальным отношением свободного члена
                к элементу ключевого столбца.
                key_column: индекс ключевого столбца.
+               При правиле Бленда из равных отношений выбирается переменная с наименьшим номером.
         """
-        min_val = float("inf")
-        min_i = 0
-        for i in range(1, len(self.coeff_matrix)):
-            if self.coeff_matrix[i][key_column] > 0:
-                val = self.coeff_matrix[i][-1] / self.coeff_matrix[i][key_column]
-                if val <  min_val:
-                    min_val = val
-                    min_i = i
-        if min_val == float("inf"):
-            raise ValueError("Решение неограниченно")
+        labels = self.basic_vars if self.control.anti_cycling() else None
+        if self.has_upper:
+            return self.find_bounded_key_row(key_column, labels)
+        min_i = self.coeff_matrix.find_key_row(key_column, labels)
+        if min_i is None:
+            raise UnboundedError("Решение неограниченно")
         return min_i
 
+    def column_upper(self, column):
+        """Верхняя граница переменной столбца column (None — нет; у дополнительных переменных нет)."""
+        return self.upper[column] if column < self.count_vars else None
+
+    def find_bounded_key_row(self, key_column, labels=None):
+        """
+            Тест отношений ограниченного симплекс-метода.
+
+            Вводимая переменная растёт от нуля, пока одно из условий не станет активным:
+            - базисная переменная строки с положительным элементом столбца уменьшается до нуля
+              (обычное отношение свободный член / элемент);
+            - базисная переменная с верхней границей U в строке с отрицательным элементом
+              растёт до U: отношение (U - свободный член) / |элемент|; после шага она выходит
+              из базиса на верхней границе (self.leaving_to_upper, см. complement_leaving);
+            - сама вводимая переменная достигает своей верхней границы.
+
+            Возвращает:
+            Индекс ключевой строки или None, если первой достигается граница вводимой
+            переменной (смена границы без замены базиса, см. bound_flip).
+            Если ничто не ограничивает рост — UnboundedError.
+        """
+        table = self.coeff_matrix
+        best = self.column_upper(key_column)
+        key_row = None
+        to_upper = False
+        for i in range(1, len(table)):
+            value = table.get(i, key_column)
+            upper = self.column_upper(self.basic_vars[i])
+            if table.is_positive(value):
+                ratio, leaves_upper = table.get(i, -1) / value, False
+            elif upper is not None and table.is_negative(value):
+                ratio, leaves_upper = (upper - table.get(i, -1)) / -value, True
+            else:
+                continue
+            if best is None or ratio < best or (key_row is not None and ratio == best and labels is not None and labels[i] < labels[key_row]):
+                best, key_row, to_upper = ratio, i, leaves_upper
+        if best is None:
+            raise UnboundedError("Решение неограниченно")
+        self.leaving_to_upper = self.basic_vars[key_row] if key_row is not None and to_upper else None
+        return key_row
+
+    def complement(self, column):
+        """Заменяет переменную столбца column на U - x (U — её верхняя граница), см. complement_column."""
+        self.coeff_matrix.complement_column(column, self.upper[column])
+        self.flipped ^= {column}
+
+    def bound_flip(self, key_column):
+        """
+            Шаг без замены базиса: вводимая переменная переходит на противоположную
+            границу (заменяется на U - x и снова равна нулю как небазисная).
+        """
+        self.complement(key_column)
+        self.iterations += 1
+        self.control.after_pivot(self, self.basic_vars[1:], False)
+
+    def complement_leaving(self):
+        """После шага переводит вышедшую на верхнюю границу переменную в вид U - x."""
+        if self.leaving_to_upper is not None:
+            self.complement(self.leaving_to_upper)
+            self.leaving_to_upper = None
+
+    def original_solution(self, solution):
+        """
+            Переводит значения столбцов таблицы в исходные переменные задачи:
+            для заменённых на U - x столбцов значение восстанавливается, затем
+            применяется обратная замена StandardForm.recover.
+        """
+        for column in self.flipped:
+            name = 'x_' + str(column + 1)
+            solution[name] = self.upper[column] - solution[name]
+        return self.standard.recover(solution)
+
+    def choose_key_column(self, direction):
+        """
+            Выбор ключевого столбца текущим правилом (см. Services.pricing).
+
+            Аргументы:
+            - direction: 1 — улучшают положительные элементы целевой строки (первая фаза
+                         и минимизация), -1 — отрицательные (максимизация).
+
+            Возвращает:
+            Индекс ключевого столбца или None, если таблица оптимальна.
+        """
+        return self.control.select(self, self.coeff_matrix.objective_scores(direction))
+
+    def before_pivot(self, key_row, key_column):
+        """
+            Сообщает правилу выбора о предстоящем шаге (до изменения таблицы и базиса).
+
+            Возвращает:
+            True, если шаг вырожденный (свободный член ключевой строки равен нулю).
+        """
+        self.control.before_pivot(self, key_row, key_column)
+        return not self.coeff_matrix.is_positive(self.coeff_matrix.get(key_row, -1))
+
+    # Интерфейс для правил выбора столбца (Services.pricing)
+    @property
+    def eps(self):
+        return getattr(self.coeff_matrix, "eps", 0)
+
+    def is_improving(self, value):
+        return self.coeff_matrix.is_positive(value)
+
+    def pricing_width(self):
+        return self.coeff_matrix.width() - 1
+
+    def pivot_row(self, key_row):
+        return self.coeff_matrix.row(key_row)[:-1]
+
+    def leaving_column(self, key_row):
+        return self.basic_vars[key_row]
+
+    def column_norms(self):
+        return self.coeff_matrix.column_norms()
+
+    def column_norms_available(self):
+        return True
+
     def normalize_to_pivot(self, key_row, pivot):
         """
                 Нормализация строки к опорному элементу (pivot).
@@ -193,8 +394,7 @@ class Simplex(object):
                 key_row: индекс строки с опорным элементом.
                 pivot: значение опорного элемента.
         """
-        for i in range(len(self.coeff_matrix[0])):
-            self.coeff_matrix[key_row][i] /= pivot
+        self.coeff_matrix.normalize_to_pivot(key_row, pivot)
 
     def make_key_column_zero(self, key_column, key_row):
         """
@@ -203,12 +403,45 @@ class Simplex(object):
                key_column: индекс ключевого столбца.
                key_row: индекс строки с опорным элементом.
         """
-        num_columns = len(self.coeff_matrix[0])
-        for i in range(len(self.coeff_matrix)):
-            if i != key_row:
-                factor = self.coeff_matrix[i][key_column]
-                for j in range(num_columns):
-                    self.coeff_matrix[i][j] -= self.coeff_matrix[key_row][j] * factor
+        self.coeff_matrix.make_key_column_zero(key_column, key_row)
+
+    def drive_out_r_vars(self):
+        """
+            Выводит из базиса искусственные переменные, оставшиеся в нём на нулевом уровне
+            после первой фазы (вырожденный случай), чтобы их столбцы можно было удалить.
+
+            Для каждой такой строки выполняется шаг по первому ненулевому элементу среди
+            исходных и дополнительных переменных. Если таких элементов нет, ограничение
+            линейно зависимо от остальных и строка удаляется.
+        """
+        non_r_length = self.count_vars + self.num_s_vars
+        for key_row in range(len(self.basic_vars) - 1, 0, -1):
+            if self.basic_vars[key_row] < non_r_length:
+                continue
+            key_column = None
+            for j in range(non_r_length):
+                if j not in self.basic_vars[1:] and self.coeff_matrix.is_positive(abs(self.coeff_matrix.get(key_row, j))):
+                    key_column = j
+                    break
+            if key_column is None:
+                self.coeff_matrix.delete_row(key_row)
+                del self.basic_vars[key_row]
+                self.removed_rows.append(key_row - 1)
+                continue
+            self.basic_vars[key_row] = key_column
+            self.normalize_to_pivot(key_row, self.coeff_matrix.get(key_row, key_column))
+            self.make_key_column_zero(key_column, key_row)
+            self.iterations += 1
+
+    def basic_solution(self):
+        """Значения исходных переменных в текущем базисе (небазисные равны нулю)."""
+        solution = {}
+        for i in range(0, self.count_vars):
+            solution['x_'+str(i+1)] = self.coeff_matrix.zero()
+        for i, var in enumerate(self.basic_vars[1:]):
+            if var < self.count_vars:
+                solution['x_'+str(var+1)] = self.coeff_matrix.get(i+1, -1)
+        return solution
 
     def delete_r_vars(self):
         """
@@ -230,27 +463,211 @@ class Simplex(object):
         - self.count_vars: количество исходных переменных задачи.
         - self.num_s_vars: количество дополнительных переменных (например, для приведения неравенств к равенствам).
         """
-        for i in range(len(self.coeff_matrix)):
-            non_r_length = self.count_vars + self.num_s_vars + 1
-            length = len(self.coeff_matrix[i])
-            while length != non_r_length:
-                del self.coeff_matrix[i][non_r_length-1]
-                length -= 1
+        non_r_length = self.count_vars + self.num_s_vars + 1
+        if self.coeff_matrix.width() != non_r_length:
+            self.coeff_matrix.truncate_columns(non_r_length)
 
     def update_objective_fun(self):
         """
-               Обновляет целевую функцию для соответствия текущему базису. Добавляет новые переменные,
-               которые вошли в базис, и обновляет коэффициенты в целевой строке.
+               Записывает в целевую строку коэффициенты целевой функции второй фазы.
+               Остатки первой фазы (в столбцах дополнительных переменных и свободном члене)
+               обнуляются, после чего целевая строка выражается через текущий базис
+               в objective_minimize/objective_maximize.
+        """
+        objective = self.standard.model.objective
+        for j in range(self.coeff_matrix.width()):
+            if j in self.flipped:
+                self.coeff_matrix.set(0, j, objective[j])
+            elif j < self.count_vars:
+                self.coeff_matrix.set(0, j, -objective[j])
+            else:
+                self.coeff_matrix.set(0, j, Fraction("0/1"))
+        if self.flipped:
+            # c·x = c·U - c·x' для переменных на верхней границе
+            self.coeff_matrix.set(0, -1, sum(objective[j] * self.upper[j] for j in self.flipped))
+
+
+    def price_out_objective(self):
+        """
+            Записывает целевую строку второй фазы (update_objective_fun) и выражает её
+            через текущие базисные переменные.
         """
-        objective_fun_coeffs = self.objective_fun.split()
-        for i in range(len(objective_fun_coeffs)):
-            if '_' in objective_fun_coeffs[i]:
-                coeff, index = objective_fun_coeffs[i].split('_')
-                if objective_fun_coeffs[i-1] is '-':
-                    self.coeff_matrix[0][int(index)-1] = Fraction(coeff[:-1] + "/1")
-                else:
-                    self.coeff_matrix[0][int(index)-1] = Fraction("-" +coeff[:-1] + "/1")
+        self.update_objective_fun()
+        for row, column in enumerate(self.basic_vars[1:]):
+            factor = self.coeff_matrix.get(0, column)
+            if factor != 0:
+                self.coeff_matrix.add_multiple(0, row+1, -factor)
+
+    def dual_start_possible(self):
+        """
+            Можно ли начать с базиса из дополнительных переменных двойственным симплекс-методом
+            вместо первой фазы (типично для задач о покрытии и о диете: все ограничения ">=",
+            коэффициенты целевой функции при минимизации неотрицательны).
+
+            Условия:
+            1. Все ограничения — неравенства (у каждой строки есть дополнительная переменная).
+            2. Хотя бы одна строка требует искусственной переменной — иначе этот базис и так
+               допустим и работает обычный прямой симплекс-метод.
+            3. Базис двойственно допустим: при минимизации все коэффициенты целевой функции
+               неотрицательны, при максимизации — неположительны.
+            4. Нет верхних границ переменных (двойственный тест отношений их не учитывает).
+        """
+        if self.has_upper or self.num_r_vars == 0 or self.num_s_vars != len(self.basic_vars) - 1:
+            return False
+        sign = 1 if self.objective == 'min' else -1
+        return all(sign * value >= 0 for value in self.standard.model.objective)
+
+    def warm_start(self, basis):
+        """
+            Строит таблицу второй фазы сразу для заданного базиса, минуя первую фазу.
+
+            Аргументы:
+            - basis: номера базисных столбцов (исходные и дополнительные переменные,
+              как в basic_vars[1:]). Лишние, повторяющиеся и линейно зависимые столбцы
+              пропускаются, недостающие строки дополняются первым подходящим столбцом.
+
+            Шаги:
+            1. Искусственные столбцы удаляются, базисные столбцы вводятся шагами Жордана–Гаусса.
+            2. Если базис допустим (все свободные члены неотрицательны), дальше работает
+               обычная вторая фаза (прямой симплекс-метод) — например, после изменения целевой функции.
+            3. Если базис не допустим, но оптимален по целевой строке (двойственно допустим) —
+               например, после изменения правой части или добавления ограничения, —
+               выполняется двойственный симплекс-метод (dual_simplex).
+
+            Возвращает:
+            True, если решение продолжено с этого базиса; False, если базис не подошёл
+            (вырожденная матрица или базис ни прямо, ни двойственно не допустим) и
+            задачу нужно решать с первой фазы.
+        """
+        if self.has_upper:
+            # тест отношений двойственного симплекс-метода верхние границы не учитывает
+            return False
+        self.delete_r_vars()
+        width = self.coeff_matrix.width() - 1
+        used = set()
+        free_rows = list(range(1, len(self.coeff_matrix)))
+        for column in list(basis) + list(range(self.count_vars, width)) + list(range(self.count_vars)):
+            if not free_rows:
+                break
+            if column in used or not 0 <= column < width:
+                continue
+            key_row = None
+            for i in free_rows:
+                value = abs(self.coeff_matrix.get(i, column))
+                if self.coeff_matrix.is_positive(value) and (key_row is None or value > best):
+                    key_row, best = i, value
+            if key_row is None:
+                continue
+            free_rows.remove(key_row)
+            used.add(column)
+            self.basic_vars[key_row] = column
+            self.normalize_to_pivot(key_row, self.coeff_matrix.get(key_row, column))
+            self.make_key_column_zero(column, key_row)
+        if free_rows:
+            return False
+
+        self.price_out_objective()
+        direction = 1 if self.objective == 'min' else -1
+        scores = self.coeff_matrix.objective_scores(direction)
+        dual_feasible = not any(self.coeff_matrix.is_positive(value) for value in scores)
+        primal_feasible = self.coeff_matrix.find_dual_key_row() is None
+        if not primal_feasible and not dual_feasible:
+            return False
+        self.feasible = True
+        if not primal_feasible:
+            self.dual_simplex()
+        return True
+
+    def dual_simplex(self):
+        """
+            Двойственный симплекс-метод: таблица оптимальна по целевой строке, но часть
+            свободных членов отрицательна.
+
+            Шаги:
+            1. Ключевая строка — строка с наименьшим (отрицательным) свободным членом.
+            2. Ключевой столбец — среди отрицательных элементов строки тот, у которого
+               отношение |элемент целевой строки| / |элемент строки| минимально:
+               так целевая строка остаётся оптимальной.
+            3. Если отрицательных элементов в ключевой строке нет, задача несовместна
+               (self.feasible = False).
+        """
+        self.control.start_phase(self)
+        key_row = self.coeff_matrix.find_dual_key_row()
+        while key_row is not None:
+            self.print_matrix(check=False)
+            key_column = self.coeff_matrix.find_dual_key_column(key_row)
+            if key_column is None:
+                self.feasible = False
+                return
+            self.control.check_limits()
+            degenerate = not self.coeff_matrix.is_positive(abs(self.coeff_matrix.get(0, key_column)))
+            self.basic_vars[key_row] = key_column
+            pivot = self.coeff_matrix.get(key_row, key_column)
+            if self.observer is not None:
+                self.observer.on_pivot(self, key_row, key_column, pivot)
+            self.normalize_to_pivot(key_row, pivot)
+            self.make_key_column_zero(key_column, key_row)
+            self.iterations += 1
+            self.control.after_pivot(self, self.basic_vars[1:], degenerate)
+            key_row = self.coeff_matrix.find_dual_key_row()
 
+    def reoptimize(self, basis=None):
+        """
+            Решает изменённую задачу заново, начиная с базиса basis
+            (по умолчанию — с текущего, см. warm_start). Счётчики шагов и ограничения
+            по времени отсчитываются заново.
+        """
+        if basis is None:
+            basis = self.basic_vars[1:]
+        control = self.control
+        self.control = PivotControl(control.pricing, control.max_iterations, control.time_limit)
+        self.iterations = 0
+        self.run(basis)
+
+    def change_rhs(self, i, value):
+        """
+            Заменяет правую часть ограничения i (нумерация с нуля) и решает задачу заново
+            с текущего базиса (обычно двойственным симплекс-методом).
+        """
+        self.model.set_rhs(i, value)
+        self.reoptimize()
+
+    def change_objective(self, index, value):
+        """
+            Заменяет коэффициент целевой функции при x_(index+1) и решает задачу заново
+            с текущего базиса (прямым симплекс-методом).
+        """
+        self.model.set_objective(index, value)
+        self.reoptimize()
+
+    def add_constraint(self, coeffs, sense, rhs):
+        """
+            Добавляет ограничение (например, отсекающую плоскость) и решает задачу заново:
+            дополнительная переменная нового ограничения входит в базис, затем
+            работает двойственный симплекс-метод.
+
+            Аргументы:
+            - coeffs: словарь {индекс переменной с нуля: коэффициент}.
+            - sense: "<=", ">=" или "=".
+            - rhs: правая часть.
+        """
+        count_vars, num_s_vars = self.count_vars, self.num_s_vars
+        model_vars = self.model.count_vars
+        self.model.add_constraint(coeffs, sense, rhs)
+        shift = self.model.count_vars - model_vars
+        basis = [column if column < count_vars else column + shift for column in self.basic_vars[1:]]
+        if sense != '=':
+            basis.append(count_vars + shift + num_s_vars)
+        self.reoptimize(basis)
+
+    def remove_constraint(self, i):
+        """Удаляет ограничение i (нумерация с нуля) и решает задачу заново с текущего базиса."""
+        basis = self.basic_vars[1:]
+        if self.model.senses[i] != '=':
+            slack = self.count_vars + sum(1 for sense in self.model.senses[:i] if sense != '=')
+            basis = [column if column < slack else column - 1 for column in basis if column != slack]
+        self.model.remove_constraint(i)
+        self.reoptimize(basis)
 
     def objective_minimize(self):
 
@@ -258,39 +675,42 @@ class Simplex(object):
                 Функция для минимизации целевой функции. Аналогична objective_maximize, но
                 используется для задач минимизации.
         """
-        self.update_objective_fun()
+        if self.observer is not None:
+            self.observer.on_phase(self, 2)
+        self.price_out_objective()
 
-        self.hod_simplex.insert(self.char,"*****************\n")
-        for row, column in enumerate(self.basic_vars[1:]):
-            if self.coeff_matrix[0][column] != 0:
-                self.coeff_matrix[0] = add_row(self.coeff_matrix[0], multiply_const_row(-self.coeff_matrix[0][column], self.coeff_matrix[row+1]))
+        self.control.start_phase(self)
+        key_column = self.choose_key_column(1)
 
-        key_column = max_index(self.coeff_matrix[0])
-        condition = self.coeff_matrix[0][key_column] > 0
-
-        while condition is True:
+        while key_column is not None:
             self.print_matrix(check=False)
             key_row = self.find_key_row(key_column = key_column)
+            if key_row is None:
+                self.bound_flip(key_column)
+                key_column = self.choose_key_column(1)
+                continue
+            degenerate = self.before_pivot(key_row, key_column)
             self.basic_vars[key_row] = key_column
-            pivot = self.coeff_matrix[key_row][key_column]
-            nl_char = '\n'
-            probel = ' '
-            self.hod_simplex.insert(self.char, nl_char + f"Следующий опорный элемент строка/столбец({key_row },{key_column + 1}) {pivot}: {nl_char}")
+            pivot = self.coeff_matrix.get(key_row, key_column)
+            if self.observer is not None:
+                self.observer.on_pivot(self, key_row, key_column, pivot)
             self.normalize_to_pivot(key_row, pivot)
             self.make_key_column_zero(key_column, key_row)
+            self.complement_leaving()
+            self.iterations += 1
+            self.control.after_pivot(self, self.basic_vars[1:], degenerate)
 
-            key_column = max_index(self.coeff_matrix[0])
-            condition = self.coeff_matrix[0][key_column] > 0
+            key_column = self.choose_key_column(1)
 
         self.print_matrix(check=False)
         solution = {}
         for i, var in enumerate(self.basic_vars[1:]):
             if var < self.count_vars:
-                solution['x_'+str(var+1)] = self.coeff_matrix[i+1][-1]
+                solution['x_'+str(var+1)] = self.coeff_matrix.get(i+1, -1)
 
         for i in range(0, self.count_vars):
             if i not in self.basic_vars[1:]:
-                solution['x_'+str(i+1)] = Fraction("0/1")
+                solution['x_'+str(i+1)] = self.coeff_matrix.zero()
     
         return solution
 
@@ -310,38 +730,94 @@ class Simplex(object):
             Возвращает:
             Словарь с оптимальными значениями переменных.
         """
-        self.update_objective_fun()
+        self.price_out_objective()
 
-        for row, column in enumerate(self.basic_vars[1:]):
-            if self.coeff_matrix[0][column] != 0:
-                self.coeff_matrix[0] = add_row(self.coeff_matrix[0], multiply_const_row(-self.coeff_matrix[0][column], self.coeff_matrix[row+1]))
-
-        key_column = min_index(self.coeff_matrix[0])
+        self.control.start_phase(self)
         self.print_matrix()
-        condition = self.coeff_matrix[0][key_column] < 0
+        key_column = self.choose_key_column(-1)
 
-        while condition is True:
+        while key_column is not None:
 
             key_row = self.find_key_row(key_column = key_column)
+            if key_row is None:
+                self.bound_flip(key_column)
+                key_column = self.choose_key_column(-1)
+                continue
+            degenerate = self.before_pivot(key_row, key_column)
             self.basic_vars[key_row] = key_column
-            pivot = self.coeff_matrix[key_row][key_column]
+            pivot = self.coeff_matrix.get(key_row, key_column)
             self.normalize_to_pivot(key_row, pivot)
             self.make_key_column_zero(key_column, key_row)
+            self.complement_leaving()
+            self.iterations += 1
+            self.control.after_pivot(self, self.basic_vars[1:], degenerate)
 
-            key_column = min_index(self.coeff_matrix[0])
-            condition = self.coeff_matrix[0][key_column] < 0
+            key_column = self.choose_key_column(-1)
 
         solution = {}
         for i, var in enumerate(self.basic_vars[1:]):
             if var < self.count_vars:
-                solution['x_'+str(var+1)] = self.coeff_matrix[i+1][-1]
+                solution['x_'+str(var+1)] = self.coeff_matrix.get(i+1, -1)
 
         for i in range(0, self.count_vars):
             if i not in self.basic_vars[1:]:
-                solution['x_'+str(i+1)] = Fraction("0/1")
+                solution['x_'+str(i+1)] = self.coeff_matrix.zero()
 
         return solution
     
+    def dual_values(self):
+        """
+            Двойственные оценки (теневые цены) ограничений: на сколько изменится оптимальное
+            значение целевой функции при увеличении правой части ограничения на единицу
+            (пока текущий базис остаётся оптимальным).
+
+            Шаги:
+            1. Для неравенства оценка читается из целевой строки в столбце его дополнительной
+               переменной (с учётом знака этой переменной и умножения строки на -1 при
+               отрицательной правой части).
+            2. Для равенств дополнительной переменной нет: их оценки находятся из условия,
+               что у базисных столбцов целевая строка равна нулю (solve_consistent).
+            3. Строкам, удалённым как линейно зависимые, соответствует оценка 0.
+
+            Возвращает:
+            Список оценок по ограничениям задачи (в порядке model) или None, если задача не решена.
+        """
+        if not self.feasible or self.optimize_val is None:
+            return None
+        model = self.standard.model
+        table = self.coeff_matrix
+        m = model.num_constraints()
+        row_sign = [-1 if model.rhs[i] < 0 else 1 for i in range(m)]
+        duals = [table.zero()] * m
+        equalities = []
+        s_index = self.count_vars
+        for i in range(m):
+            if model.senses[i] == '=':
+                if i not in self.removed_rows:
+                    equalities.append(i)
+                continue
+            # знак дополнительной переменной в строке таблицы: +1 для "<=", -1 для ">="
+            slack_sign = 1 if (model.senses[i] == '<=') == (row_sign[i] > 0) else -1
+            duals[i] = table.get(0, s_index) / slack_sign
+            s_index += 1
+
+        if equalities:
+            position = {i: k for k, i in enumerate(equalities)}
+            columns = [[table.zero()] * len(equalities) for j in range(self.count_vars)]
+            rhs = [value if j not in self.flipped else -value for j, value in enumerate(model.objective)]
+            for i in range(m):
+                for j, value in model.row(i):
+                    value = row_sign[i] * (value if j not in self.flipped else -value)
+                    if i in position:
+                        columns[j][position[i]] = value
+                    else:
+                        rhs[j] = rhs[j] - duals[i] * value
+            basic = [j for j in self.basic_vars[1:] if j < self.count_vars]
+            nonzero = lambda value: table.is_positive(abs(value))
+            for i, value in zip(equalities, solve_consistent([columns[j] for j in basic], [rhs[j] for j in basic], nonzero)):
+                duals[i] = value
+        return [value * sign for value, sign in zip(duals, row_sign)]
+
     def print_matrix(self,check = True):
         """
             Выводит текущую симплекс-таблицу.
@@ -351,87 +827,189 @@ class Simplex(object):
                    Если False, то таблица выводится в "сыром" виде.
 
             Эта функция отображает таблицу с учетом базисных переменных и опорных элементов,
-            форматируя ее для более удобного восприятия. Вывод также может быть использован для интерфейса программы.
-        """
-        nl_char = '\n'
-        probel = ' '
-        if check :
-            for row in self.coeff_matrix:
-                if row == self.coeff_matrix[0]:
-                    last = f"{''.join([str( -1 * row[coloumni]) + probel if coloumni not in self.coloumn_pivot and coloumni + 1 <= self.count_vars or coloumni == len(row)- 1  else '' for coloumni in range(0,len(row))])} {nl_char}"
-                else:     
-                    self.hod_simplex.insert(self.char, f"{''.join([str(row[coloumni]) + probel if coloumni not in self.coloumn_pivot and coloumni + 1 <= self.count_vars or coloumni == len(row)- 1 else ''  for coloumni in range(0,len(row))])} {nl_char}") 
-        else:
-            for row in self.coeff_matrix:
-                if row == self.coeff_matrix[0]:
-                    last = f"{''.join([str(coloumn) + probel for coloumn in row])} {nl_char}"
-                else:    
-                    self.hod_simplex.insert(self.char, f"{''.join([str(coloumn) + probel for coloumn in row])} {nl_char}") 
-        self.hod_simplex.insert(self.char,last)
-
-def add_row(row1, row2):
-    """
-        Складывает два вектора (строки симплекс-таблицы) элемент за элементом.
+            форматируя ее для более удобного восприятия. Таблица передаётся наблюдателю (observer);
+            если наблюдателя нет, ничего не форматируется.
+        """
+        if self.observer is not None:
+            self.observer.on_tableau(self, check)
 
-        Аргументы:
-        row1: первая строка.
-        row2: вторая строка.
 
-        Возвращает:
-        Новый вектор, где каждый элемент является суммой соответствующих элементов row1 и row2.
+def solve_consistent(rows, rhs, nonzero):
     """
-    row_sum = [0 for i in range(len(row1))]
-    for i in range(len(row1)):
-        row_sum[i] = row1[i] + row2[i]
-    return row_sum
-
-def max_index(row):
-    """
-        Находит индекс максимального элемента в строке.
+        Находит одно решение совместной системы rows·w = rhs методом Жордана–Гаусса
+        (свободные неизвестные равны нулю, лишние уравнения пропускаются).
 
         Аргументы:
-        row: строка, в которой ищется максимальное значение.
+        - rows: матрица системы (список строк).
+        - rhs: правые части.
+        - nonzero: проверка ненулевого элемента в арифметике таблицы.
 
         Возвращает:
-        Индекс максимального элемента в строке.
+        Список значений неизвестных.
     """
-    max_i = 0
-    for i in range(0, len(row)-1):
-        if row[i] > row[max_i]:
-            max_i = i
+    count = len(rows[0]) if rows else 0
+    rows = [list(row) + [value] for row, value in zip(rows, rhs)]
+    pivots = []
+    for column in range(count):
+        top = len(pivots)
+        candidates = [i for i in range(top, len(rows)) if nonzero(rows[i][column])]
+        if not candidates:
+            continue
+        best = max(candidates, key=lambda i: abs(rows[i][column]))
+        rows[top], rows[best] = rows[best], rows[top]
+        pivot = rows[top][column]
+        rows[top] = [value / pivot for value in rows[top]]
+        for i in range(len(rows)):
+            factor = rows[i][column]
+            if i != top and nonzero(factor):
+                rows[i] = [a - factor * b for a, b in zip(rows[i], rows[top])]
+        pivots.append(column)
+    solution = [0] * count
+    for i, column in enumerate(pivots):
+        solution[column] = rows[i][-1]
+    return solution
+
+
+class SimplexResult(object):
+    def __init__(self, status, solution=None, objective=None, basis=None, iterations=0, message=None, pivots=None, cycling_detected=False, duals=None):
+        """
+            Результат решения задачи линейного программирования без привязки к интерфейсу.
+
+            Атрибуты:
+            - status: "optimal", "unbounded", "infeasible", "iteration_limit", "time_limit" или "cancelled".
+            - solution: словарь значений переменных вида {"x_1": ..., "x_2": ...} (без "val").
+            - objective: значение целевой функции (как Simplex.optimize_val).
+            - basis: индексы базисных столбцов по строкам ограничений.
+            - iterations: количество выполненных шагов симплекс-метода.
+            - message: текст ошибки, если решение не найдено.
+            - pivots: количество шагов по каждому использованному правилу выбора столбца.
+            - cycling_detected: повторялся ли базис (тогда включалось правило Бленда).
+            - duals: двойственные оценки (теневые цены) ограничений в порядке задачи — изменение
+              objective при увеличении правой части ограничения на единицу; None, если не известны.
+        """
+        self.status = status
+        self.solution = solution
+        self.objective = objective
+        self.basis = basis
+        self.iterations = iterations
+        self.message = message
+        self.pivots = pivots if pivots is not None else {}
+        self.cycling_detected = cycling_detected
+        self.duals = duals
+
+    def __repr__(self):
+        return f"SimplexResult(status={self.status!r}, objective={self.objective!r}, solution={self.solution!r}, iterations={self.iterations})"
 
-    return max_i
 
-def multiply_const_row(const, row):
+def solve(count_vars=None, constraints=None, objective_fun=None, backend="fraction", observer=None, model=None, method="tableau", pricing="dantzig", max_iterations=None, time_limit=None, basis=None, control=None, cache=None, presolve=False):
     """
-        Умножает все элементы строки на заданную константу.
+        Решает задачу симплекс-методом без графического интерфейса.
 
         Аргументы:
-        const: константа, на которую умножается строка.
-        row: строка для умножения.
+        - count_vars: количество переменных.
+        - constraints: список ограничений вида "2x_1 + 3x_2 <= 5".
+        - objective_fun: кортеж ("min" или "max", строка целевой функции).
+        - backend: "fraction", "bareiss" или "numpy".
+        - observer: необязательный наблюдатель за ходом решения (по умолчанию ход не выводится).
+        - model: скомпилированная задача (Services.model.LinearModel) вместо строк.
+        - method: "tableau" — симплекс-таблица (класс Simplex, бэкенд backend);
+                  "revised" — модифицированный симплекс-метод на разреженной матрице
+                  (Services.revised.RevisedSimplex, backend не используется);
+                  "interior" — метод внутренней точки с кроссовером в вершину
+                  (Services.interior.InteriorPoint, для больших задач; backend не используется).
+        - pricing: правило выбора вводимого столбца: "dantzig", "bland", "devex", "steepest-edge".
+        - max_iterations, time_limit: ограничения на число шагов и время решения в секундах.
+        - basis: начальный базис (SimplexResult.basis прошлого решения) для method="tableau";
+          для изменённой задачи решение продолжается с него (см. Simplex.warm_start).
+        - control: готовый Services.pricing.PivotControl вместо pricing/max_iterations/time_limit;
+          через него решение можно отменить из другого потока (control.cancel()).
+        - cache: Services.cache.SolveCache; совпадающая задача (с точностью до порядка,
+          масштаба и знака ограничений) берётся из кэша без решения. С наблюдателем
+          кэш используется, только если это Services.trace.TraceRenderer (его текст сохраняется).
+        - model.lower/model.upper: границы переменных; методом "tableau" верхние границы
+          учитываются без добавления строк (ограниченный симплекс-метод), методами "revised"
+          и "interior" —
+          строками y <= U после замены переменных (basis тогда None).
+        - presolve: упростить задачу перед решением (Services.presolve.Presolve). Решение и
+          значение целевой функции возвращаются в исходных переменных; базис (и ход
+          решения у наблюдателя) относятся к упрощённой задаче, поэтому basis = None
+          и duals = None (оценки удалённых строк не восстанавливаются).
 
         Возвращает:
-        Новый вектор, где каждый элемент строки умножен на константу.
+        SimplexResult. Неограниченность, несовместность и превышение ограничений не вызывают
+        исключений, а попадают в status/message; ошибки разбора ограничений пробрасываются как ValueError.
     """
-    mul_row = []
-    for i in row:
-        mul_row.append(const*i)
-    return mul_row
-
-def min_index(row):
-    """
-       Находит индекс минимального элемента в строке.
-
-       Аргументы:
-       row: строка, в которой ищется минимальное значение.
-
-       Возвращает:
-       Индекс минимального элемента в строке.
-    """
-    min_i = 0
-    for i in range(0, len(row)):
-        if row[min_i] > row[i]:
-            min_i = i
-
-    return min_i
-
+    if model is None:
+        model = compile_model(objective_fun, constraints, count_vars)
+    if control is None:
+        control = PivotControl(pricing, max_iterations, time_limit)
+    if presolve:
+        from Services.presolve import Presolve
+        reduced = Presolve(model)
+        if reduced.status == "infeasible":
+            return SimplexResult("infeasible", message=f"Решения не существует: {reduced.message}", **control.summary())
+        if reduced.model.num_constraints() == 0:
+            if reduced.columns:
+                # оставлены только переменные без ограничений с неограниченной выгодной границей
+                return SimplexResult("unbounded", message="Решение неограниченно", **control.summary())
+            solution, objective = reduced.postsolve({}, Fraction(0))
+            return SimplexResult("optimal", solution, objective, **control.summary())
+        result = solve(backend=backend, observer=observer, model=reduced.model, method=method, control=control, cache=cache)
+        solution, objective = result.solution, result.objective
+        if result.status == "optimal":
+            solution, objective = reduced.postsolve(solution, objective)
+        # новый объект: result может быть записью кэша упрощённой задачи
+        return SimplexResult(result.status, solution, objective, iterations=result.iterations, message=result.message,
+                             pivots=result.pivots, cycling_detected=result.cycling_detected)
+    if cache is not None and (observer is None or hasattr(observer, "settings")):
+        from Services.cache import fingerprint
+        key, source = fingerprint(model, (method, backend if method == "tableau" else None, control.pricing.name))
+        result = cache.get(key, source, observer)
+        if result is not None:
+            return result
+        if observer is not None:
+            observer.record = []
+        result = solve(backend=backend, observer=observer, model=model, method=method, basis=basis, control=control)
+        cache.put(key, source, result, observer)
+        if observer is not None:
+            observer.record = None
+        return result
+    standard = None
+    if method in ("revised", "interior") and not model.has_default_bounds():
+        # у этих методов нет ограниченного теста отношений: верхние границы — строками
+        standard = StandardForm(model)
+        if standard.infeasible:
+            return SimplexResult("infeasible", message="Решения не существует: нижняя граница больше верхней", **control.summary())
+    try:
+        if method == "revised":
+            from Services.revised import RevisedSimplex
+            lp = RevisedSimplex(standard.as_rows() if standard is not None else model, observer=observer, control=control)
+        elif method == "interior":
+            from Services.interior import InteriorPoint
+            lp = InteriorPoint(standard.as_rows() if standard is not None else model, observer=observer, control=control)
+        elif method == "tableau":
+            lp = Simplex(backend=backend, observer=observer, model=model, control=control, basis=basis)
+        else:
+            raise ValueError(f"Неизвестный метод: {method}")
+    except UnboundedError as ex:
+        return SimplexResult("unbounded", message=str(ex), iterations=control.iterations, **control.summary())
+    except IterationLimitError as ex:
+        return SimplexResult("iteration_limit", message=str(ex), iterations=control.iterations, **control.summary())
+    except TimeLimitError as ex:
+        return SimplexResult("time_limit", message=str(ex), iterations=control.iterations, **control.summary())
+    except CancelledError as ex:
+        return SimplexResult("cancelled", message=str(ex), iterations=control.iterations, **control.summary())
+
+    solution = dict(lp.solution)
+    del solution["val"]
+    basis = lp.basic_vars[1:]
+    if not lp.feasible:
+        return SimplexResult("infeasible", basis=basis, iterations=lp.iterations, message="Решения не существует", **control.summary())
+    objective = lp.optimize_val
+    duals = lp.dual_values()
+    if standard is not None:
+        solution = standard.recover(solution)
+        objective = objective + standard.offset
+        basis = None
+        duals = duals[:model.num_constraints()]
+    return SimplexResult("optimal", solution, objective, basis, lp.iterations, duals=duals, **control.summary())
@@ -0,0 +1,656 @@
+from fractions import Fraction
+from math import gcd, lcm
+import numpy as np
+
+
+class FractionTableau(object):
+    def __init__(self, matrix):
+        """
+            Точная симплекс-таблица на дробях (fractions.Fraction).
+
+            Аргументы:
+            - matrix: список строк таблицы, каждая строка — список Fraction.
+              Нулевая строка — целевая, последний столбец — свободные члены.
+
+            Подходит для небольших учебных задач, где важен точный ответ.
+        """
+        self.data = matrix
+
+    def __len__(self):
+        return len(self.data)
+
+    def width(self):
+        """Возвращает количество столбцов таблицы (вместе со столбцом свободных членов)."""
+        return len(self.data[0])
+
+    def row(self, i):
+        """Возвращает строку таблицы в виде списка значений."""
+        return self.data[i]
+
+    def get(self, i, j):
+        """Возвращает элемент таблицы в строке i и столбце j."""
+        return self.data[i][j]
+
+    def set(self, i, j, value):
+        """Записывает значение value в строку i и столбец j."""
+        self.data[i][j] = Fraction(value)
+
+    def add_multiple(self, target, source, factor=1):
+        """
+            Прибавляет к строке target строку source, умноженную на factor.
+
+            Аргументы:
+            - target: индекс изменяемой строки.
+            - source: индекс прибавляемой строки.
+            - factor: множитель.
+        """
+        if factor == 1:
+            self.data[target] = add_row(self.data[target], self.data[source])
+        else:
+            self.data[target] = add_row(self.data[target], multiply_const_row(factor, self.data[source]))
+
+    def normalize_to_pivot(self, key_row, pivot):
+        """Делит все элементы строки key_row на опорный элемент pivot."""
+        row = self.data[key_row]
+        for i in range(len(row)):
+            row[i] /= pivot
+
+    def make_key_column_zero(self, key_column, key_row):
+        """Обнуляет ключевой столбец во всех строках, кроме строки key_row."""
+        pivot_row = self.data[key_row]
+        num_columns = len(pivot_row)
+        for i in range(len(self.data)):
+            if i != key_row:
+                factor = self.data[i][key_column]
+                if factor == 0:
+                    continue
+                row = self.data[i]
+                for j in range(num_columns):
+                    row[j] -= pivot_row[j] * factor
+
+    def find_key_row(self, key_column, labels=None):
+        """
+            Поиск строки с опорным элементом (min положительное соотношение).
+
+            Аргументы:
+            - key_column: индекс ключевого столбца.
+            - labels: номера базисных переменных по строкам; если заданы, при равных
+              отношениях выбирается строка с наименьшим номером (правило Бленда),
+              иначе — первая строка.
+
+            Возвращает индекс строки или None, если в ключевом столбце нет
+            положительных элементов (решение неограниченно).
+        """
+        min_val = None
+        min_i = None
+        for i in range(1, len(self.data)):
+            if self.data[i][key_column] > 0:
+                val = self.data[i][-1] / self.data[i][key_column]
+                if min_val is None or val < min_val or (val == min_val and labels is not None and labels[i] < labels[min_i]):
+                    min_val = val
+                    min_i = i
+        return min_i
+
+    def find_dual_key_row(self):
+        """
+            Ключевая строка двойственного симплекс-метода: строка с наименьшим
+            отрицательным свободным членом или None, если отрицательных нет.
+        """
+        min_i = None
+        for i in range(1, len(self.data)):
+            if self.data[i][-1] < 0 and (min_i is None or self.data[i][-1] < self.data[min_i][-1]):
+                min_i = i
+        return min_i
+
+    def find_dual_key_column(self, key_row):
+        """
+            Ключевой столбец двойственного симплекс-метода: среди отрицательных элементов
+            строки key_row — минимум |целевая строка| / |элемент|. None, если таких элементов нет.
+        """
+        row = self.data[key_row]
+        objective = self.data[0]
+        min_val = None
+        min_j = None
+        for j in range(len(row) - 1):
+            if row[j] < 0:
+                val = abs(objective[j] / row[j])
+                if min_val is None or val < min_val:
+                    min_val = val
+                    min_j = j
+        return min_j
+
+    def objective_scores(self, direction):
+        """
+            Оценки улучшения по столбцам целевой строки (без свободного члена).
+
+            Аргументы:
+            - direction: 1 — улучшают положительные элементы (первая фаза, минимизация),
+                         -1 — отрицательные (максимизация).
+        """
+        if direction > 0:
+            return self.data[0][:-1]
+        return [-value for value in self.data[0][:-1]]
+
+    def column_norms(self):
+        """Квадраты норм столбцов ограничений (без целевой строки и свободного члена) в float64."""
+        rows = np.array([[float(value) for value in row[:-1]] for row in self.data[1:]]).reshape(len(self.data) - 1, -1)
+        return np.einsum('ij,ij->j', rows, rows)
+
+    def delete_row(self, i):
+        """Удаляет строку i из таблицы."""
+        del self.data[i]
+
+    def complement_column(self, j, bound):
+        """
+            Замена переменной столбца j на bound - x_j (переменная на верхней границе
+            становится небазисной с нулевым значением): свободные члены уменьшаются
+            на bound·столбец, столбец меняет знак во всех строках, включая целевую.
+        """
+        for row in self.data:
+            row[-1] -= bound * row[j]
+            row[j] = -row[j]
+
+    def max_index(self):
+        """Индекс максимального элемента целевой строки (без свободного члена)."""
+        return max_index(self.data[0])
+
+    def min_index(self):
+        """Индекс минимального элемента целевой строки (без свободного члена)."""
+        return min_index(self.data[0])
+
+    def is_positive(self, value):
+        """Проверка value > 0 в арифметике таблицы."""
+        return value > 0
+
+    def is_negative(self, value):
+        """Проверка value < 0 в арифметике таблицы."""
+        return value < 0
+
+    def truncate_columns(self, length):
+        """Оставляет в каждой строке первые length - 1 столбцов и столбец свободных членов."""
+        for row in self.data:
+            del row[length - 1:-1]
+
+    def zero(self):
+        """Нулевое значение в арифметике таблицы."""
+        return Fraction("0/1")
+
+
+class NumpyTableau(object):
+    def __init__(self, matrix, eps=1e-9):
+        """
+            Симплекс-таблица в непрерывном массиве numpy float64.
+
+            Аргументы:
+            - matrix: список строк таблицы (Fraction или числа), см. FractionTableau.
+            - eps: допуск для проверок оптимальности и отношения (ratio test).
+
+            Каждый шаг симплекс-метода выполняется как одно векторное
+            обновление ранга 1 вместо двойного цикла на Python.
+        """
+        self.data = np.ascontiguousarray(np.array(matrix, dtype=np.float64))
+        self.eps = eps
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def width(self):
+        """Возвращает количество столбцов таблицы (вместе со столбцом свободных членов)."""
+        return self.data.shape[1]
+
+    def row(self, i):
+        """Возвращает строку таблицы в виде списка значений."""
+        return self.data[i].tolist()
+
+    def get(self, i, j):
+        """Возвращает элемент таблицы в строке i и столбце j."""
+        return float(self.data[i, j])
+
+    def set(self, i, j, value):
+        """Записывает значение value в строку i и столбец j."""
+        self.data[i, j] = float(value)
+
+    def add_multiple(self, target, source, factor=1):
+        """Прибавляет к строке target строку source, умноженную на factor."""
+        self.data[target] += float(factor) * self.data[source]
+
+    def normalize_to_pivot(self, key_row, pivot):
+        """Делит строку key_row на опорный элемент pivot."""
+        self.data[key_row] /= float(pivot)
+
+    def make_key_column_zero(self, key_column, key_row):
+        """
+            Обнуляет ключевой столбец одним обновлением ранга 1.
+
+            Обновляются только строки с ненулевым элементом в ключевом столбце,
+            после чего столбец принудительно становится единичным, чтобы
+            ошибки округления не накапливались.
+        """
+        data = self.data
+        factors = data[:, key_column].copy()
+        factors[key_row] = 0.0
+        rows = np.flatnonzero(np.abs(factors) > self.eps)
+        if len(rows):
+            data[rows] -= np.outer(factors[rows], data[key_row])
+        data[:, key_column] = 0.0
+        data[key_row, key_column] = 1.0
+
+    def find_key_row(self, key_column, labels=None):
+        """
+            Поиск строки с опорным элементом (min положительное соотношение)
+            с допуском eps. Возвращает индекс строки или None.
+
+            Если заданы labels (номера базисных переменных по строкам), среди строк
+            с отношением в пределах eps от минимального выбирается строка с наименьшим номером.
+        """
+        column = self.data[1:, key_column]
+        mask = column > self.eps
+        if not mask.any():
+            return None
+        ratios = np.full(column.shape, np.inf)
+        ratios[mask] = self.data[1:, -1][mask] / column[mask]
+        best = int(np.argmin(ratios))
+        if labels is not None:
+            ties = np.flatnonzero(ratios <= ratios[best] + self.eps)
+            best = int(ties[np.argmin(np.asarray(labels[1:])[ties])])
+        return best + 1
+
+    def find_dual_key_row(self):
+        """Ключевая строка двойственного симплекс-метода (свободный член < -eps) или None."""
+        rhs = self.data[1:, -1]
+        i = int(np.argmin(rhs))
+        if rhs[i] < -self.eps:
+            return i + 1
+        return None
+
+    def find_dual_key_column(self, key_row):
+        """Ключевой столбец двойственного симплекс-метода (см. FractionTableau.find_dual_key_column)."""
+        row = self.data[key_row, :-1]
+        mask = row < -self.eps
+        if not mask.any():
+            return None
+        ratios = np.full(row.shape, np.inf)
+        ratios[mask] = np.abs(self.data[0, :-1][mask] / row[mask])
+        return int(np.argmin(ratios))
+
+    def objective_scores(self, direction):
+        """Оценки улучшения по столбцам целевой строки (см. FractionTableau.objective_scores)."""
+        return self.data[0, :-1] * direction
+
+    def column_norms(self):
+        """Квадраты норм столбцов ограничений (без целевой строки и свободного члена)."""
+        return np.einsum('ij,ij->j', self.data[1:, :-1], self.data[1:, :-1])
+
+    def delete_row(self, i):
+        """Удаляет строку i из таблицы."""
+        self.data = np.ascontiguousarray(np.delete(self.data, i, axis=0))
+
+    def complement_column(self, j, bound):
+        """Замена переменной столбца j на bound - x_j (см. FractionTableau.complement_column)."""
+        self.data[:, -1] -= float(bound) * self.data[:, j]
+        self.data[:, j] *= -1.0
+
+    def max_index(self):
+        """Индекс максимального элемента целевой строки (без свободного члена)."""
+        return int(np.argmax(self.data[0, :-1]))
+
+    def min_index(self):
+        """Индекс минимального элемента целевой строки (без свободного члена)."""
+        return int(np.argmin(self.data[0, :-1]))
+
+    def is_positive(self, value):
+        """Проверка value > eps."""
+        return value > self.eps
+
+    def is_negative(self, value):
+        """Проверка value < -eps."""
+        return value < -self.eps
+
+    def truncate_columns(self, length):
+        """Оставляет первые length - 1 столбцов и столбец свободных членов."""
+        self.data = np.ascontiguousarray(np.hstack((self.data[:, :length - 1], self.data[:, -1:])))
+
+    def zero(self):
+        """Нулевое значение в арифметике таблицы."""
+        return 0.0
+
+
+class BareissTableau(object):
+    def __init__(self, matrix):
+        """
+            Точная симплекс-таблица без дробей: целые числа Python и общий знаменатель
+            (метод Барейса, fraction-free).
+
+            Аргументы:
+            - matrix: список строк таблицы (Fraction или целые), см. FractionTableau.
+              Таблица должна содержать единичный начальный базис (как строит Simplex).
+
+            Строки ограничений хранятся как целые числители data с общим знаменателем den:
+            элемент таблицы равен data[i][j] / den. Знаменатель — определитель текущего
+            базиса, поэтому при шаге на опорном элементе p новая строка вычисляется как
+            (p·a - f·b) // den с точным целочисленным делением, а den становится равным p.
+            Ни одного Fraction и gcd на элемент, числа остаются минорами исходной матрицы.
+
+            Целевая строка меняется не только шагами (set, add_multiple), поэтому хранится
+            отдельно со своим знаменателем и сокращается одним gcd на строку.
+
+            Значения, которые отдают row и get, — обычные Fraction, так что ответ и ход решения
+            совпадают с FractionTableau символ в символ.
+        """
+        rows = [[Fraction(value) for value in row] for row in matrix[1:]]
+        self.unit = 1
+        for row in rows:
+            for value in row:
+                self.unit = lcm(self.unit, value.denominator)
+        # начальный базис в целочисленной матрице — unit·E, его определитель unit^m
+        scale = self.unit ** max(len(rows) - 1, 0)
+        self.data = [[value.numerator * (self.unit // value.denominator) * scale for value in row] for row in rows]
+        self.den = self.unit ** len(rows)
+        objective = [Fraction(value) for value in matrix[0]]
+        self.obj_den = 1
+        for value in objective:
+            self.obj_den = lcm(self.obj_den, value.denominator)
+        self.obj = [value.numerator * (self.obj_den // value.denominator) for value in objective]
+
+    def __len__(self):
+        return len(self.data) + 1
+
+    def width(self):
+        """Возвращает количество столбцов таблицы (вместе со столбцом свободных членов)."""
+        return len(self.obj)
+
+    def row(self, i):
+        """Возвращает строку таблицы в виде списка Fraction."""
+        if i == 0:
+            return [Fraction(value, self.obj_den) for value in self.obj]
+        return [Fraction(value, self.den) for value in self.data[i - 1]]
+
+    def get(self, i, j):
+        """Возвращает элемент таблицы в строке i и столбце j (Fraction)."""
+        if i == 0:
+            return Fraction(self.obj[j], self.obj_den)
+        return Fraction(self.data[i - 1][j], self.den)
+
+    def set(self, i, j, value):
+        """Записывает значение value в целевую строку (строки ограничений меняются только шагами)."""
+        if i != 0:
+            raise ValueError("В BareissTableau напрямую изменяется только целевая строка")
+        value = Fraction(value)
+        if self.obj_den % value.denominator:
+            factor = value.denominator // gcd(self.obj_den, value.denominator)
+            self.obj = [x * factor for x in self.obj]
+            self.obj_den *= factor
+        self.obj[j] = value.numerator * (self.obj_den // value.denominator)
+        self.reduce_objective()
+
+    def add_multiple(self, target, source, factor=1):
+        """Прибавляет к целевой строке target строку ограничения source, умноженную на factor."""
+        if target != 0 or source == 0:
+            raise ValueError("В BareissTableau к целевой строке прибавляются только строки ограничений")
+        factor = Fraction(factor)
+        a, b = factor.numerator, factor.denominator
+        scale = b * self.den
+        self.obj = [x * scale + a * y * self.obj_den for x, y in zip(self.obj, self.data[source - 1])]
+        self.obj_den *= scale
+        self.reduce_objective()
+
+    def reduce_objective(self):
+        """Сокращает целевую строку на общий делитель числителей и знаменателя."""
+        g = gcd(self.obj_den, *self.obj)
+        if g > 1:
+            self.obj = [x // g for x in self.obj]
+            self.obj_den //= g
+
+    def normalize_to_pivot(self, key_row, pivot):
+        """
+            Ничего не делает: деление ключевой строки на опорный элемент выполняется
+            вместе с обнулением столбца в make_key_column_zero (знаменатель общий для всех строк).
+        """
+
+    def make_key_column_zero(self, key_column, key_row):
+        """
+            Шаг Барейса на элементе (key_row, key_column).
+
+            Для строк ограничений: a' = (p·a - f·b) // den, где p — опорный элемент,
+            f — элемент строки в ключевом столбце, b — ключевая строка; деление точное.
+            Новый знаменатель — |p|, при p < 0 знаки всех строк меняются, чтобы den оставался
+            положительным. Целевая строка пересчитывается со своим знаменателем.
+        """
+        pivot_row = self.data[key_row - 1]
+        p = pivot_row[key_column]
+        den = self.den
+        sign = 1 if p > 0 else -1
+        sp = sign * p
+        for i, row in enumerate(self.data):
+            if i == key_row - 1:
+                continue
+            f = sign * row[key_column]
+            if f == 0:
+                if sp != den:
+                    self.data[i] = [sp * x // den for x in row]
+            else:
+                self.data[i] = [(sp * x - f * y) // den for x, y in zip(row, pivot_row)]
+        if sign < 0:
+            self.data[key_row - 1] = [-y for y in pivot_row]
+        self.den = sp
+
+        f = self.obj[key_column]
+        if f != 0:
+            pivot_row = self.data[key_row - 1]
+            self.obj = [sp * x - f * y for x, y in zip(self.obj, pivot_row)]
+            self.obj_den *= sp
+            self.reduce_objective()
+
+    def find_key_row(self, key_column, labels=None):
+        """
+            Поиск строки с опорным элементом (min положительное соотношение), см. FractionTableau.
+            Отношения сравниваются перекрёстным умножением целых чисел без построения дробей.
+        """
+        min_i = None
+        min_num = min_den = 0
+        for i, row in enumerate(self.data):
+            a = row[key_column]
+            if a > 0:
+                b = row[-1]
+                if min_i is None:
+                    better = True
+                else:
+                    left, right = b * min_den, min_num * a
+                    better = left < right or (left == right and labels is not None and labels[i + 1] < labels[min_i])
+                if better:
+                    min_i, min_num, min_den = i + 1, b, a
+        return min_i
+
+    def find_dual_key_row(self):
+        """Ключевая строка двойственного симплекс-метода (см. FractionTableau.find_dual_key_row)."""
+        min_i = None
+        for i, row in enumerate(self.data):
+            if row[-1] < 0 and (min_i is None or row[-1] < self.data[min_i - 1][-1]):
+                min_i = i + 1
+        return min_i
+
+    def find_dual_key_column(self, key_row):
+        """
+            Ключевой столбец двойственного симплекс-метода (см. FractionTableau.find_dual_key_column).
+            Знаменатели строк постоянны, поэтому отношения числителей сравниваются перекрёстным умножением.
+        """
+        row = self.data[key_row - 1]
+        min_j = None
+        min_num = min_den = 0
+        for j in range(len(row) - 1):
+            a = row[j]
+            if a < 0:
+                b = abs(self.obj[j])
+                if min_j is None or b * min_den < min_num * -a:
+                    min_j, min_num, min_den = j, b, -a
+        return min_j
+
+    def objective_scores(self, direction):
+        """
+            Оценки улучшения по столбцам целевой строки (см. FractionTableau.objective_scores).
+            Возвращаются числители: от оценок они отличаются положительным множителем,
+            что не меняет ни знаков, ни выбора столбца.
+        """
+        if direction > 0:
+            return self.obj[:-1]
+        return [-value for value in self.obj[:-1]]
+
+    def column_norms(self):
+        """Квадраты норм столбцов ограничений (без целевой строки и свободного члена) в float64."""
+        rows = np.array([[value / self.den for value in row[:-1]] for row in self.data]).reshape(len(self.data), -1)
+        return np.einsum('ij,ij->j', rows, rows)
+
+    def max_index(self):
+        """Индекс максимального элемента целевой строки (без свободного члена)."""
+        return max_index(self.obj)
+
+    def min_index(self):
+        """Индекс минимального элемента целевой строки (без свободного члена)."""
+        return min_index(self.obj)
+
+    def is_positive(self, value):
+        """Проверка value > 0."""
+        return value > 0
+
+    def is_negative(self, value):
+        """Проверка value < 0."""
+        return value < 0
+
+    def truncate_columns(self, length):
+        """Оставляет в каждой строке первые length - 1 столбцов и столбец свободных членов."""
+        for row in self.data:
+            del row[length - 1:-1]
+        del self.obj[length - 1:-1]
+
+    def delete_row(self, i):
+        """
+            Удаляет строку ограничения i, базисная переменная которой — искусственная.
+
+            Определитель базиса уменьшается на множитель unit (столбец искусственной
+            переменной в целочисленной матрице равен unit·e_i), на него же делятся числители.
+        """
+        del self.data[i - 1]
+        if self.unit != 1:
+            self.data = [[x // self.unit for x in row] for row in self.data]
+            self.den //= self.unit
+
+    def complement_column(self, j, bound):
+        """
+            Замена переменной столбца j на bound - x_j (см. FractionTableau.complement_column).
+
+            При дробной границе p/q числители строк ограничений и знаменатель сначала
+            домножаются на q: новые свободные члены — миноры матрицы с дробной правой частью,
+            и шаги Барейса остаются точными только при общем множителе, кратном q.
+            Целевая строка домножается на q и сокращается.
+        """
+        bound = Fraction(bound)
+        p, q = bound.numerator, bound.denominator
+        if q > 1:
+            self.data = [[x * q for x in row] for row in self.data]
+            self.den *= q
+        for row in self.data:
+            row[-1] -= p * row[j] // q
+            row[j] = -row[j]
+        self.obj = [x * q for x in self.obj]
+        self.obj_den *= q
+        self.obj[-1] -= p * self.obj[j] // q
+        self.obj[j] = -self.obj[j]
+        self.reduce_objective()
+
+    def zero(self):
+        """Нулевое значение в арифметике таблицы."""
+        return Fraction("0/1")
+
+
+BACKENDS = {
+    "fraction": FractionTableau,
+    "numpy": NumpyTableau,
+    "bareiss": BareissTableau,
+}
+
+
+def make_tableau(matrix, backend="fraction"):
+    """
+        Создаёт симплекс-таблицу выбранного вычислительного бэкенда.
+
+        Аргументы:
+        - matrix: начальная таблица в виде списка строк.
+        - backend: "fraction" (точная арифметика на Fraction), "bareiss" (точная
+          целочисленная арифметика с общим знаменателем) или "numpy" (float64).
+
+        Возвращает:
+        Объект таблицы с общим интерфейсом для класса Simplex.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд: {backend}")
+    return BACKENDS[backend](matrix)
+
+
+def add_row(row1, row2):
+    """
+        Складывает два вектора (строки симплекс-таблицы) элемент за элементом.
+
+        Аргументы:
+        row1: первая строка.
+        row2: вторая строка.
+
+        Возвращает:
+        Новый вектор, где каждый элемент является суммой соответствующих элементов row1 и row2.
+    """
+    row_sum = [0 for i in range(len(row1))]
+    for i in range(len(row1)):
+        row_sum[i] = row1[i] + row2[i]
+    return row_sum
+
+
+def max_index(row):
+    """
+        Находит индекс максимального элемента в строке (без последнего столбца свободных членов).
+
+        Аргументы:
+        row: строка, в которой ищется максимальное значение.
+
+        Возвращает:
+        Индекс максимального элемента в строке.
+    """
+    max_i = 0
+    for i in range(0, len(row)-1):
+        if row[i] > row[max_i]:
+            max_i = i
+
+    return max_i
+
+
+def multiply_const_row(const, row):
+    """
+        Умножает все элементы строки на заданную константу.
+
+        Аргументы:
+        const: константа, на которую умножается строка.
+        row: строка для умножения.
+
+        Возвращает:
+        Новый вектор, где каждый элемент строки умножен на константу.
+    """
+    mul_row = []
+    for i in row:
+        mul_row.append(const*i)
+    return mul_row
+
+
+def min_index(row):
+    """
+       Находит индекс минимального элемента в строке (без последнего столбца свободных членов).
+
+       Аргументы:
+       row: строка, в которой ищется минимальное значение.
+
+       Возвращает:
+       Индекс минимального элемента в строке.
+    """
+    min_i = 0
+    for i in range(0, len(row)-1):
+        if row[min_i] > row[i]:
+            min_i = i
+
+    return min_i
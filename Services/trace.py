@@ -0,0 +1,235 @@
+class SimplexObserver(object):
+    """
+        Базовый наблюдатель за ходом симплекс-метода.
+
+        Класс Simplex вызывает методы наблюдателя только если он передан,
+        поэтому без подписчика форматирование таблиц не выполняется вовсе.
+        Наследники переопределяют нужные методы, остальные ничего не делают.
+    """
+
+    def on_tableau(self, simplex, check):
+        """
+            Вызывается, когда текущую симплекс-таблицу нужно показать.
+
+            Аргументы:
+            - simplex: экземпляр Simplex.
+            - check: True — сокращённая таблица (только исходные переменные),
+                     False — полная таблица.
+        """
+
+    def on_pivot(self, simplex, key_row, key_column, pivot):
+        """
+            Вызывается перед шагом симплекс-метода.
+
+            Аргументы:
+            - simplex: экземпляр Simplex.
+            - key_row: индекс ключевой строки.
+            - key_column: индекс ключевого столбца.
+            - pivot: опорный элемент.
+        """
+
+    def on_phase(self, simplex, phase):
+        """
+            Вызывается при переходе ко второй фазе (оптимизация целевой функции).
+
+            Аргументы:
+            - simplex: экземпляр Simplex.
+            - phase: номер фазы.
+        """
+
+    def on_finish(self, simplex):
+        """
+            Вызывается один раз в конце решения (в том числе после ошибки).
+
+            Аргументы:
+            - simplex: экземпляр Simplex или RevisedSimplex.
+        """
+
+
+VERBOSITY = ("summary", "pivots", "full")
+
+
+class TraceRenderer(SimplexObserver):
+    def __init__(self, verbosity="full", max_rows=None, max_cols=None):
+        """
+            Базовый наблюдатель, превращающий ход решения в текст.
+
+            Аргументы:
+            - verbosity: "full" — все таблицы, опорные элементы и разделители фаз (как раньше);
+                         "pivots" — только опорные элементы и разделители фаз;
+                         "summary" — только итоговая таблица и количество шагов в конце.
+            - max_rows: сколько строк ограничений показывать в таблице (None — все).
+            - max_cols: сколько столбцов показывать в таблице, включая свободный член (None — все).
+
+            Текст одной итерации (таблица и опорный элемент) копится в буфере и передаётся
+            в write одним куском, поэтому виджет или файл получают одну вставку на шаг.
+            Наследники переопределяют только write.
+
+            Если атрибут record — список, в него дополнительно складываются все выведенные
+            куски (так Services.cache.SolveCache сохраняет ход решения).
+        """
+        if verbosity not in VERBOSITY:
+            raise ValueError(f"Неизвестный уровень подробности: {verbosity}")
+        self.verbosity = verbosity
+        self.max_rows = max_rows
+        self.max_cols = max_cols
+        self.pending = []
+        self.last_check = None
+        self.record = None
+
+    def on_tableau(self, simplex, check):
+        self.last_check = check
+        if self.verbosity == "full":
+            self.pending.extend(format_tableau(simplex, check, self.max_rows, self.max_cols))
+
+    def on_pivot(self, simplex, key_row, key_column, pivot):
+        if self.verbosity != "summary":
+            self.pending.append(format_pivot(key_row, key_column, pivot))
+        self.flush()
+
+    def on_phase(self, simplex, phase):
+        if self.verbosity != "summary":
+            self.pending.append("*****************\n")
+
+    def on_finish(self, simplex):
+        if self.verbosity == "summary":
+            # таблица форматируется только здесь, один раз за всё решение
+            if self.last_check is not None:
+                self.pending.extend(format_tableau(simplex, self.last_check, self.max_rows, self.max_cols))
+            self.pending.append(f"Шагов симплекс-метода: {simplex.iterations}\n")
+        self.flush()
+
+    def flush(self):
+        """Передаёт накопленный текст в write одним куском."""
+        if self.pending:
+            chunk = ''.join(self.pending)
+            self.pending = []
+            if self.record is not None:
+                self.record.append(chunk)
+            self.write(chunk)
+
+    def write(self, chunk):
+        """Выводит кусок текста (переопределяется наследниками)."""
+
+    def replay(self, text):
+        """Выводит готовый текст хода решения (из кэша) вместо событий решателя."""
+        self.write(text)
+
+    def settings(self):
+        """Параметры вывода (одинаковые параметры дают одинаковый текст для одной задачи)."""
+        return (self.verbosity, self.max_rows, self.max_cols)
+
+
+class TextTrace(TraceRenderer):
+    def __init__(self, text, char, verbosity="full", max_rows=None, max_cols=None):
+        """
+            Наблюдатель, выводящий ход решения в текстовый виджет Tk.
+
+            Аргументы:
+            - text: виджет с методом insert (например, ScrolledText).
+            - char: позиция вставки (обычно END).
+            - verbosity, max_rows, max_cols: см. TraceRenderer.
+        """
+        TraceRenderer.__init__(self, verbosity, max_rows, max_cols)
+        self.hod_simplex = text
+        self.char = char
+
+    def write(self, chunk):
+        self.hod_simplex.insert(self.char, chunk)
+
+
+class FileTrace(TraceRenderer):
+    def __init__(self, path, verbosity="full", max_rows=None, max_cols=None):
+        """
+            Наблюдатель, записывающий ход решения в текстовый файл вместо виджета.
+
+            Аргументы:
+            - path: путь к файлу (UTF-8).
+            - verbosity, max_rows, max_cols: см. TraceRenderer.
+
+            Файл открывается при первой записи, каждая итерация сразу уходит в файл,
+            и в памяти не копится весь ход решения. В конце решения файл закрывается;
+            при повторном решении (Simplex.reoptimize) запись продолжается в конец.
+        """
+        TraceRenderer.__init__(self, verbosity, max_rows, max_cols)
+        self.path = path
+        self.file = None
+        self.mode = "w"
+
+    def write(self, chunk):
+        if self.file is None:
+            self.file = open(self.path, self.mode, encoding="utf-8")
+            self.mode = "a"
+        self.file.write(chunk)
+
+    def on_finish(self, simplex):
+        TraceRenderer.on_finish(self, simplex)
+        self.close()
+
+    def replay(self, text):
+        TraceRenderer.replay(self, text)
+        self.close()
+
+    def close(self):
+        """Закрывает файл, если он открыт."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def format_pivot(key_row, key_column, pivot):
+    """Формирует строку с описанием следующего опорного элемента."""
+    nl_char = '\n'
+    return nl_char + f"Следующий опорный элемент строка/столбец({key_row},{key_column + 1}) {pivot}: {nl_char}"
+
+
+def format_tableau(simplex, check=True, max_rows=None, max_cols=None):
+    """
+        Форматирует текущую симплекс-таблицу в список строк.
+
+        Аргументы:
+        - simplex: экземпляр Simplex.
+        - check: если True, то выводится отформатированная таблица для промежуточных шагов
+                 (только исходные переменные, не вошедшие в базис на первой фазе, и свободный член).
+                 Если False, то таблица выводится в "сыром" виде.
+        - max_rows: наибольшее число строк ограничений; остальные заменяются строкой "...".
+        - max_cols: наибольшее число столбцов вместе со свободным членом; пропущенные
+                    столбцы обозначаются "..." перед свободным членом.
+
+        Возвращает:
+        Список строк: сначала строки ограничений, последней — целевая строка.
+        Значения берутся только у показываемых строк и столбцов.
+    """
+    nl_char = '\n'
+    probel = ' '
+    table = simplex.coeff_matrix
+    width = table.width()
+    if check:
+        pivots = set(simplex.coloumn_pivot)
+        columns = [j for j in range(width) if j not in pivots and j + 1 <= simplex.count_vars or j == width - 1]
+    else:
+        columns = list(range(width))
+    hidden_cols = 0
+    if max_cols is not None and len(columns) > max(max_cols, 1):
+        hidden_cols = len(columns) - max(max_cols, 1)
+        columns = columns[:max(max_cols, 1) - 1] + [width - 1]
+    rows = len(table) - 1
+    if max_rows is not None and rows > max_rows:
+        rows = max_rows
+
+    def format_row(index, sign=1):
+        if hidden_cols:
+            values = [table.get(index, j) for j in columns]
+        else:
+            row = table.row(index)
+            values = [row[j] for j in columns]
+        cells = [str(sign * value) + probel if sign != 1 else str(value) + probel for value in values]
+        if hidden_cols:
+            cells.insert(len(cells) - 1, "..." + probel)
+        return f"{''.join(cells)} {nl_char}"
+
+    lines = [format_row(index) for index in range(1, rows + 1)]
+    if rows < len(table) - 1:
+        lines.append(f"... скрыто строк: {len(table) - 1 - rows} {nl_char}")
+    lines.append(format_row(0, -1 if check else 1))
+    return lines
@@ -0,0 +1,64 @@
+import threading
+from Services.trace import TraceRenderer
+
+
+class BufferedTrace(TraceRenderer):
+    def __init__(self, verbosity="full", max_rows=None, max_cols=None):
+        """
+            Наблюдатель для решения в фоновом потоке.
+
+            Ход решения форматируется в потоке решателя и копится в буфере по итерациям;
+            поток интерфейса забирает его пачкой методом drain (виджеты Tk можно
+            трогать только из главного потока).
+
+            Аргументы:
+            - verbosity, max_rows, max_cols: см. TraceRenderer.
+        """
+        TraceRenderer.__init__(self, verbosity, max_rows, max_cols)
+        self.lock = threading.Lock()
+        self.lines = []
+
+    def write(self, chunk):
+        with self.lock:
+            self.lines.append(chunk)
+
+    def drain(self):
+        """Возвращает накопленный текст одной строкой и очищает буфер."""
+        with self.lock:
+            lines, self.lines = self.lines, []
+        return ''.join(lines)
+
+
+class BackgroundTask(object):
+    def __init__(self, target, *args, **kwargs):
+        """
+            Выполняет функцию target(*args, **kwargs) в отдельном потоке.
+
+            Результат и исключение сохраняются в атрибутах result и error; готовность
+            проверяется методом finished (например, из опроса через window.after).
+            Поток — демон, поэтому закрытие окна не ждёт долгого решения.
+        """
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        try:
+            self.result = self.target(*self.args, **self.kwargs)
+        except Exception as ex:
+            self.error = ex
+        finally:
+            self.done.set()
+
+    def start(self):
+        """Запускает поток и возвращает сам объект."""
+        self.thread.start()
+        return self
+
+    def finished(self):
+        """Завершилась ли функция (успешно или с исключением)."""
+        return self.done.is_set()
@@ -2,23 +2,40 @@ from tkinter import *
 from tkinter import messagebox
 from tkinter import scrolledtext
 from tkinter import ttk 
-from Services.simplex import Simplex
+from Services.simplex import solve as solve_lp
+from Services.model import compile_model, apply_bounds, apply_integer, parse_linear, model_from_bars
+from Services.bars import read_task, read_bars
+from Services.formats import model_format, read_model, write_model
+from Services.branch import BranchAndBound
+from Services.pricing import PivotControl
+from Services.worker import BufferedTrace, BackgroundTask
 from tkinter.filedialog import *
 from tkinter.messagebox import *
 import re
 import json
-from fractions import Fraction
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use( 'tkagg' )
-from sympy import symbols, plot_implicit, plot, Matrix,solve
-from Services.graph import GaussAlgorithm
+import numpy as np
+from Services.region import FeasibleRegion
+from Services.cache import SolveCache
+# matplotlib (Services.plotview) и SymPy (Services.graph) загружаются при первом
+# использовании или заранее в фоне после появления окна (см. App.prewarm)
 
 class App:
         constraints = []
+        poll_interval = 50  # мс между опросами фонового решения
+        trace_max_rows = 40  # сколько строк и столбцов симплекс-таблицы показывать в ходе решения
+        trace_max_cols = 40
+        max_entries = 16  # задачи с большим числом ограничений открываются без полей ввода (см. show_model)
+        preview_delay = 250  # мс паузы в наборе до перерисовки предпросмотра (см. schedule_preview)
+        prewarm_delay = 200  # мс после появления окна до фоновой загрузки графики; None — не загружать заранее
+
+        def new_constraint_entry(self):
+            """Создаёт поле ввода ограничения; при наборе текста график обновляется (с задержкой)."""
+            entry = ttk.Entry(self.task, validate="key",width=60)
+            entry.bind("<KeyRelease>", self.schedule_preview)
+            return entry
 
         def add_ogr(self):
-            self.constraints.append(ttk.Entry(self.task, validate="key",width=60))
+            self.constraints.append(self.new_constraint_entry())
             if len(self.constraints) <= 16:
                 for index, ogr in enumerate(self.constraints):
                     ogr.grid(column=4,row = index + 7)
@@ -37,6 +54,7 @@ class App:
             if len(self.constraints) > 0:
                 self.constraints[-1].grid_remove() 
                 self.constraints.pop(-1)
+                self.schedule_preview()
         
 
         def save_as_file(self):
@@ -48,12 +66,22 @@ class App:
                 2. Создаёт словарь, содержащий целевую функцию, тип задачи (минимизация или максимизация), и список ограничений.
                 3. Преобразует этот словарь в строку формата JSON.
                 4. Сохраняет строку в файл.
+                Задача, открытая без полей ввода (см. show_model), сохраняется в формате v2
+                (Services.bars.write_bars) вместе с добавленными ограничениями. Файлы .mps и .lp
+                записываются из скомпилированной задачи (Services.formats.write_model).
             """
-            save_as = asksaveasfilename(filetypes = (("bars files" , "*.bars"),))
+            save_as = asksaveasfilename(filetypes = (("bars files" , "*.bars"), ("MPS files", "*.mps"), ("LP files", "*.lp")))
+            if self.loaded_model is not None or model_format(save_as) != "bars":
+                write_model(save_as, self.compile_task())
+                return
             save_dict = {}
             save_dict["objective"] = self.objective.get()
             save_dict["min"] = self.enabled.get() 
             save_dict["constraints"] = [ constraint.get().lower() for constraint in self.constraints]
+            if self.bounds:
+                save_dict["bounds"] = self.bounds
+            if self.integer:
+                save_dict["integer"] = self.integer
             json_save = json.dumps(save_dict)
             f = open(save_as, "w")
             f.write(json_save)
@@ -62,18 +90,33 @@ class App:
 
         def open_file(self):
             """
-                Открывает файл формата `.bars` и восстанавливает состояние задачи.
+                Открывает файл формата `.bars` (или `.mps`, `.lp`) и восстанавливает состояние задачи.
 
                 Шаги:
                 1. Открывает диалоговое окно для выбора файла.
-                2. Загружает данные из выбранного файла в формате JSON.
-                3. Восстанавливает целевую функцию, ограничения и тип задачи в пользовательском интерфейсе.
+                2. Загружает данные из выбранного файла (Services.bars.read_task). Файлы v2 и файлы
+                   с числом ограничений больше max_entries открываются сводкой (см. show_model),
+                   файлы MPS и LP — всегда сводкой (Services.formats.read_model).
+                3. Восстанавливает целевую функцию, ограничения и тип задачи в пользовательском интерфейсе
+                   (границы переменных и список целочисленных переменных, если они есть в файле,
+                   сохраняются в self.bounds и self.integer).
                 4. Если возникнет ошибка во время загрузки, она выводится в консоль.
             """
-            open_file = askopenfilename(filetypes = (("bars files" , "*.bars"),))
-            with open(open_file) as f:
-                data = json.load(f)
+            open_file = askopenfilename(filetypes = (("bars files" , "*.bars"), ("MPS files", "*.mps *.mps.gz"), ("LP files", "*.lp *.lp.gz")))
+            if model_format(open_file) != "bars":
+                try:
+                    self.show_model(read_model(open_file))
+                except Exception as ex:
+                    print(ex)
+                return
+            data = read_task(open_file)
             try:   
+                if data is None or len(data["constraints"]) > self.max_entries:
+                    self.show_model(model_from_bars(data) if data is not None else read_bars(open_file))
+                    return
+                self.loaded_model = None
+                self.summary.grid_remove()
+                self.objective.configure(state='normal')
                 self.objective.delete(0, END)
                 self.objective.insert(0,data["objective"])
                 for constraint in  self.constraints:
@@ -81,25 +124,62 @@ class App:
 
                 self.constraints.clear()
                 for constraint in data["constraints"]:
-                    self.constraints.append(ttk.Entry(self.task, validate="key",width=60))
+                    self.constraints.append(self.new_constraint_entry())
                     self.constraints[-1].insert(0,constraint)
 
                 for index, ogr in enumerate(self.constraints):
                     ogr.grid(column=4,row = index + 7)
                 
                 self.enabled.set(data["min"])
+                self.bounds = data.get("bounds", {})
+                self.integer = data.get("integer", [])
+                self.schedule_preview()
 
             except Exception as ex:
                 print(ex)
 
+        def show_model(self, model):
+            """
+                Показывает большую задачу сводкой вместо полей ввода: создавать тысячи ttk.Entry
+                долго, а редактировать их вручную всё равно невозможно.
+
+                Модель хранится в self.loaded_model и решается как есть; направление оптимизации
+                берётся из флажка Max, ограничения из полей ввода (если их добавить) дописываются
+                в конец задачи (см. compile_task).
+            """
+            self.loaded_model = model
+            for constraint in self.constraints:
+                constraint.grid_remove()
+            self.constraints.clear()
+            self.objective.delete(0, END)
+            self.objective.configure(state='disabled')
+            self.enabled.set(0 if model.sense == 'min' else 1)
+            self.bounds = {}
+            self.integer = []
+            self.summary.configure(text=self.model_summary(model))
+            self.summary.grid(column=4, row=4)
+
+        def model_summary(self, model):
+            """Краткое описание задачи: размеры, число ненулевых коэффициентов, границы и целочисленность."""
+            bounded = sum(1 for j in range(model.count_vars) if model.lower[j] != 0 or model.upper[j] is not None)
+            return (f"Задача из файла: переменных {model.count_vars}, ограничений {model.num_constraints()}, "
+                    f"ненулевых коэффициентов {len(model.values)}, с границами {bounded}, целочисленных {sum(model.integer)}")
+
 
         def __init__(self, window):
             """
                    Инициализация графического интерфейса приложения.
                    window: главное окно приложения.
             """
+            self.window = window
+            self.worker = None
+            self.preview_job = None
+            self.cache = SolveCache(max_size=128)
+            self.bounds = {}  # границы переменных из открытого файла .bars (ключ "bounds")
+            self.integer = []  # целочисленные переменные из открытого файла .bars (ключ "integer")
+            self.loaded_model = None  # задача, открытая сводкой без полей ввода (см. show_model)
             window.title('Лабораторная работа по методам оптимизации')
-            window.geometry('700x700')
+            window.geometry('1300x700')
             menu = Menu(window)  
             
             
@@ -127,10 +207,12 @@ class App:
             name_task = ttk.Label(self.task, text="Целевая функция:",anchor=NW)
             self.objective= ttk.Entry(self.task, validate="key",width=60,) 
             self.objective.grid(column=4, row=2)
+            self.objective.bind("<KeyRelease>", self.schedule_preview)
             self.max = False  
             self.enabled = IntVar()
-            self.max_button = Checkbutton(self.task, text="Max", variable=self.enabled)
+            self.max_button = Checkbutton(self.task, text="Max", variable=self.enabled, command=self.schedule_preview)
             self.max_button.grid(column=4, row=3)
+            self.summary = ttk.Label(self.task, text="", anchor=NW)
             name_task.grid(column=0, row=1)
 
             self.text = scrolledtext.ScrolledText(self.simplex, state='disable')
@@ -145,13 +227,51 @@ class App:
             btn_del= Button(self.task, text="Удалить ограничение", command=self.del_ogr)
             btn_add.grid(column=3,row=6)
             btn_del.grid(column=5,row=6)
-            btn_solve= Button(self.task, text="Решить графически", command=self.solve_graph)
-            btn_solve_simplex= Button(self.task, text="Решить Симплексом", command=self.simplex_solve)
-            btn_solve.grid(column=3,row=9)
-            btn_solve_simplex.grid(column=3,row=12)
+            self.btn_solve= Button(self.task, text="Решить графически", command=self.solve_graph)
+            self.btn_solve_simplex= Button(self.task, text="Решить Симплексом", command=self.simplex_solve)
+            self.btn_cancel= Button(self.task, text="Отменить", command=self.cancel_solve, state='disabled')
+            self.progress = ttk.Label(self.task, text="")
+            self.btn_solve.grid(column=3,row=9)
+            self.btn_solve_simplex.grid(column=3,row=12)
+            self.btn_cancel.grid(column=5,row=12)
+            self.progress.grid(column=5,row=9)
+            self.view = None  # график создаётся при первом обращении (см. region_view)
             # Добавление на экран
             tab_control.pack(expand=1, fill='both')
             window.config(menu=menu)
+            if self.prewarm_delay is not None:
+                window.after(self.prewarm_delay, self.prewarm)
+
+        def region_view(self):
+            """
+               Возвращает встроенный график (Services.plotview.RegionView), создавая его
+               при первом обращении: matplotlib загружается только тогда (или заранее, см. prewarm).
+            """
+            if self.view is None:
+                from Services.plotview import RegionView
+                self.view = RegionView(self.task)
+                self.view.grid(column=6, row=1, rowspan=30, sticky=N)
+            return self.view
+
+        def prewarm(self):
+            """
+               Загружает matplotlib и SymPy в фоновом потоке, пока окно уже показано,
+               затем создаёт график в главном потоке (виджеты Tk создаются только в нём).
+            """
+            def work():
+                import Services.plotview
+                import Services.graph
+                import sympy
+
+            task = BackgroundTask(work).start()
+
+            def poll():
+                if not task.finished():
+                    self.window.after(self.poll_interval, poll)
+                elif task.error is None:
+                    self.region_view()
+
+            self.window.after(self.poll_interval, poll)
                         
 
         def solve_graph(self):
@@ -159,155 +279,217 @@ class App:
                 Графическое решение задачи линейного программирования для двух переменных.
                 Если переменных больше, используется симплекс-метод.
             """
-            if (self.objective.get().lower().count('x') == 2):
+            count_vars = self.loaded_model.count_vars if self.loaded_model is not None else self.objective.get().lower().count('x')
+            if (count_vars == 2):
 
                 if self.check_constraint():
-                    
-                    xn,yn = self.get_gradient()
-                    if self.enabled.get() == 0:
-                        objective = ('min',self.objective.get())
+                    try:
+                        model = self.compile_task()
+                    except ValueError as ex:
+                        showerror("Ошибка ввода", str(ex))
+                        return
+
+                    xn,yn = self.get_gradient(model)
+                    if model.sense == 'min':
                         xn = -1 * xn
                         yn = -1 * yn
-                    else : 
-                        objective = ('max',self.objective.get())
 
-                    # plot
-                    
-                    x_1 , x_2 = symbols("x y")
-                    expr = self.create_constuct(x_1 , x_2)
-                    p1 = plot_implicit(expr , show=False,color="r",label = r'Искомая область')
-
-                    fig, ax = plt.subplots()
-                    self.move_sympyplot_to_axes(p1, ax)
-                   
-                    ax.arrow(0, 0, float(xn), float(yn), width = 0.005,color="g",label= rf'Нормаль ({xn},{yn})')
-                    
-                    constraints_str = []
-                    for constraint in self.constraints:
-                        constraints_str.append(constraint.get().lower())
-                    try:
-                        Lp = Simplex(count_vars=2, constraints=constraints_str, objective_fun=objective,text =self.text, char = END)
-                        solution = Lp.solution
-                        
-                        x_1s = solution["x_1"]
-                        x_2s = solution["x_2"]
-                        #plt.plot(float(x_1s), float(x_2s), color = 'r')
-                        plt.scatter( float(x_1s), float(x_2s), color='orange', s=40, marker='o',label = rf"Точка: ({x_1s};{x_2s})")
-                        ax.text(0.18, -1.18, f"Ответ: x_1 = {x_1s}; x_2 = {x_2s} f({x_1s};{x_2s}) = {Lp.optimize_val}", color="C0")
-                    except Exception as ex:
-                        solution = ex
-                        ax.text(0.18, -1.18, f"Ответ {solution}", color="C0")
-
-                    plt.title("Графическое решение")
-
-                    plt.xlabel(r'($x_1$)')
-                    plt.ylabel(r'($x_2$)')
-                    
-                    plt.legend(bbox_to_anchor=(1, 1), loc=1, borderaxespad=0.)
-
-                    plt.show()
+                    control = PivotControl()
+
+                    def work():
+                        # область и решение считаются в фоновом потоке, рисование — в главном
+                        return FeasibleRegion.from_model(model), solve_lp(model=model, control=control, cache=self.cache)
+
+                    def done(value, error):
+                        if error is not None:
+                            showerror("Ошибка", str(error))
+                            return
+                        region, result = value
+                        point = None
+                        try:
+                            if result.status != "optimal":
+                                raise ValueError(result.message)
+                            solution = result.solution
+
+                            x_1s = solution["x_1"]
+                            x_2s = solution["x_2"]
+                            point = (x_1s, x_2s)
+                            answer = f"Ответ: x_1 = {x_1s}; x_2 = {x_2s} f({x_1s};{x_2s}) = {result.objective}"
+                        except Exception as ex:
+                            solution = ex
+                            answer = f"Ответ {solution}"
+
+                        self.region_view().show(self.region_lines(region), region, (xn, yn), point, answer)
+
+                    self.start_task(work, done, control=control)
             else:
                     m,b,f = self.get_graphmehod()
-                    dsa = GaussAlgorithm(Matrix(m),Matrix(b),Matrix(f))
-                    dsa.doit()
-                    if dsa.check_matrix():
+
+                    def work():
+                        from sympy import Matrix
+                        from Services.graph import GaussAlgorithm
+                        dsa = GaussAlgorithm(Matrix(m),Matrix(b),Matrix(f))
+                        dsa.doit()
+                        if not dsa.check_matrix():
+                            return dsa, None
                         dsa.podstanovka()
-                        print(dsa.f0)
-                        print(dsa.symbolsList)
-                        p1 = plot_implicit(dsa.recursion() , show=False,color="r",label = r'Искомая область')
-                        fig, ax = plt.subplots()
-                        
-                        self.move_sympyplot_to_axes(p1, ax)
-                        # TODO перписать так как это не верно
-                        xn = dsa.f0.diff(dsa.expressions[-2])
-                        yn = dsa.f0.diff(dsa.expressions[-1])
+                        print(dsa.symbolic_objective())
+                        # x_free >= 0 и A'·x_free <= b'
+                        planes = np.vstack((-np.eye(2), np.array(dsa.A_reduced, dtype=np.float64)))
+                        rhs = np.concatenate((np.zeros(2), np.array(dsa.b_reduced, dtype=np.float64)))
+                        return dsa, FeasibleRegion(planes, rhs)
+
+                    def done(value, error):
+                        if error is not None:
+                            showerror("Ошибка", str(error))
+                            return
+                        dsa, region = value
+                        if region is None:
+                            return
+                        xn, yn = dsa.c_reduced.tolist()
                         if self.enabled.get() == 0:
-                            objective = ('min',self.objective.get())
                             xn = -1 * xn
                             yn = -1 * yn
-                        else : 
-                            objective = ('max',self.objective.get())
+                        labels = [f"x_{col + 1}" for col in dsa.free]
+                        self.region_view().show(self.region_lines(region), region, (xn, yn), labels=labels)
 
-                        ax.arrow(0, 0, float(xn), float(yn), width = 0.050,color="g",label= rf'Нормаль ({xn,yn})')
-                        plt.title("Графическое решение")
-                        plt.show()
+                    self.start_task(work, done)
                     
         def get_graphmehod(self):
             """Возвращает начальные значения для использования в симплекс-методе"""
 
             return   [[1,2,5,-1],[1,-1,-1,2]] , [4,1], [-2,-1,-3,-1]
             
-        def create_constuct(self, x_1 , x_2):
+        def compile_task(self):
             """
-               Создает символьное выражение для всех ограничений задачи.
+               Компилирует целевую функцию и ограничения из полей ввода в модель задачи
+               (Services.model.LinearModel). Строки разбираются один раз; симплекс-метод,
+               градиент и график используют уже готовую модель.
             """
-            exprs = '(x_1 >=0) & (x_2 >=0)'
-            for  constraint1 in  self.constraints:
-                 constraint = constraint1.get().split(' ')
-                 ax1,ax2,bx = Fraction("0/1"), Fraction("0/1"), Fraction("1/1")
-                 for i in range(0, len(constraint)):
-                    
-                    # построение начальной матрицы 
-                    if '_' in constraint[i]:
-                            coeff, index = constraint[i].split('_')
-                            if constraint[i-1] is '-':
-                                if index == '1':
-                                    ax1 = Fraction("-" + coeff[:-1])
-                                else:
-                                    ax2 = Fraction("-" + coeff[:-1])
-                            else:
-                                if index == '1':
-                                    ax1 = Fraction(coeff[:-1])
-                                else:
-                                    ax2 = Fraction(coeff[:-1])
-
-                    elif constraint[i] == '>=':
-                            ax1 *= -1
-                            ax2 *= -1
-                            bx *= -1
-                 bx *=  Fraction(constraint[-1])
-                 exprs += f'&({ax1} * x_1 + {ax2} *  x_2 <= {bx})'
-
-            return eval(exprs)
-
-
-        def move_sympyplot_to_axes(self, p, ax):
-            """Переносит график SymPy на оси Matplotlib."""
-            backend = p.backend(p)
-            backend.ax = ax
-            backend._process_series(backend.parent._series, ax, backend.parent)
-            backend.ax.spines['right'].set_color('none')
-            backend.ax.spines['top'].set_color('none')
-            backend.ax.spines['bottom'].set_position('zero')
-            plt.close(backend.fig)
-
-
-        def get_gradient(self):
-            """Возвращает коэффициенты градиента для целевой функции."""
-            xn,yn = Fraction("0/1"), Fraction("0/1")
-            constraint = self.objective.get().split(' ')
-            i=0
-            for j in range(len(constraint)):
-
-                if '_' in constraint[j]:
-                    coeff, index = constraint[j].split('_')
-                    i+=1
-                    if constraint[j-1] is '-':
-                        if i is 1:
-                            xn = Fraction("-" + coeff[:-1])
-                        else: 
-                            yn = Fraction("-" + coeff[:-1])
-                    else: 
-                        if i is 1:
-                            xn = Fraction(coeff[:-1])
-                        else: 
-                            yn = Fraction(coeff[:-1])
+            if self.enabled.get() == 0:
+                objective = ('min',self.objective.get())
+            else : 
+                objective = ('max',self.objective.get())
+            constraints_str = [constraint.get().lower() for constraint in self.constraints]
+            if self.loaded_model is not None:
+                model = self.loaded_model.copy()
+                model.sense = 'min' if self.enabled.get() == 0 else 'max'
+                for constraint in constraints_str:
+                    model.add_constraint(*parse_linear(constraint))
+                return model
+            model = compile_model(objective, constraints_str, count_vars=self.objective.get().lower().count('x'))
+            apply_bounds(model, self.bounds)
+            apply_integer(model, self.integer)
+            return model
+
+        def start_task(self, work, done, trace=None, control=None):
+            """
+               Запускает work() в фоновом потоке и опрашивает его через window.after.
 
+               Аргументы:
+               - work: функция без аргументов, выполняемая в фоне (без обращений к виджетам).
+               - done: вызывается в главном потоке как done(результат, исключение или None).
+               - trace: BufferedTrace, текст которого пачками выводится в поле хода решения.
+               - control: PivotControl решения — для кнопки "Отменить" и счётчика шагов.
+            """
+            if self.worker is not None:
+                return
+            self.worker = BackgroundTask(work).start()
+            self.worker_done = done
+            self.worker_trace = trace
+            self.worker_control = control
+            self.btn_solve.configure(state='disabled')
+            self.btn_solve_simplex.configure(state='disabled')
+            if control is not None:
+                self.btn_cancel.configure(state='normal')
+            self.progress.configure(text="Решается...")
+            self.window.after(self.poll_interval, self.poll_task)
+
+        def poll_task(self):
+            """Переносит накопленный ход решения в виджет и проверяет, завершился ли фоновый поток."""
+            self.flush_trace()
+            if self.worker_control is not None:
+                self.progress.configure(text=f"Решается... шагов: {self.worker_control.iterations}")
+            if not self.worker.finished():
+                self.window.after(self.poll_interval, self.poll_task)
+                return
+            worker = self.worker
+            self.worker = None
+            self.btn_solve.configure(state='normal')
+            self.btn_solve_simplex.configure(state='normal')
+            self.btn_cancel.configure(state='disabled')
+            self.progress.configure(text="")
+            self.worker_done(worker.result, worker.error)
+
+        def flush_trace(self):
+            """Выводит накопленный текст хода решения одной вставкой."""
+            if self.worker_trace is None:
+                return
+            chunk = self.worker_trace.drain()
+            if chunk:
+                self.text.configure(state='normal')
+                self.text.insert(END, chunk)
+                self.text.configure(state='disabled')
+
+        def cancel_solve(self):
+            """Просит решатель остановиться перед следующим шагом симплекс-метода."""
+            if self.worker is not None and self.worker_control is not None:
+                self.worker_control.cancel()
+                self.progress.configure(text="Отмена...")
+
+        def region_lines(self, region):
+            """Прямые ограничений области без условий неотрицательности (первые две полуплоскости)."""
+            return [(a[0], a[1], b) for a, b in zip(region.a[2:], region.b[2:])]
+
+        def schedule_preview(self, event=None):
+            """
+               Перерисовывает график после паузы в наборе: повторный вызов до срабатывания
+               переносит перерисовку. График (и matplotlib) не создаётся, пока preview нечего рисовать.
+            """
+            if self.preview_job is not None:
+                self.window.after_cancel(self.preview_job)
+            self.preview_job = self.window.after(self.preview_delay, self.preview)
+
+        def preview(self):
+            """
+               Быстрый предпросмотр задачи с двумя переменными при вводе: область строится
+               отсечением полуплоскостей, оптимум — перебором вершин (без симплекс-метода).
+               Недописанные выражения пропускаются молча.
+            """
+            self.preview_job = None
+            if self.objective.get().lower().count('x') != 2 or self.worker is not None:
+                return
+            try:
+                model = self.compile_task()
+            except (ValueError, ZeroDivisionError):
+                return
+            if model.count_vars != 2:
+                return
+            region = FeasibleRegion.from_model(model)
+            xn, yn = self.get_gradient(model)
+            best = region.best_vertex([float(xn), float(yn)], model.sense)
+            point, answer = None, ""
+            if region.is_empty():
+                answer = "Область пуста"
+            elif region.bounded:
+                point = best[0]
+                answer = f"Лучшая вершина: ({point[0]:g}; {point[1]:g}) f = {best[1]:g}"
+            if model.sense == 'min':
+                xn, yn = -xn, -yn
+            self.region_view().show(self.region_lines(region), region, (xn, yn), point, answer)
+
+
+        def get_gradient(self, model):
+            """Возвращает коэффициенты градиента для целевой функции (при x_1 и x_2)."""
+            xn, yn = model.objective[0], model.objective[1]
             return xn, yn
 
 
         def draw_constraint(self, x_1, x_2):
             """Эта функция строит графические представления ограничений. Используются линии для обозначения границ допустимой области решения."""
+            import matplotlib
+            matplotlib.use('tkagg')
+            import matplotlib.pyplot as plt
             plt.axvline(0, color='k', label=r'$x_1$ = 0')
             plt.axhline(0, color='k', label=r'$x_2$ = 0')
             plt.axvline(7, label=r'$x_1 \geq 7$') # constraint 1
@@ -370,7 +552,10 @@ class App:
                 Запускает симплекс-метод, обрабатывая исключения, если возникают ошибки.
                 Выводит результат (решение или ошибку).
             """
+            if self.worker is not None:
+                return
             constraints_str = []
+            self.text.configure(state='normal')
             self.text.delete('1.0', END)
             for constraint in self.constraints:
                 constraints_str.append(constraint.get().lower())
@@ -382,20 +567,48 @@ class App:
             tabs = '\t' * 2
             nl_char = '\n'
             self.text.configure(state='normal') 
-            self.text.insert(END, f"Целевая функция:   {objective[1]} --> {objective[0]} {nl_char}")
+            if self.loaded_model is not None:
+                self.text.insert(END, f"{self.model_summary(self.loaded_model)} --> {objective[0]} {nl_char}")
+            else:
+                self.text.insert(END, f"Целевая функция:   {objective[1]} --> {objective[0]} {nl_char}")
             self.text.grid(column=2,row=2)
           
             self.text.insert(END, f"Ограничения: {nl_char} {''.join([ tabs+constraint+ nl_char for constraint in constraints_str])} {nl_char}")
+            self.text.configure(state='disabled')
+            trace = BufferedTrace(max_rows=self.trace_max_rows, max_cols=self.trace_max_cols)
+            control = PivotControl()
+
+            def done(result, error):
+                search = None
+                if isinstance(result, BranchAndBound):
+                    search, result = result, result.result()
+                if error is not None:
+                    solution = error
+                elif result.status == "optimal":
+                    solution = dict(result.solution, val=result.objective)
+                    print(result.objective)
+                else:
+                    solution = result.message
+
+                #text.insert(END, Lp.hod_simplex)
+                self.text.configure(state='normal')
+                self.text.insert(END, f"Ответ: {solution} {nl_char}")
+                if error is None and result.duals is not None:
+                    self.text.insert(END, f"Двойственные оценки ограничений: {[str(value) for value in result.duals]} {nl_char}")
+                if search is not None:
+                    self.text.insert(END, f"Метод ветвей и границ. {search.report()} {nl_char}")
+                self.text.configure(state='disabled')
+
             try:
-                Lp = Simplex(count_vars=self.objective.get().lower().count('x'), constraints=constraints_str, objective_fun=objective,text =self.text, char = END)
-                solution = Lp.solution
-                print(Lp.optimize_val)
+                model = self.compile_task()
             except Exception as ex:
-                solution = ex
-            
-            #text.insert(END, Lp.hod_simplex)
-            self.text.insert(END, f"Ответ: {solution} {nl_char}")
-            self.text.configure(state='disabled')
+                done(None, ex)
+                return
+            if any(model.integer):
+                # целочисленная задача: ход решения релаксаций не выводится, только итог поиска
+                self.start_task(lambda: BranchAndBound(model, control=control), done, trace, control)
+                return
+            self.start_task(lambda: solve_lp(model=model, observer=trace, control=control, cache=self.cache), done, trace, control)
             
 
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Services — пакет-пространство имён в корне репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,35 @@
+import multiprocessing
+import os
+import pytest
+import Services.batch
+from Services.bars import write_bars
+from Services.batch import solve_batch
+from Services.model import compile_model
+
+
+def crash_on(name):
+    solve_file = Services.batch.solve_file
+
+    def solve(path, *args):
+        if os.path.basename(path) == name:
+            os._exit(1)  # аварийное завершение процесса пула (как при нехватке памяти)
+        return solve_file(path, *args)
+
+    return solve
+
+
+def test_crashed_worker_gives_error_record(tmp_path, monkeypatch):
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("подмена solve_file видна в процессах пула только при fork")
+    paths = []
+    for k in range(6):
+        paths.append(str(tmp_path / f"t{k}.bars"))
+        write_bars(paths[-1], compile_model(("max", "x_1"), [f"x_1 <= {k + 1}"]))
+    monkeypatch.setattr(Services.batch, "solve_file", crash_on("t2.bars"))
+    records = {os.path.basename(record["file"]): record for record in solve_batch(paths, workers=2, chunksize=3)}
+    assert len(records) == 6
+    assert records["t2.bars"]["status"] == "error"
+    assert "BrokenProcessPool" in records["t2.bars"]["message"]
+    for k in (0, 1, 3, 4, 5):
+        assert records[f"t{k}.bars"]["status"] == "optimal"
+        assert records[f"t{k}.bars"]["objective"] == k + 1
@@ -0,0 +1,49 @@
+from fractions import Fraction
+from Services.cache import SolveCache
+from Services.model import compile_model
+from Services.simplex import solve
+
+
+def presolved_model():
+    return compile_model(("min", "3x_1 + 2x_2 + x_3"), ["x_1 + x_2 + x_3 >= 10", "x_1 >= 4", "x_2 = 3", "x_1 + x_3 <= 8"])
+
+
+def test_presolve_with_cache_repeats_result():
+    cache = SolveCache()
+    first = solve(model=presolved_model(), presolve=True, cache=cache)
+    second = solve(model=presolved_model(), presolve=True, cache=cache)
+    assert first.status == second.status == "optimal"
+    assert first.objective == second.objective == Fraction(21)
+    assert first.solution == second.solution == {"x_1": 4, "x_2": 3, "x_3": 3}
+    assert cache.stats()["hits"] == 1
+
+
+def test_put_stores_copy():
+    cache = SolveCache()
+    result = solve(model=presolved_model(), cache=cache)
+    result.objective = None
+    result.solution.clear()
+    again = solve(model=presolved_model(), cache=cache)
+    assert again.objective == Fraction(21)
+    assert again.solution == {"x_1": 4, "x_2": 3, "x_3": 3}
+
+
+def test_lookup_from_file_respects_max_size(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    # записи в файл добавляет другой процесс с большим max_size
+    reader = SolveCache(max_size=2, path=path)
+    writer = SolveCache(path=path)
+    for k in range(5):
+        solve(model=compile_model(("max", "x_1"), [f"x_1 <= {k + 1}"]), cache=writer)
+    for k in range(5):
+        assert solve(model=compile_model(("max", "x_1"), [f"x_1 <= {k + 1}"]), cache=reader).objective == k + 1
+    assert reader.stats()["hits"] == 5
+    assert reader.stats()["size"] == 2
+
+
+def test_replaced_entry_is_counted_once(tmp_path):
+    cache = SolveCache(path=str(tmp_path / "cache.sqlite"))
+    result = solve(model=presolved_model())
+    for _ in range(3):
+        cache.put("key", "source", result)
+    assert cache.stored == 1
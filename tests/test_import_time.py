@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("sympy", "matplotlib", "scipy")
+BUDGET = 1.5  # с; сейчас около 0.2 с, одна SymPy занимает больше секунды
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main, Services
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "heavy": [name for name in %r if name in sys.modules]}))
+""" % (HEAVY,)
+
+# открытие задачи с тремя переменными и набор текста без предварительной загрузки графики
+GUI_SCRIPT = """
+import json, sys, tkinter
+import main
+try:
+    window = tkinter.Tk()
+except tkinter.TclError:
+    print(json.dumps({"display": False}))
+    sys.exit()
+main.App.prewarm_delay = None
+app = main.App(window)
+main.askopenfilename = lambda **options: sys.argv[1]
+app.open_file()
+app.objective.insert(tkinter.END, " + x_3")
+app.schedule_preview()
+app.add_ogr()
+app.constraints[-1].insert(0, "x_3 <= 2")
+app.schedule_preview()
+window.after(app.preview_delay * 2, window.quit)
+window.mainloop()
+print(json.dumps({"display": True, "view": app.view is not None, "heavy": [name for name in %r if name in sys.modules]}))
+""" % (HEAVY,)
+
+
+def run_script(script, *args):
+    # отдельный процесс: в этом sys.modules могут быть модули других тестов
+    output = subprocess.run([sys.executable, "-c", script] + list(args), cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_main_imports_without_heavy_stacks():
+    pytest.importorskip("tkinter")
+    report = run_script(SCRIPT)
+    assert report["heavy"] == []
+    assert report["elapsed"] < BUDGET
+
+
+def test_typing_does_not_load_plotting(tmp_path):
+    pytest.importorskip("tkinter")
+    path = tmp_path / "task.bars"
+    path.write_text(json.dumps({"objective": "x_1 + 2x_2", "min": 0, "constraints": ["x_1 + x_2 <= 4"]}))
+    report = run_script(GUI_SCRIPT, str(path))
+    if not report["display"]:
+        pytest.skip("нет дисплея для Tk")
+    assert not report["view"]
+    assert report["heavy"] == []
@@ -0,0 +1,41 @@
+from fractions import Fraction
+import Services.branch
+from Services.bars import write_bars
+from Services.branch import solve_node
+from Services.mapped import FractionArray, load_model
+from Services.model import compile_model
+
+
+def write_task(tmp_path):
+    path = str(tmp_path / "task.bars")
+    write_bars(path, compile_model(("max", "3x_1 + 2x_2"), ["2x_1 + x_2 <= 7", "x_1 + 3x_2 <= 9"]))
+    return path
+
+
+def test_copy_shares_mapped_matrix(tmp_path):
+    model = load_model(write_task(tmp_path))
+    copy = model.copy()
+    assert isinstance(copy.values, FractionArray)
+    copy.set_rhs(0, 1)
+    assert model.rhs[0] == 7
+
+
+def test_node_solve_keeps_mapped_matrix(tmp_path, monkeypatch):
+    model = load_model(write_task(tmp_path))
+    nodes = []
+    original = Services.branch.solve
+
+    def solve(model, **options):
+        nodes.append(model)
+        return original(model=model, **options)
+
+    monkeypatch.setattr(Services.branch, "solve", solve)
+    options = {"method": "tableau", "backend": "fraction", "pricing": "dantzig"}
+    result = solve_node([(0, "<=", 2)], None, options, model=model)
+    assert result.status == "optimal"
+    assert result.objective == Fraction(32, 3)
+    # узел дописывает строку ветвления к матрице из файла, не копируя её
+    assert nodes[0].values.base is model.values
+    assert nodes[0].num_constraints() == 3
+    assert isinstance(model.values, FractionArray)
+    assert model.num_constraints() == 2